@@ -9,6 +9,7 @@ import click
 
 from .submodules.collect_cli import collect
 from .submodules.db_cli import database
+from .submodules.session_cli import session
 from .submodules.stats_cli import stats
 
 # Set up logging.
@@ -77,5 +78,8 @@ main.add_command(collect, "collect")
 # Add stats subcommands.
 main.add_command(stats, "stats")
 
+# Add session broker subcommands.
+main.add_command(session, "session")
+
 if __name__ == "__main__":
     main()
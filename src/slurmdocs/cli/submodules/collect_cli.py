@@ -4,26 +4,517 @@ This module provides a command-line interface for collecting data from a cluster
 It includes subcommands for collecting node information and CPU information.
 
 """
-from concurrent.futures import ThreadPoolExecutor
+import contextlib
+import datetime
+import json
+import logging
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
 
 import click
 
-from ...collecter import Collecter, IlscpuCollecter, IscontrolColllecter
-from ...database import SlurmClusterDatabase
-from ...session import SSHSessionAuth
+from ...collecter import (
+    AIMDController,
+    AsyncCollecter,
+    Collecter,
+    IbundleCollecter,
+    IlscpuArrayCollecter,
+    IlscpuCollecter,
+    IlscpuJsonCollecter,
+    IscontrolColllecter,
+    IscontrolJsonCollecter,
+    JobTracker,
+    RemoteCache,
+    SlurmAllocation,
+    SweepPlanner,
+    SweepTelemetry,
+    Throttle,
+    TokenBucket,
+    get_backend,
+)
+from ...collecter.icollecter import ICollecter
+from ...collecter.icollecter.compression import COMPRESSIONS
+from ...database import (
+    FINGERPRINT_FIELDS,
+    SlurmClusterDatabase,
+    SnapshotLog,
+    SweepJournal,
+    diff_fingerprints,
+    fingerprint_records,
+)
+from ...parse import NODE_FIELDS, IscontrolJsonStreamParser, IscontrolStreamParser
+from ...session import BrokeredSession, ReplaySession, SSHSessionAuth, SSHSessionPool
 
 __all__ = ["collect"]
 
+# Fields of 'scontrol show node' used by a sweep: the parsed ones, the fingerprint, the cache key and the state
+_SWEEP_FIELDS = tuple(
+    dict.fromkeys((*NODE_FIELDS, *FINGERPRINT_FIELDS, *RemoteCache.KEY_FIELDS, "State"))
+)
+
+
+def _pooled_collect(pool: SSHSessionPool, collecter: Collecter, **kwargs) -> str:
+    """Run a collecter on a session leased from the pool."""
+    with pool.lease() as session:
+        return collecter(session=session, **kwargs)
+
+
+def _insert_sections(
+    db: SlurmClusterDatabase, icollecter: IbundleCollecter, filename: str, output: str
+) -> None:
+    """Insert every section of the output of a probe bundle in the database, under its own key."""
+    sections = icollecter.sections(output)
+    if "cpu" not in sections:
+        raise ValueError(f"The cpu section of {filename} is missing or failed.")
+    for section, data in sections.items():
+        db.insert({"key": section, "filename": filename, "data": data})
+    return
+
+
+def _pooled_bundle_collect(
+    pool: SSHSessionPool,
+    icollecter: IbundleCollecter,
+    db: SlurmClusterDatabase,
+    filename: str,
+    **kwargs,
+) -> str:
+    """Run a probe bundle on a session leased from the pool and insert its sections in the database."""
+    with pool.lease() as session:
+        output = icollecter(session, **kwargs)
+
+    _insert_sections(db, icollecter, filename, output)
+    return output
+
+
+def _group_by_partition(
+    jobs: list[dict], batch_size: int | None = None
+) -> dict[tuple[str, str], list[list[str]]]:
+    """Group the per-node jobs into batches of nodes sharing a partition and QOS.
+
+    Every node is only kept in the first partition it appears in.
+
+    Args:
+        jobs (list[dict]): Keyword arguments of every per-node collection.
+        batch_size (int | None, optional): The maximum number of nodes per batch. Defaults to the whole partition.
+
+    Returns:
+        dict[tuple[str, str], list[list[str]]]: The batches of node names keyed by (partition, qos).
+    """
+    seen = set()
+    groups: dict[tuple[str, str], list[str]] = {}
+    for job in jobs:
+        if job["node"] in seen:
+            continue
+        seen.add(job["node"])
+        groups.setdefault((job["partition"], job["qos"]), []).append(job["node"])
+
+    # Split the partitions into batches
+    return {
+        key: [
+            nodes[i : i + (batch_size or len(nodes))]
+            for i in range(0, len(nodes), batch_size or len(nodes))
+        ]
+        for key, nodes in groups.items()
+    }
+
+
+def _pooled_acquire(
+    pool: SSHSessionPool, allocation: SlurmAllocation
+) -> SlurmAllocation:
+    """Acquire an allocation on a session leased from the pool."""
+    with pool.lease() as session:
+        allocation.acquire(session)
+    return allocation
+
+
+def _pooled_batch_collect(
+    pool: SSHSessionPool,
+    icollecter: ICollecter,
+    db: SlurmClusterDatabase,
+    **kwargs,
+) -> list[str]:
+    """Run a batched collection on a session leased from the pool and insert the per-node outputs in the database."""
+    with pool.lease() as session:
+        output = icollecter(session, **kwargs)
+
+    outputs = icollecter.demultiplex(output)
+    for node, data in outputs.items():
+        db.insert({"key": "cpu", "filename": f"{node}.txt", "data": data})
+
+    return list(outputs.keys())
+
+
+def _journaled(
+    journal: SweepJournal,
+    telemetry: SweepTelemetry,
+    nodes: list[str],
+    func: Callable,
+    /,
+    *args,
+    **kwargs,
+) -> object:
+    """Run a collection and record the status and the latency of its nodes in the journal and the telemetry.
+
+    A batched collection returns the nodes it collected, the remaining nodes of the batch are failed.
+    """
+    journal.record(nodes, SweepJournal.IN_FLIGHT)
+    started = time.monotonic()
+    try:
+        result = func(*args, **kwargs)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        journal.record(nodes, SweepJournal.FAILED, error=error)
+        telemetry.finish(nodes, time.monotonic() - started, error=error)
+        raise
+
+    done = result if isinstance(result, list) else nodes
+    missing = [node for node in nodes if node not in done]
+    journal.record(done, SweepJournal.DONE)
+    journal.record(missing, SweepJournal.FAILED)
+    telemetry.finish(done, time.monotonic() - started)
+    telemetry.finish(
+        missing,
+        time.monotonic() - started,
+        error="ValueError: No output for the node in the batched collection.",
+    )
+    return result
+
+
+@contextlib.contextmanager
+def _executor(threads: int) -> Iterator[ThreadPoolExecutor]:
+    """A thread pool executor waiting for its collections, or dropping the queued ones on Ctrl-C."""
+    executor = ThreadPoolExecutor(max_workers=threads)
+    try:
+        yield executor
+        executor.shutdown(wait=True)
+    except BaseException:
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+
+
+def _throttled(
+    throttle: Throttle, key: str, func: Callable, /, *args, **kwargs
+) -> object:
+    """Run a collection in a slot of the throttle, keyed by its partition."""
+    with throttle.slot(key):
+        return func(*args, **kwargs)
+
+
+def _collect_wave(
+    jobs: list[dict],
+    collecter: Collecter,
+    pool: SSHSessionPool,
+    db: SlurmClusterDatabase,
+    journal: SweepJournal,
+    throttle: Throttle,
+    tracker: JobTracker,
+    telemetry: SweepTelemetry,
+    logger: logging.Logger,
+    threads: int,
+    mode: str,
+    engine: str,
+    deadline: float | None,
+    batch_size: int | None,
+) -> None:
+    """Run the cpu info collections of a wave and record the status of their nodes in the journal and the telemetry."""
+    # Probe bundles store every section under its own key
+    bundled = isinstance(collecter._icollecter, IbundleCollecter)
+    probe = (
+        (_pooled_bundle_collect, pool, collecter._icollecter, db)
+        if bundled
+        else (_pooled_collect, pool, collecter)
+    )
+
+    # Probe each partition with multi-node sruns or job arrays
+    if mode in ("batch", "array"):
+        icollecter = (
+            collecter._icollecter
+            if mode == "batch"
+            else IlscpuArrayCollecter(timeout=deadline or 600, tracker=tracker)
+        )
+        batches = _group_by_partition(jobs, batch_size=batch_size)
+        with _executor(threads) as executor:
+            for (part_name, qos), node_batches in batches.items():
+                for nodes in node_batches:
+                    executor.submit(
+                        _journaled,
+                        journal,
+                        telemetry,
+                        nodes,
+                        _throttled,
+                        throttle,
+                        part_name,
+                        _pooled_batch_collect,
+                        pool,
+                        icollecter,
+                        db,
+                        partition=part_name,
+                        qos=qos,
+                        nodes=nodes,
+                    )
+        return
+
+    # Probe every node as a job step inside one allocation per partition
+    if mode == "alloc":
+        batches = _group_by_partition(jobs, batch_size=batch_size)
+        allocations = [
+            SlurmAllocation(partition=part_name, qos=qos, nodes=nodes, tracker=tracker)
+            for (part_name, qos), node_batches in batches.items()
+            for nodes in node_batches
+        ]
+        with _executor(threads) as executor:
+            try:
+                # Acquire the allocations concurrently
+                futures = [
+                    executor.submit(_pooled_acquire, pool, allocation)
+                    for allocation in allocations
+                ]
+                wait(futures)
+                for allocation, future in zip(allocations, futures):
+                    if future.exception() is not None:
+                        error = (
+                            f"{type(future.exception()).__name__}: {future.exception()}"
+                        )
+                        logger.warning(error)
+                        journal.record(
+                            allocation.nodes, SweepJournal.FAILED, error=error
+                        )
+                        telemetry.finish(allocation.nodes, error=error)
+
+                # Run the probes as job steps
+                futures = [
+                    executor.submit(
+                        _journaled,
+                        journal,
+                        telemetry,
+                        [node],
+                        _throttled,
+                        throttle,
+                        allocation.partition,
+                        *probe,
+                        filename=f"{node}.txt",
+                        node=node,
+                        jobid=allocation.jobid,
+                    )
+                    for allocation in allocations
+                    if allocation.is_granted
+                    for node in allocation.nodes
+                ]
+                wait(futures)
+            finally:
+                with pool.lease() as member:
+                    for allocation in allocations:
+                        allocation.release(member)
+        return
+
+    # Multiplex the collection on an event loop
+    if engine == "async":
+        async_collecter = AsyncCollecter(
+            icollecter=collecter._icollecter,
+            save_dir=None if bundled else collecter._save_dir,
+            concurrency=threads,
+            deadline=deadline,
+            throttle=throttle,
+        )
+        journal.record([job["node"] for job in jobs], SweepJournal.IN_FLIGHT)
+        results = async_collecter.run(pool, jobs)
+        for idx, (job, res) in enumerate(zip(jobs, results)):
+            if bundled and not isinstance(res, BaseException):
+                try:
+                    _insert_sections(db, collecter._icollecter, job["filename"], res)
+                except ValueError as e:
+                    results[idx] = res = e
+            if isinstance(res, BaseException):
+                error = f"{type(res).__name__}: {res}"
+                journal.record([job["node"]], SweepJournal.FAILED, error=error)
+                telemetry.finish([job["node"]], error=error)
+            else:
+                journal.record([job["node"]], SweepJournal.DONE)
+                telemetry.finish([job["node"]])
+        failed = [res for res in results if isinstance(res, BaseException)]
+        logger.debug(f"{len(failed)} of {len(jobs)} collections failed.")
+        return
+
+    # Create a thread pool executor for multithreaded collection
+    with _executor(threads) as executor:
+        for job in jobs:
+            executor.submit(
+                _journaled,
+                journal,
+                telemetry,
+                [job["node"]],
+                _throttled,
+                throttle,
+                job["partition"],
+                *probe,
+                **job,
+            )
+
+    return
+
+
+def _echo_progress(line: str) -> None:
+    """Print the progress line of a sweep, in place on a terminal."""
+    if sys.stderr.isatty():
+        click.echo(f"\r\033[K{line}", nl=False, err=True)
+    else:
+        click.echo(line, err=True)
+    return
+
+
+def _report(telemetry: SweepTelemetry, path: Path, logger: logging.Logger) -> None:
+    """Stop the telemetry of a sweep, print its failure summary and write its report."""
+    telemetry.stop()
+    if sys.stderr.isatty():
+        click.echo(err=True)
+    click.echo(telemetry.summary(), err=True)
+    telemetry.write(path)
+    logger.debug(f"Sweep report written to {path}.")
+    return
+
+
+def _node_records(
+    session: SSHSessionAuth,
+    compress: str | None,
+    fields: tuple[str, ...] | None = None,
+) -> dict[str, dict]:
+    """Collect the raw 'scontrol show node' records keyed by node name, projected on fields if any."""
+    stream_parser = IscontrolStreamParser(preprocess=False)
+    stream_parser.feed(
+        IscontrolColllecter(timeout=10, compress=compress, fields=fields)(
+            session
+        ).encode("utf-8")
+    )
+    stream_parser.close()
+    return {record["NodeName"]: record for record in stream_parser.records}
+
+
+def _fresh_fingerprints(
+    db: SlurmClusterDatabase,
+    fingerprints: dict[str, str],
+    stale: set[str],
+    since: float,
+) -> dict[str, str]:
+    """Keep the fingerprints of the up to date nodes and of the stale nodes probed since the start of the sweep."""
+    fresh = {}
+    for node, fingerprint in fingerprints.items():
+        path = db.db_path / "cpu" / f"{node}.txt"
+        if node not in stale or (path.exists() and path.stat().st_mtime >= since):
+            fresh[node] = fingerprint
+    return fresh
+
+
+def _read_cache(
+    cache: RemoteCache,
+    session: SSHSessionAuth,
+    keys: dict[str, str],
+    probes: tuple[str, ...],
+    db: SlurmClusterDatabase,
+    logger: logging.Logger,
+) -> set[str]:
+    """Insert the cached probe outputs of the nodes in the database and return the nodes found in the cache."""
+    try:
+        hits = cache.lookup(session, keys, probes)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring the remote cache, the lookup failed: {e}")
+        return set()
+
+    for node, sections in hits.items():
+        for section, data in sections.items():
+            db.insert({"key": section, "filename": f"{node}.txt", "data": data})
+    return set(hits)
+
+
+def _write_cache(
+    cache: RemoteCache,
+    session: SSHSessionAuth,
+    keys: dict[str, str],
+    nodes: set[str],
+    probes: tuple[str, ...],
+    db: SlurmClusterDatabase,
+    logger: logging.Logger,
+) -> None:
+    """Write the probe outputs of the nodes stored in the database to the remote cache."""
+    outputs = {}
+    for node in nodes:
+        sections = {}
+        for section in probes:
+            path = db.db_path / section / f"{node}.txt"
+            if path.exists():
+                sections[section] = path.read_text()
+        outputs[node] = sections
+
+    try:
+        written = cache.store(session, keys, outputs, probes)
+    except OSError as e:
+        logger.warning(f"Unable to write the remote cache: {e}")
+        return
+    logger.debug(f"{written} nodes written to {cache}.")
+    return
+
+
+def _session(
+    server: str,
+    username: str,
+    port: int,
+    key_path: str,
+    compress: bool,
+    no_broker: bool,
+    replay: str | None,
+    replay_latency: float,
+    replay_failure_rate: float,
+    logger: logging.Logger,
+) -> SSHSessionAuth:
+    """Create the session to a cluster, replayed, brokered or a lazy SSH session."""
+    # Replay a recorded cluster, or attach to a running session broker if any
+    if replay is not None:
+        session = ReplaySession.from_database(
+            replay,
+            latency=replay_latency,
+            failure_rate=replay_failure_rate,
+            server=server,
+            remote_username=username,
+        )
+        logger.debug(f"Replaying the cluster recorded in {replay}.")
+    elif not no_broker and BrokeredSession.available(server, username, port):
+        session = BrokeredSession(server=server, remote_username=username, port=port)
+        logger.debug(f"Attached to {session}.")
+    else:
+        # Create an SSH session | Lazy connect | # TO DO : Add password authentication
+        session = SSHSessionAuth(
+            server=server,
+            remote_username=username,
+            port=port,
+            use_key_base_aut=True,
+            path_to_priv_key=key_path,
+            no_ping=False,
+            compress=compress,
+        )
+        logger.debug("Lazy SSH session created.")
+    return session
+
 
 # TO DO : Fill up the commands for the database subcommand.
 @click.group(invoke_without_command=True)
 @click.pass_context
 @click.option(
-    "-u", "--username", required=True, help="The username to use.", type=click.STRING
+    "-u",
+    "--username",
+    required=False,
+    help="The username to use. Required unless running a fleet.",
+    type=click.STRING,
 )
 @click.option(
-    "-s", "--server", required=True, help="The server to use.", type=click.STRING
+    "-s",
+    "--server",
+    required=False,
+    help="The server to use. Required unless running a fleet.",
+    type=click.STRING,
 )
 @click.option(
     "-p", "--port", required=False, help="The port to use.", type=click.INT, default=22
@@ -36,25 +527,88 @@ __all__ = ["collect"]
     type=click.Path(exists=True, readable=True, resolve_path=True),
     default=Path.home() / ".ssh" / "id_rsa",
 )
+@click.option(
+    "-C",
+    "--compress",
+    is_flag=True,
+    default=False,
+    help="Enable SSH transport-level compression.",
+)
+@click.option(
+    "-rc",
+    "--remote-compress",
+    required=False,
+    help="Compress the command outputs on the cluster side and decompress them locally.",
+    type=click.Choice(list(COMPRESSIONS)),
+    default=None,
+)
+@click.option(
+    "--no-broker",
+    is_flag=True,
+    default=False,
+    help="Do not attach to a running session broker.",
+)
+@click.option(
+    "--replay",
+    required=False,
+    help="Replay the cluster recorded in a database directory instead of connecting, for offline benchmarks.",
+    type=click.Path(exists=True, file_okay=False, resolve_path=True),
+    default=None,
+)
+@click.option(
+    "--replay-latency",
+    required=False,
+    help="The latency in seconds injected in every replayed command.",
+    type=click.FloatRange(min=0),
+    default=0.0,
+)
+@click.option(
+    "--replay-failure-rate",
+    required=False,
+    help="The probability that a replayed command fails to open a channel.",
+    type=click.FloatRange(min=0, max=1),
+    default=0.0,
+)
 def collect(
-    ctx: click.Context, username: str, server: str, port: int, key_path: str
+    ctx: click.Context,
+    username: str | None,
+    server: str | None,
+    port: int,
+    key_path: str,
+    compress: bool,
+    remote_compress: str | None,
+    no_broker: bool,
+    replay: str | None,
+    replay_latency: float,
+    replay_failure_rate: float,
 ) -> None:
     """Subcommand for the slurmdocs database operations."""
     ctx.obj["logger"].debug("Starting collect subcommand.")
 
-    # Create an SSH session | Lazy connect | # TO DO : Add password authentication
-    session = SSHSessionAuth(
+    # The fleet reads the clusters from its config
+    if ctx.invoked_subcommand == "fleet":
+        return
+    if username is None or server is None:
+        raise click.UsageError(
+            "Missing option '-u' / '--username' or '-s' / '--server'."
+        )
+
+    session = _session(
         server=server,
-        remote_username=username,
+        username=username,
         port=port,
-        use_key_base_aut=True,
-        path_to_priv_key=key_path,
-        no_ping=False,
+        key_path=key_path,
+        compress=compress,
+        no_broker=no_broker,
+        replay=replay,
+        replay_latency=replay_latency,
+        replay_failure_rate=replay_failure_rate,
+        logger=ctx.obj["logger"],
     )
-    ctx.obj["logger"].debug("Lazy SSH session created.")
 
     # Add to contex the session
     ctx.obj["session"] = session
+    ctx.obj["remote_compress"] = remote_compress
     # Close after subcommand execution
     ctx.call_on_close(session.close)
     return
@@ -70,11 +624,26 @@ def collect(
     type=click.Path(exists=True, readable=True, resolve_path=True),
     default=Path.cwd(),
 )
-def node(ctx: click.Context, save_dir: str) -> None:
+@click.option(
+    "--stream",
+    is_flag=True,
+    default=False,
+    help="Stream the output straight to the file instead of holding it in memory.",
+)
+@click.option(
+    "--json",
+    "json_output",
+    is_flag=True,
+    default=False,
+    help="Collect the structured output of scontrol show node --json, Slurm 21.08 or later.",
+)
+def node(ctx: click.Context, save_dir: str, stream: bool, json_output: bool) -> None:
     """Collect the node info file from the cluster."""
     # Create a Collecter
     collecter = Collecter(
-        icollecter=IscontrolColllecter(timeout=10),
+        icollecter=(IscontrolJsonCollecter if json_output else IscontrolColllecter)(
+            timeout=10, compress=ctx.obj["remote_compress"]
+        ),
         save_dir=save_dir,
     )
 
@@ -82,6 +651,10 @@ def node(ctx: click.Context, save_dir: str) -> None:
     ctx.obj["session"].connect()
 
     # Collect the data
+    if stream:
+        collecter.stream(session=ctx.obj["session"], filename="node_info.txt")
+        return
+
     collecter(session=ctx.obj["session"], filename="node_info.txt")
 
     return
@@ -129,7 +702,10 @@ def cpu(
 ) -> None:
     """Collect CPU information for a specific node."""
     # Create a Collecter
-    collecter = Collecter(icollecter=IlscpuCollecter(timeout=10), save_dir=save_dir)
+    collecter = Collecter(
+        icollecter=IlscpuCollecter(timeout=10, compress=ctx.obj["remote_compress"]),
+        save_dir=save_dir,
+    )
 
     # Connect to the cluster
     ctx.obj["session"].connect()
@@ -167,7 +743,7 @@ def cpu(
     "-t",
     "--threads",
     required=False,
-    help="The number of threads to use for collection.",
+    help="The number of threads (or in-flight collections with the async engine) to use for collection.",
     type=click.INT,
     default=10,
 )
@@ -195,6 +771,168 @@ def cpu(
     type=click.BOOL,
     default=False,
 )
+@click.option(
+    "-ps",
+    "--pool-size",
+    required=False,
+    help="The number of SSH transports shared by the collection threads.",
+    type=click.IntRange(min=1),
+    default=1,
+)
+@click.option(
+    "-mc",
+    "--max-channels",
+    required=False,
+    help="The maximum number of concurrent channels per SSH transport. Keep below the sshd MaxSessions.",
+    type=click.IntRange(min=1),
+    default=8,
+)
+@click.option(
+    "-e",
+    "--engine",
+    required=False,
+    help="Run the collection on a thread pool or multiplexed on an asyncio event loop.",
+    type=click.Choice(["thread", "async"]),
+    default="thread",
+)
+@click.option(
+    "-dl",
+    "--deadline",
+    required=False,
+    help="The deadline in seconds of a single collection with the async engine, or of a job array. Defaults to the probe timeout with the async engine and to 600 for job arrays.",
+    type=click.FLOAT,
+    default=None,
+)
+@click.option(
+    "-m",
+    "--mode",
+    required=False,
+    help="Probe every node with its own srun job, every partition with a single multi-node srun, every partition with a single job array, or every node as a job step inside one salloc allocation per partition.",
+    type=click.Choice(["node", "batch", "array", "alloc"]),
+    default="node",
+)
+@click.option(
+    "-bs",
+    "--batch-size",
+    required=False,
+    help="The maximum number of nodes per multi-node srun, job array or allocation. Defaults to the whole partition.",
+    type=click.IntRange(min=1),
+    default=None,
+)
+@click.option(
+    "-inc",
+    "--incremental",
+    is_flag=True,
+    default=False,
+    help="Refresh an existing database, only probing the nodes that are new or whose fingerprint changed.",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    default=False,
+    help="Resume an interrupted sweep, only probing the nodes its journal does not record as done.",
+)
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    default=False,
+    help="Print the planned probes and their estimated cost without submitting anything.",
+)
+@click.option(
+    "-w",
+    "--waves",
+    required=False,
+    help="The number of waves. Busy nodes (allocated, completing, reserved) are deferred to the next wave.",
+    type=click.IntRange(min=1),
+    default=3,
+)
+@click.option(
+    "-wd",
+    "--wave-delay",
+    required=False,
+    help="The delay in seconds between two waves.",
+    type=click.FloatRange(min=0),
+    default=60.0,
+)
+@click.option(
+    "-a",
+    "--adaptive",
+    is_flag=True,
+    default=False,
+    help="Adapt the number of in-flight probes, up to --threads, widening it while latencies stay flat and backing off on timeouts or srun errors.",
+)
+@click.option(
+    "-mr",
+    "--max-rate",
+    required=False,
+    help="The maximum number of probes submitted per second. Defaults to no limit.",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+)
+@click.option(
+    "-bt",
+    "--breaker-threshold",
+    required=False,
+    help="Stop submitting to a partition after this many consecutive failed probes.",
+    type=click.IntRange(min=1),
+    default=5,
+)
+@click.option(
+    "-x",
+    "--backend",
+    required=False,
+    help="Reach the nodes with srun jobs, a pdsh or clush fan-out from the login node, or SSH through the login node. pdsh, clush and ssh bypass the scheduler and need SSH access to the nodes.",
+    type=click.Choice(["srun", "pdsh", "clush", "ssh"]),
+    default="srun",
+)
+@click.option(
+    "-pr",
+    "--probe",
+    required=False,
+    multiple=True,
+    help="Also collect this probe along with lscpu, in the same job step. Can be repeated.",
+    type=click.Choice(["memory", "numa", "gpu", "meminfo"]),
+)
+@click.option(
+    "--all-fields",
+    is_flag=True,
+    default=False,
+    help="Store every field of scontrol show node in the database, instead of only the fields used by the parser and the sweep.",
+)
+@click.option(
+    "--json",
+    "json_output",
+    is_flag=True,
+    default=False,
+    help="Collect the structured outputs of scontrol show node --json (Slurm 21.08 or later) and lscpu -J. The JSON node output is stored whole.",
+)
+@click.option(
+    "--remote-cache",
+    is_flag=True,
+    default=False,
+    help="Reuse the probe outputs cached on the cluster for the nodes not rebooted since, and cache the new ones.",
+)
+@click.option(
+    "-cd",
+    "--cache-dir",
+    required=False,
+    help="The remote cache directory on the shared filesystem of the cluster, relative to the home directory.",
+    type=click.STRING,
+    default=".cache/slurmdocs",
+)
+@click.option(
+    "--progress/--no-progress",
+    default=True,
+    help="Print a live progress line with the throughput and the estimated time left.",
+)
+@click.option(
+    "-r",
+    "--report",
+    required=False,
+    help="The path of the JSON report of the sweep. Defaults to report.json in the database.",
+    type=click.Path(dir_okay=False, writable=True, resolve_path=True, path_type=Path),
+    default=None,
+)
 def sweep(
     ctx: click.Context,
     database: str,
@@ -203,75 +941,615 @@ def sweep(
     partition: str,
     quality_of_service: str,
     override: bool,
+    pool_size: int,
+    max_channels: int,
+    engine: str,
+    deadline: float | None,
+    mode: str,
+    batch_size: int | None,
+    incremental: bool,
+    resume: bool,
+    dry_run: bool,
+    waves: int,
+    wave_delay: float,
+    adaptive: bool,
+    max_rate: float | None,
+    breaker_threshold: int,
+    probe: tuple[str, ...],
+    all_fields: bool,
+    json_output: bool,
+    remote_cache: bool,
+    cache_dir: str,
+    backend: str,
+    progress: bool,
+    report: Path | None,
 ) -> None:
-    """Populate the database with all the collected data. Database must be empty."""
+    """Populate the database with all the collected data. Database must be empty unless refreshed or resumed."""
+    # Probe bundles need a job step per node
+    if len(probe) > 0 and mode not in ("node", "alloc"):
+        raise ValueError(
+            f"--probe runs a job step per node and needs --mode node or alloc. Got {mode} instead."
+        )
+    # Only srun submits jobs, and direct SSH runs a single node per channel
+    exec_backend = get_backend(backend)
+    if not exec_backend.scheduled and mode in ("array", "alloc"):
+        raise ValueError(
+            f"--mode {mode} needs the srun backend. Got {backend} instead."
+        )
+    if backend == "ssh" and mode == "batch":
+        raise ValueError("--mode batch needs the srun, pdsh or clush backend.")
+    # The session broker only forwards commands to the login node
+    if backend == "ssh" and isinstance(ctx.obj["session"], BrokeredSession):
+        raise ValueError(
+            "--backend ssh tunnels to the nodes, which the session broker cannot do. Pass --no-broker."
+        )
+
     # Get the database
     db = SlurmClusterDatabase(db_name=database, db_path=db_path)
+    journal = SweepJournal(db.db_path / "journal.jsonl")
 
     # Check if the database is empty
-    if not db.is_empty():
+    if resume and not journal.exists():
+        raise ValueError("No sweep journal to resume from.")
+    if not db.is_empty() and not incremental and not resume and not dry_run:
         raise ValueError(
-            "Database is not empty. Use the delete command to delete the database."
+            "Database is not empty. Use the delete command to delete the database, --incremental to refresh it or --resume to resume an interrupted sweep."
         )
 
-    # Create the database
-    db.create()
+    # Create the database, a dry run leaves it untouched
+    node_dir = db.db_path / "node"
+    if dry_run:
+        scratch = tempfile.TemporaryDirectory()
+        ctx.call_on_close(scratch.cleanup)
+        node_dir = Path(scratch.name)
+    else:
+        db.create()
 
     # Get the session
     session = ctx.obj["session"]
     # Connect to the cluster
     session.connect()
+    if not exec_backend.available(session):
+        raise ValueError(f"{backend} is not installed on {session.server}.")
 
-    # Create a Collecter
+    # Create a Collecter, only the fields used by the sweep cross the wire
     collecter = Collecter(
-        icollecter=IscontrolColllecter(timeout=10), save_dir=db.db_path / "node"
+        icollecter=(
+            IscontrolJsonCollecter(timeout=10, compress=ctx.obj["remote_compress"])
+            if json_output
+            else IscontrolColllecter(
+                timeout=10,
+                compress=ctx.obj["remote_compress"],
+                fields=None if all_fields else _SWEEP_FIELDS,
+            )
+        ),
+        save_dir=node_dir,
     )
 
-    # Collect the node info
-    collecter(
+    # Stream the node info to the database while parsing it
+    stream_parser = (
+        IscontrolJsonStreamParser(preprocess=True)
+        if json_output
+        else IscontrolStreamParser(preprocess=True)
+    )
+    collecter.stream(
         session=session,
         filename="node_info.txt",
+        on_chunk=stream_parser.feed,
     )
 
+    # Name every probe job after the run, to cancel the jobs left behind in bulk
+    tracker = JobTracker()
+    # Report the progress, the latencies and the failures of the run
+    telemetry = SweepTelemetry(echo=_echo_progress if progress else None)
+    ctx.obj["telemetry"] = telemetry
+
     # Swap the Icollecter
-    collecter._icollecter = IlscpuCollecter(timeout=10)
+    collecter._icollecter = (
+        IbundleCollecter(
+            sections=("cpu", *probe),
+            timeout=10,
+            compress=ctx.obj["remote_compress"],
+            tracker=tracker,
+            telemetry=telemetry,
+            backend=exec_backend,
+            json_output=json_output,
+        )
+        if len(probe) > 0
+        else (IlscpuJsonCollecter if json_output else IlscpuCollecter)(
+            timeout=10,
+            compress=ctx.obj["remote_compress"],
+            tracker=tracker,
+            telemetry=telemetry,
+            backend=exec_backend,
+        )
+    )
     collecter._save_dir = db.db_path / "cpu"
 
     # Get the node names and partitions from node file
-    node_db = db.get_node_file()
+    node_db = stream_parser.close()
 
-    # Create a thread pool executor for multithreaded collection
-    with ThreadPoolExecutor(max_workers=threads) as executor:
-        # Get the valid partitions
-        valid_partitions = [
-            part
-            for part in node_db.columns
-            if part.endswith("_PRT") and not part.isupper()
-        ]
-        # Collect the cpu info
-        for idx, noderw in node_db.iterrows():
-            for part in valid_partitions:
-                # If override is false , use auto partitioning
-                if not override:
-                    if noderw[part]:
-                        executor.submit(
-                            collecter,
-                            session=session,
+    # Only probe the new or changed nodes, and the nodes without cpu info
+    fingerprints = fingerprint_records(stream_parser.records)
+    changed, removed = diff_fingerprints(
+        fingerprints, db.fingerprints() if incremental else {}
+    )
+    stale = set(changed) | {
+        node for node in fingerprints if not db.is_cpu_file_available(f"{node}.txt")
+    }
+    # Only resume the nodes the interrupted sweep did not finish
+    if resume:
+        stale -= {
+            node
+            for node, status in journal.state().items()
+            if status == SweepJournal.DONE
+        }
+    ctx.obj["logger"].debug(f"{len(stale)} of {len(fingerprints)} nodes to probe.")
+
+    if not dry_run:
+        # Drop the nodes no longer in the cluster
+        for node in removed:
+            for key in ("cpu", *db._probe_db_names):
+                db.remove({"key": key, "filename": f"{node}.txt"})
+
+        # Store the fingerprints of the probed nodes once the sweep ends, even if interrupted
+        started = time.time()
+        ctx.call_on_close(
+            lambda: db.save_fingerprints(
+                _fresh_fingerprints(db, fingerprints, stale, started)
+            )
+        )
+
+    # Spread the collection channels over a pool of SSH transports
+    pool = SSHSessionPool(session, size=pool_size, max_channels=max_channels)
+    ctx.call_on_close(pool.close)
+    ctx.obj["logger"].debug(f"{pool} created.")
+
+    # Cancel the jobs left by the run once it ends, on Ctrl-C, or if the process is terminated
+    if not dry_run:
+        tracker.guard(session)
+        ctx.call_on_close(lambda: tracker.cancel(session))
+
+    # Get the valid partitions
+    valid_partitions = [
+        part for part in node_db.columns if part.endswith("_PRT") and not part.isupper()
+    ]
+
+    # Build the keyword arguments of every cpu info collection
+    jobs = []
+    for idx, noderw in node_db.iterrows():
+        for part in valid_partitions:
+            # If override is false , use auto partitioning
+            if not override:
+                if noderw[part]:
+                    jobs.append(
+                        dict(
                             filename=f"{noderw['NodeName']}.txt",
-                            partition=part[:-3],
-                            qos=part[:-3],
+                            partition=part[:-4],
+                            qos=part[:-4],
                             node=noderw["NodeName"],
                         )
-                        continue
-                else:
-                    executor.submit(
-                        collecter,
-                        session=session,
+                    )
+                    continue
+            else:
+                jobs.append(
+                    dict(
                         filename=f"{noderw['NodeName']}.txt",
                         partition=partition,
                         qos=quality_of_service,
                         node=noderw["NodeName"],
                     )
-                    continue
+                )
+                continue
+    jobs = [job for job in jobs if job["node"] in stale]
+
+    # Probe every node once, on the cheapest of its partitions
+    planner = SweepPlanner()
+    planner.survey(session)
+    plan = planner.plan(jobs)
+    if dry_run:
+        click.echo(planner.describe(plan, jobs))
+        ready, deferred, skipped = planner.schedule(
+            plan, {record["NodeName"]: record for record in stream_parser.records}
+        )
+        click.echo(
+            f"{len(ready)} ready, {len(deferred)} deferred and {len(skipped)} unavailable nodes."
+        )
+        return
+    jobs = plan
+
+    # Journal the status of every node
+    if not resume:
+        journal.reset(list(dict.fromkeys(job["node"] for job in jobs)))
+    ctx.call_on_close(journal.close)
+
+    # Read the nodes not rebooted since their last probe from the cache on the cluster, in bulk
+    records = {record["NodeName"]: record for record in stream_parser.records}
+    cache = (
+        RemoteCache(directory=cache_dir, compress=ctx.obj["remote_compress"])
+        if remote_cache
+        else None
+    )
+    cache_keys = {}
+    if cache is not None:
+        cache_keys = cache.keys(
+            {
+                job["node"]: records[job["node"]]
+                for job in jobs
+                if job["node"] in records
+            }
+        )
+        cached = _read_cache(
+            cache, session, cache_keys, ("cpu", *probe), db, ctx.obj["logger"]
+        )
+        journal.record(sorted(cached), SweepJournal.DONE)
+        jobs = [job for job in jobs if job["node"] not in cached]
+        click.echo(f"{len(cached)} nodes read from the remote cache.", err=True)
+    ctx.obj["logger"].debug(f"{len(jobs)} collections scheduled, see {journal}.")
+
+    # Report the sweep once it ends, even if interrupted
+    telemetry.total = len(jobs)
+    telemetry.start()
+    ctx.call_on_close(
+        lambda: _report(
+            telemetry, report or db.db_path / "report.json", ctx.obj["logger"]
+        )
+    )
+
+    # Adapt the submissions to the health of the cluster
+    throttle = Throttle(
+        (
+            AIMDController(initial=min(threads, 4), maximum=threads)
+            if adaptive
+            else AIMDController(initial=threads, minimum=threads, maximum=threads)
+        ),
+        bucket=TokenBucket(rate=max_rate) if max_rate is not None else None,
+        breaker_threshold=breaker_threshold,
+        budget=ctx.obj.get("budget"),
+    )
+
+    # Probe the ready nodes first and retry the busy ones in later waves
+    for wave in range(1, waves + 1):
+        telemetry.wave = wave
+        jobs, deferred, skipped = planner.schedule(jobs, records)
+        for job in skipped:
+            state = records.get(job["node"], {}).get("State")
+            journal.record(
+                [job["node"]], SweepJournal.FAILED, error=f"Skipped, node is {state}."
+            )
+            telemetry.skip([job["node"]], f"Node is {state}.")
+        ctx.obj["logger"].debug(
+            f"Wave {wave}: {len(jobs)} ready, {len(deferred)} deferred and {len(skipped)} unavailable nodes."
+        )
+        _collect_wave(
+            jobs,
+            collecter,
+            pool,
+            db,
+            journal,
+            throttle,
+            tracker,
+            telemetry,
+            ctx.obj["logger"],
+            threads=threads,
+            mode=mode,
+            engine=engine,
+            deadline=deadline,
+            batch_size=batch_size,
+        )
+        tracker.flush(session)
+        ctx.obj["logger"].debug(f"Wave {wave} done, {throttle}, {tracker}.")
+
+        # Cache the nodes probed by the wave for the next sweeps
+        if cache is not None:
+            probed = {job["node"] for job in jobs} & telemetry.done
+            _write_cache(
+                cache,
+                session,
+                cache_keys,
+                probed,
+                ("cpu", *probe),
+                db,
+                ctx.obj["logger"],
+            )
+
+        # Refresh the state of the deferred nodes
+        jobs = deferred
+        if len(jobs) == 0 or wave == waves:
+            break
+        time.sleep(wave_delay)
+        records = _node_records(session, ctx.obj["remote_compress"], fields=("State",))
+
+    # Leave the nodes still busy to a resumed sweep
+    for job in jobs:
+        state = records.get(job["node"], {}).get("State")
+        journal.record(
+            [job["node"]], SweepJournal.FAILED, error=f"Deferred, node is {state}."
+        )
+        telemetry.skip([job["node"]], f"Node is still {state}.")
+
+    return
+
+
+# Keys of a fleet cluster describing its connection, with their defaults
+_FLEET_CONNECTION = {
+    "server": None,
+    "username": None,
+    "port": 22,
+    "key_path": str(Path.home() / ".ssh" / "id_rsa"),
+    "compress": False,
+    "remote_compress": None,
+    "no_broker": False,
+    "replay": None,
+    "replay_latency": 0.0,
+    "replay_failure_rate": 0.0,
+}
+
+# Short names of the sweep options in a fleet config
+_FLEET_ALIASES = {"qos": "quality_of_service"}
+
+
+def _load_fleet(path: Path) -> tuple[int | None, dict[str, dict]]:
+    """Read the budget and the clusters of a fleet config, the defaults merged into every cluster."""
+    with open(path) as f:
+        config = json.load(f)
+
+    clusters = config.get("clusters")
+    if not isinstance(clusters, dict) or len(clusters) == 0:
+        raise ValueError(f"{path} must map at least one cluster name to its config.")
+
+    options = {param.name for param in sweep.params}
+    fleet = {}
+    for name, cluster in clusters.items():
+        merged = {}
+        for key, value in {**config.get("defaults", {}), **cluster}.items():
+            key = _FLEET_ALIASES.get(key, key.replace("-", "_"))
+            if key not in _FLEET_CONNECTION and key not in options:
+                raise ValueError(f"Unknown key {key} for cluster {name} in {path}.")
+            merged[key] = value
+        for key in ("server", "username"):
+            if key not in merged:
+                raise ValueError(f"Missing {key} for cluster {name} in {path}.")
+        merged.setdefault("database", name)
+        fleet[name] = merged
+
+    return config.get("budget"), fleet
+
+
+def _fleet_sweep(name: str, cluster: dict, obj: dict) -> dict:
+    """Run the sweep of a cluster of a fleet on its own session and return its outcome."""
+    logger = obj["logger"].getChild(name)
+    connection = {
+        key: cluster.get(key, default) for key, default in _FLEET_CONNECTION.items()
+    }
+    connection["key_path"] = str(Path(connection["key_path"]).expanduser())
+
+    sweep_ctx = click.Context(
+        sweep, info_name=f"sweep {name}", obj={**obj, "logger": logger}
+    )
+    started = time.monotonic()
+    error = None
+    try:
+        with sweep_ctx:
+            remote_compress = connection.pop("remote_compress")
+            session = _session(**connection, logger=logger)
+            sweep_ctx.obj["session"] = session
+            sweep_ctx.obj["remote_compress"] = remote_compress
+            sweep_ctx.call_on_close(session.close)
+
+            # Concurrent progress lines would overwrite each other
+            options = {"progress": False}
+            options.update(
+                (key, value)
+                for key, value in cluster.items()
+                if key not in _FLEET_CONNECTION
+            )
+            params = {param.name: param for param in sweep.params}
+            sweep_ctx.invoke(
+                sweep,
+                **{
+                    key: params[key].type_cast_value(sweep_ctx, value)
+                    for key, value in options.items()
+                },
+            )
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        logger.warning(f"The sweep of {name} failed. {error}")
+
+    telemetry = sweep_ctx.obj.get("telemetry", SweepTelemetry())
+    return {
+        "cluster": name,
+        "server": connection["server"],
+        "elapsed": time.monotonic() - started,
+        "done": len(telemetry.done),
+        "failed": len(telemetry.failures),
+        "skipped": len(telemetry.skipped),
+        "error": error,
+    }
+
+
+@collect.command()
+@click.pass_context
+@click.option(
+    "-c",
+    "--config",
+    required=True,
+    help="The JSON config of the fleet, mapping every cluster name to its server, credentials and sweep options.",
+    type=click.Path(exists=True, dir_okay=False, readable=True, path_type=Path),
+)
+@click.option(
+    "-b",
+    "--budget",
+    required=False,
+    help="The number of probes in flight across all the clusters. Overrides the budget of the config, defaults to no global limit.",
+    type=click.IntRange(min=1),
+    default=None,
+)
+@click.option(
+    "-r",
+    "--report",
+    required=False,
+    help="The path of the JSON report of the fleet, with the timing of every cluster.",
+    type=click.Path(dir_okay=False, writable=True, resolve_path=True, path_type=Path),
+    default=None,
+)
+def fleet(
+    ctx: click.Context, config: Path, budget: int | None, report: Path | None
+) -> None:
+    """Sweep several clusters concurrently, each on its own SSH transport, under a global concurrency budget."""
+    config_budget, clusters = _load_fleet(config)
+    budget = budget or config_budget
+    obj = {
+        "logger": ctx.obj["logger"],
+        "budget": threading.BoundedSemaphore(budget) if budget is not None else None,
+    }
+
+    # Every cluster sweeps in its own thread, the fleet takes as long as the slowest one
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=len(clusters)) as executor:
+        futures = [
+            executor.submit(_fleet_sweep, name, cluster, obj)
+            for name, cluster in clusters.items()
+        ]
+    outcomes = [future.result() for future in futures]
+    elapsed = time.monotonic() - started
+
+    # Report the timing of every cluster
+    width = max(len("Cluster"), *(len(outcome["cluster"]) for outcome in outcomes))
+    click.echo(
+        f"{'Cluster':<{width}}  {'Done':>6}  {'Failed':>6}  {'Skipped':>7}  {'Elapsed':>9}  Status"
+    )
+    for outcome in outcomes:
+        click.echo(
+            f"{outcome['cluster']:<{width}}  {outcome['done']:>6}  {outcome['failed']:>6}  {outcome['skipped']:>7}  "
+            f"{str(datetime.timedelta(seconds=round(outcome['elapsed']))):>9}  {outcome['error'] or 'ok'}"
+        )
+    sequential = sum(outcome["elapsed"] for outcome in outcomes)
+    click.echo(
+        f"{len(outcomes)} clusters in {datetime.timedelta(seconds=round(elapsed))}, "
+        f"{datetime.timedelta(seconds=round(sequential))} back to back."
+    )
+
+    if report is not None:
+        with open(report, "w") as f:
+            json.dump(
+                {"elapsed": elapsed, "budget": budget, "clusters": outcomes},
+                f,
+                indent=2,
+            )
+        ctx.obj["logger"].debug(f"Fleet report written to {report}.")
+
+    # Fail if any cluster failed
+    if any(outcome["error"] is not None for outcome in outcomes):
+        ctx.exit(1)
+    return
+
+
+@collect.command()
+@click.pass_context
+@click.option(
+    "-db",
+    "--database",
+    required=True,
+    help="The database to append the snapshots to.",
+    type=click.STRING,
+)
+@click.option(
+    "-p",
+    "--db-path",
+    required=False,
+    help="The path to the database.",
+    type=click.Path(exists=True, readable=True, resolve_path=True, path_type=Path),
+    default=Path.home() / ".slurmdocs",
+)
+@click.option(
+    "-i",
+    "--interval",
+    required=False,
+    help="The delay in seconds between the start of two snapshots.",
+    type=click.FloatRange(min=0),
+    default=60.0,
+)
+@click.option(
+    "-n",
+    "--count",
+    required=False,
+    help="The number of snapshots to take. Defaults to watching until interrupted.",
+    type=click.IntRange(min=1),
+    default=None,
+)
+@click.option(
+    "-kf",
+    "--keyframe",
+    required=False,
+    help="The number of snapshots between two full snapshots of the log.",
+    type=click.IntRange(min=1),
+    default=60,
+)
+@click.option(
+    "-f",
+    "--fields",
+    required=False,
+    help="The comma separated fields of scontrol show node to watch, projected on the cluster side. Defaults to every field.",
+    type=click.STRING,
+    default=None,
+)
+def watch(
+    ctx: click.Context,
+    database: str,
+    db_path: Path,
+    interval: float,
+    count: int | None,
+    keyframe: int,
+    fields: str | None,
+) -> None:
+    """Take periodic snapshots of the node info and append the fields that changed to the watch log of the database."""
+    # Get the database and its snapshot log
+    db = SlurmClusterDatabase(db_name=database, db_path=db_path)
+    log = SnapshotLog(db.db_path / "watch.jsonl.gz", keyframe=keyframe)
+    ctx.call_on_close(log.close)
+
+    # Keep the same session open between the snapshots
+    session = ctx.obj["session"]
+    session.connect()
+
+    # Only the watched fields cross the wire, checked before the first snapshot
+    projection = (
+        tuple(field.strip() for field in fields.split(","))
+        if fields is not None
+        else None
+    )
+    IscontrolColllecter(fields=projection)
+
+    taken = 0
+    try:
+        while count is None or taken < count:
+            started = time.monotonic()
+            try:
+                records = _node_records(
+                    session, ctx.obj["remote_compress"], fields=projection
+                )
+            except Exception as e:
+                # A missed snapshot is only a gap in the history
+                ctx.obj["logger"].warning(f"Snapshot failed, {type(e).__name__}: {e}")
+            else:
+                entry = log.append(records)
+                stored = sum(len(values) for values in entry["nodes"].values())
+                click.echo(
+                    f"{datetime.datetime.fromtimestamp(entry['time']):%Y-%m-%d %H:%M:%S} "
+                    f"{'keyframe' if entry.get('keyframe', False) else 'delta'}: "
+                    f"{len(entry['nodes'])} of {len(records)} nodes, {stored} fields stored, "
+                    f"{len(entry.get('removed', []))} removed.",
+                    err=True,
+                )
+
+            taken += 1
+            if count is not None and taken >= count:
+                break
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
+    except KeyboardInterrupt:
+        # Stopping the watch is the normal way to end it
+        pass
 
+    ctx.obj["logger"].debug(f"{taken} snapshots taken, see {log}.")
     return
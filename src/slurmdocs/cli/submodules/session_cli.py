@@ -0,0 +1,236 @@
+"""Module for slurmdocs session broker operations.
+
+This module provides a command-line interface to run a persistent session broker. The broker keeps authenticated SSH
+transports to the cluster alive, and the collect subcommands attach to it over a Unix socket instead of doing a new
+SSH handshake on every invocation.
+
+"""
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import click
+
+from ...session import (
+    BrokeredSession,
+    SessionBroker,
+    SSHSessionAuth,
+    broker_socket_path,
+)
+
+__all__ = ["session"]
+
+
+@click.group(invoke_without_command=True, no_args_is_help=True)
+@click.pass_context
+@click.option(
+    "-u", "--username", required=True, help="The username to use.", type=click.STRING
+)
+@click.option(
+    "-s", "--server", required=True, help="The server to use.", type=click.STRING
+)
+@click.option(
+    "-p", "--port", required=False, help="The port to use.", type=click.INT, default=22
+)
+def session(ctx: click.Context, username: str, server: str, port: int) -> None:
+    """Subcommand for the slurmdocs session broker."""
+    ctx.obj["logger"].debug("Starting session subcommand.")
+
+    ctx.obj["username"] = username
+    ctx.obj["server"] = server
+    ctx.obj["port"] = port
+    ctx.obj["socket_path"] = broker_socket_path(server, username, port)
+    return
+
+
+@session.command()
+@click.pass_context
+@click.option(
+    "-k",
+    "--key-path",
+    required=False,
+    help="The key to use.",
+    type=click.Path(exists=True, readable=True, resolve_path=True),
+    default=Path.home() / ".ssh" / "id_rsa",
+)
+@click.option(
+    "-ps",
+    "--pool-size",
+    required=False,
+    help="The number of SSH transports kept alive by the broker.",
+    type=click.IntRange(min=1),
+    default=2,
+)
+@click.option(
+    "-mc",
+    "--max-channels",
+    required=False,
+    help="The maximum number of concurrent channels per SSH transport.",
+    type=click.IntRange(min=1),
+    default=8,
+)
+@click.option(
+    "-C",
+    "--compress",
+    is_flag=True,
+    default=False,
+    help="Enable SSH transport-level compression.",
+)
+@click.option(
+    "--wait",
+    required=False,
+    help="Seconds to wait for the broker to be ready.",
+    type=click.FLOAT,
+    default=30.0,
+)
+def start(
+    ctx: click.Context,
+    key_path: str,
+    pool_size: int,
+    max_channels: int,
+    compress: bool,
+    wait: float,
+) -> None:
+    """Start a session broker in the background."""
+    if BrokeredSession.available(
+        ctx.obj["server"], ctx.obj["username"], ctx.obj["port"]
+    ):
+        print(f"Session broker already running on {ctx.obj['socket_path']}.")
+        return
+
+    # Run the broker in a detached process
+    log_path = ctx.obj["socket_path"].with_suffix(".log")
+    with open(log_path, "ab") as log:
+        args = [
+            sys.executable,
+            "-m",
+            "slurmdocs.cli.cli",
+            "session",
+            "-u",
+            ctx.obj["username"],
+            "-s",
+            ctx.obj["server"],
+            "-p",
+            str(ctx.obj["port"]),
+            "serve",
+            "-k",
+            key_path,
+            "-ps",
+            str(pool_size),
+            "-mc",
+            str(max_channels),
+        ]
+        if compress:
+            args.append("--compress")
+        process = subprocess.Popen(
+            args,
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=log,
+            start_new_session=True,
+            env=os.environ.copy(),
+        )
+
+    # Wait for the broker to answer
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        if BrokeredSession.available(
+            ctx.obj["server"], ctx.obj["username"], ctx.obj["port"]
+        ):
+            print(f"Session broker started on {ctx.obj['socket_path']}.")
+            return
+        if process.poll() is not None:
+            break
+        time.sleep(0.1)
+
+    raise click.ClickException(f"Session broker did not start. See {log_path}.")
+
+
+@session.command(hidden=True)
+@click.pass_context
+@click.option(
+    "-k",
+    "--key-path",
+    required=False,
+    help="The key to use.",
+    type=click.Path(exists=True, readable=True, resolve_path=True),
+    default=Path.home() / ".ssh" / "id_rsa",
+)
+@click.option(
+    "-ps",
+    "--pool-size",
+    required=False,
+    help="The number of SSH transports kept alive by the broker.",
+    type=click.IntRange(min=1),
+    default=2,
+)
+@click.option(
+    "-mc",
+    "--max-channels",
+    required=False,
+    help="The maximum number of concurrent channels per SSH transport.",
+    type=click.IntRange(min=1),
+    default=8,
+)
+@click.option(
+    "-C",
+    "--compress",
+    is_flag=True,
+    default=False,
+    help="Enable SSH transport-level compression.",
+)
+def serve(
+    ctx: click.Context,
+    key_path: str,
+    pool_size: int,
+    max_channels: int,
+    compress: bool,
+) -> None:
+    """Run the session broker in the foreground."""
+    template = SSHSessionAuth(
+        server=ctx.obj["server"],
+        remote_username=ctx.obj["username"],
+        port=ctx.obj["port"],
+        use_key_base_aut=True,
+        path_to_priv_key=key_path,
+        no_ping=False,
+        compress=compress,
+    )
+    broker = SessionBroker(
+        template,
+        pool_size=pool_size,
+        max_channels=max_channels,
+        socket_path=ctx.obj["socket_path"],
+    )
+    ctx.obj["logger"].debug(f"{broker} serving.")
+    broker.serve_forever()
+    return
+
+
+@session.command()
+@click.pass_context
+def stop(ctx: click.Context) -> None:
+    """Stop the session broker."""
+    client = BrokeredSession(ctx.obj["server"], ctx.obj["username"], ctx.obj["port"])
+    if not client.is_connected():
+        print("No session broker running.")
+        return
+
+    client.session.stop()
+    print("Session broker stopped.")
+    return
+
+
+@session.command()
+@click.pass_context
+def status(ctx: click.Context) -> None:
+    """Show whether the session broker is running."""
+    if BrokeredSession.available(
+        ctx.obj["server"], ctx.obj["username"], ctx.obj["port"]
+    ):
+        print(f"✅ Session broker running on {ctx.obj['socket_path']}.")
+    else:
+        print("❌ No session broker running.")
+    return
@@ -1,3 +1,32 @@
 """Top level import for slurmdocs.collecter package."""
+from .allocation import SlurmAllocation
+from .async_collecter import AsyncCollecter
+from .backend import (
+    DirectSSHBackend,
+    ExecBackend,
+    ParallelShellBackend,
+    SrunBackend,
+    get_backend,
+)
+from .cache import RemoteCache
 from .collecter import Collecter
-from .icollecter import IlscpuCollecter, IscontrolColllecter
+from .icollecter import (
+    JSON_PROBES,
+    PROBES,
+    IbundleCollecter,
+    IlscpuArrayCollecter,
+    IlscpuCollecter,
+    IlscpuJsonCollecter,
+    IscontrolColllecter,
+    IscontrolJsonCollecter,
+)
+from .planner import SweepPlanner
+from .telemetry import SweepTelemetry
+from .throttle import (
+    AIMDController,
+    CircuitBreaker,
+    CircuitOpenError,
+    Throttle,
+    TokenBucket,
+)
+from .tracker import JobTracker
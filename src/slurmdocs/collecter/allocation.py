@@ -0,0 +1,136 @@
+"""The allocation module that holds a Slurm allocation across many probes.
+
+This module defines the 'SlurmAllocation' class, which acquires one allocation with 'salloc --no-shell' over a set of
+nodes. Probes run as job steps inside the allocation ('srun --jobid=<id>'), which skips the priority and queue path
+that a brand new job per node goes through.
+
+Classes:
+    - 'SlurmAllocation': An allocation over a set of nodes of one partition.
+
+Example:
+    ```python
+    allocation = SlurmAllocation(partition='debug', qos='debug', nodes=['node-1', 'node-2'])
+    allocation.acquire(ssh_session)
+    try:
+        for node in allocation.nodes:
+            IlscpuCollecter()(ssh_session, node=node, jobid=allocation.jobid)
+    finally:
+        allocation.release(ssh_session)
+    ```
+
+"""
+
+import re
+import uuid
+
+from ..session.ssh_session import SSHSessionAuth
+from .tracker import JobTracker
+
+__all__ = ["SlurmAllocation"]
+
+
+class SlurmAllocation:
+    """An allocation over a set of nodes of one partition, acquired with 'salloc --no-shell'."""
+
+    # Line printed by salloc once the allocation is granted
+    _granted_pattern = re.compile(r"job allocation (\d+)")
+
+    def __init__(
+        self,
+        partition: str,
+        qos: str,
+        nodes: list[str],
+        timeout: float = 300,
+        tracker: JobTracker | None = None,
+    ) -> None:
+        """Initialize the SlurmAllocation instance.
+
+        Args:
+            partition (str): The partition of the allocation.
+            qos (str): The quality of service of the allocation.
+            nodes (list[str]): The nodes to allocate.
+            timeout (float, optional): Time to wait for the allocation to be granted. Defaults to 300.
+            tracker (JobTracker | None, optional): Names the allocation after its run and records its job id.
+                Defaults to a unique name per allocation.
+
+        Raises:
+            ValueError: If nodes is empty.
+        """
+        if len(nodes) == 0:
+            raise ValueError("nodes must not be empty.")
+
+        self.partition = partition
+        self.qos = qos
+        self.nodes = list(nodes)
+        self.name = (
+            tracker.name
+            if tracker is not None
+            else f"slurmdocs-{uuid.uuid4().hex[:12]}"
+        )
+        self._tracker = tracker
+        self._timeout = timeout
+        self.jobid: str | None = None
+
+    def _command(self) -> str:
+        """Build the 'salloc' command of the allocation."""
+        return (
+            f"salloc --no-shell -N {len(self.nodes)} --ntasks-per-node=1 -c 1 "
+            f"-p {self.partition} --qos {self.qos} -J {self.name} "
+            f"--immediate={int(self._timeout)} --nodelist={','.join(self.nodes)}"
+        )
+
+    def acquire(self, session: SSHSessionAuth) -> str:
+        """Acquire the allocation.
+
+        Args:
+            session (SSHSessionAuth): The SSH session to the Slurm cluster.
+
+        Raises:
+            RuntimeError: If the allocation was not granted.
+
+        Returns:
+            str: The job id of the allocation.
+        """
+        session.connect()
+
+        _, stdout, stderr = session.session.exec_command(self._command())
+        # salloc reports the granted allocation on stderr
+        output = stdout.read().decode("utf-8") + stderr.read().decode("utf-8")
+
+        match = self._granted_pattern.search(output)
+        if match is None:
+            raise RuntimeError(
+                f"Allocation of {len(self.nodes)} nodes under partition : {self.partition} and QOS: {self.qos} was not granted: {output.strip()}"
+            )
+
+        self.jobid = match.group(1)
+        if self._tracker is not None:
+            self._tracker.track([self.jobid])
+        return self.jobid
+
+    def release(self, session: SSHSessionAuth) -> None:
+        """Release the allocation, ending any step still running in it.
+
+        Args:
+            session (SSHSessionAuth): The SSH session to the Slurm cluster.
+        """
+        if self.jobid is None:
+            return
+
+        _, stdout, _ = session.session.exec_command(f"scancel {self.jobid}")
+        stdout.channel.recv_exit_status()
+        self.jobid = None
+        return
+
+    @property
+    def is_granted(self) -> bool:
+        """Check if the allocation is currently held."""
+        return self.jobid is not None
+
+    def __repr__(self) -> str:
+        """Return a string representation of the SlurmAllocation instance.
+
+        Returns:
+            str: String representation of the object.
+        """
+        return f"{self.__class__.__name__}(partition={self.partition}, qos={self.qos}, nodes={len(self.nodes)}, jobid={self.jobid})"
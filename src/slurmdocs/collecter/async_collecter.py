@@ -0,0 +1,217 @@
+"""The asynchronous collector module that collects data from the Slurm cluster.
+
+This module defines the 'AsyncCollecter' class, which drives many 'ICollecter' calls from a single asyncio event loop.
+Most of the time of a probe such as 'srun lscpu' is spent waiting on the scheduler, so polling the SSH channels from
+an event loop keeps thousands of probes in flight without an OS thread per probe.
+
+Classes:
+    - 'AsyncCollecter': A collector that runs 'ICollecter' calls concurrently on an asyncio event loop.
+
+Usage:
+    1. Instantiate the 'AsyncCollecter' with an 'ICollecter' implementing '_command' and an optional save directory.
+    2. Call 'run' with a session (or session pool) and a list of per-call keyword arguments.
+
+Example:
+    ```python
+    collecter = AsyncCollecter(IlscpuCollecter(), save_dir='/data', concurrency=200, deadline=60)
+
+    jobs = [
+        {"filename": "node-1.txt", "partition": "debug", "qos": "debug", "node": "node-1"},
+        {"filename": "node-2.txt", "partition": "debug", "qos": "debug", "node": "node-2"},
+    ]
+    results = collecter.run(ssh_session, jobs)  # A list of collected data or exceptions
+    ```
+
+"""
+
+import asyncio
+import time
+from pathlib import Path
+
+from ..session.ssh_pool import SSHSessionPool
+from ..session.ssh_session import SSHSessionAuth
+from .collecter import AbstractCollecter
+from .icollecter import ICollecter
+from .throttle import Throttle
+
+__all__ = ["AsyncCollecter"]
+
+
+class AsyncCollecter(AbstractCollecter):
+    """Collecter class for concurrently collecting data from the Slurm cluster on an event loop."""
+
+    def __init__(
+        self,
+        icollecter: ICollecter,
+        save_dir: str | Path | None = None,
+        concurrency: int = 100,
+        deadline: float | None = None,
+        throttle: Throttle | None = None,
+    ) -> None:
+        """Initialize the AsyncCollecter instance.
+
+        Args:
+            icollecter (ICollecter): An instance of a class implementing the ICollecter interface.
+            save_dir (str | Path | None, optional): The directory to save collected data. Defaults to None.
+            concurrency (int, optional): The maximum number of in-flight calls. Defaults to 100.
+            deadline (float | None, optional): The deadline in seconds of a single call. Defaults to the timeout of
+                the icollecter.
+            throttle (Throttle | None, optional): Adapts the in-flight calls below the concurrency to the health of
+                the cluster, keyed by the partition of the call. Defaults to None.
+
+        Raises:
+            ValueError: If concurrency is not positive.
+        """
+        if concurrency <= 0:
+            raise ValueError(
+                f"concurrency must be positive. Got {concurrency} instead."
+            )
+
+        self._concurrency = concurrency
+        # A hung command must not stall the whole event loop
+        self._deadline = deadline if deadline is not None else icollecter._timeout
+        self._throttle = throttle
+        super().__init__(icollecter, save_dir=save_dir)
+
+    def _collect(
+        self, session: SSHSessionAuth, filename: str | None = None, **kwargs
+    ) -> str:
+        """Collects data from the Slurm cluster.
+
+        Args:
+            session (SSHSessionAuth): The SSH session to the Slurm cluster.
+            filename (str): The name of the file to save the collected data.
+            kwargs (dict): Keyword arguments to pass to the icollecter.
+
+        Returns:
+            str: The collected data.
+        """
+        return super()._collect(session, filename=filename, **kwargs)
+
+    async def _call(self, session: SSHSessionAuth, **kwargs) -> str:
+        """Asynchronously call the icollecter under the deadline.
+
+        Args:
+            session (SSHSessionAuth): The SSH session to the Slurm cluster.
+            kwargs (dict): Keyword arguments to pass to the icollecter.
+
+        Raises:
+            TimeoutError: If the call did not finish before the deadline.
+
+        Returns:
+            str: The collected data.
+        """
+        try:
+            return await asyncio.wait_for(
+                self._icollecter.__acall__(session, **kwargs),
+                timeout=self._deadline,
+            )
+        except asyncio.TimeoutError:
+            raise TimeoutError(
+                f"Deadline of {self._deadline} seconds exceeded when collecting {kwargs}."
+            )
+
+    async def _acollect(
+        self,
+        session: SSHSessionAuth | SSHSessionPool,
+        semaphore: asyncio.Semaphore,
+        filename: str | None = None,
+        **kwargs,
+    ) -> str:
+        """Asynchronously collect data from the Slurm cluster under the semaphore and deadline.
+
+        Args:
+            session (SSHSessionAuth | SSHSessionPool): The SSH session or session pool to the Slurm cluster.
+            semaphore (asyncio.Semaphore): The semaphore bounding the number of in-flight calls.
+            filename (str): The name of the file to save the collected data.
+            kwargs (dict): Keyword arguments to pass to the icollecter.
+
+        Raises:
+            TimeoutError: If the call did not finish before the deadline.
+            CircuitOpenError: If the throttle stopped submitting to the partition of the call.
+
+        Returns:
+            str: The collected data.
+        """
+        async with semaphore:
+            loop = asyncio.get_running_loop()
+
+            # Lease a transport, the semaphore never exceeds the pool capacity so this does not block
+            if isinstance(session, SSHSessionPool):
+                member = await loop.run_in_executor(None, session.acquire)
+            else:
+                member = session
+
+            try:
+                if self._throttle is None:
+                    data = await self._call(member, **kwargs)
+                else:
+                    key = kwargs.get("partition", "")
+                    await self._throttle.aacquire(key)
+                    started, ok = time.monotonic(), False
+                    try:
+                        data = await self._call(member, **kwargs)
+                        ok = True
+                    finally:
+                        self._throttle.release(key, time.monotonic() - started, ok)
+            finally:
+                if isinstance(session, SSHSessionPool):
+                    session.release(member)
+
+        self._save(data, filename=filename)
+        return data
+
+    async def gather(
+        self, session: SSHSessionAuth | SSHSessionPool, jobs: list[dict]
+    ) -> list[str | BaseException]:
+        """Asynchronously collect data for every job.
+
+        Args:
+            session (SSHSessionAuth | SSHSessionPool): The SSH session or session pool to the Slurm cluster.
+            jobs (list[dict]): Keyword arguments of every call, including the filename.
+
+        Returns:
+            list[str | BaseException]: The collected data or the raised exception of every job, in order.
+        """
+        concurrency = self._concurrency
+        if isinstance(session, SSHSessionPool):
+            concurrency = min(concurrency, session.capacity)
+        else:
+            session.connect()
+
+        semaphore = asyncio.Semaphore(concurrency)
+        tasks = [
+            asyncio.ensure_future(self._acollect(session, semaphore, **job))
+            for job in jobs
+        ]
+
+        try:
+            return await asyncio.gather(*tasks, return_exceptions=True)
+        except asyncio.CancelledError:
+            # Cancel the in-flight calls so they clean up their channels
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    def run(
+        self, session: SSHSessionAuth | SSHSessionPool, jobs: list[dict]
+    ) -> list[str | BaseException]:
+        """Collect data for every job on a new event loop.
+
+        Args:
+            session (SSHSessionAuth | SSHSessionPool): The SSH session or session pool to the Slurm cluster.
+            jobs (list[dict]): Keyword arguments of every call, including the filename.
+
+        Returns:
+            list[str | BaseException]: The collected data or the raised exception of every job, in order.
+        """
+        return asyncio.run(self.gather(session, jobs))
+
+    def __repr__(self) -> str:
+        """Return a string representation of the AsyncCollecter instance.
+
+        Returns:
+            str: String representation of the object.
+        """
+        return f"{super().__repr__()[:-1]}, concurrency={self._concurrency}, deadline={self._deadline})"
@@ -0,0 +1,370 @@
+"""The backend module that decides how the probes reach the compute nodes.
+
+By default a probe is a Slurm job, which waits in the queue of its partition. Sites that let their users SSH to the
+compute nodes can bypass the scheduler entirely, with a parallel shell run on the login node or with SSH channels
+tunnelled through the login node, and collect the whole cluster in seconds. The 'ExecBackend' class builds the
+commands of a probe for a backend and picks the session they run on.
+
+Classes:
+    - 'ExecBackend': The interface of the execution backends.
+    - 'SrunBackend': Runs the probes as Slurm jobs or job steps, the default.
+    - 'ParallelShellBackend': Fans the probes out with 'pdsh' or 'clush' from the login node.
+    - 'DirectSSHBackend': Runs the probes over SSH, tunnelled through the login node as a jump host.
+
+Functions:
+    - 'get_backend': Returns a backend by name.
+
+Example:
+    ```python
+    backend = get_backend("pdsh")
+    if backend.available(ssh_session):
+        IlscpuCollecter(backend=backend)(ssh_session, node="node-1", partition="debug", qos="debug")
+    ```
+
+"""
+
+import re
+import shlex
+from abc import ABC, abstractmethod
+
+import paramiko  # type: ignore
+
+from ..session.ssh_session import SSHSessionAuth
+
+__all__ = [
+    "DirectSSHBackend",
+    "ExecBackend",
+    "ParallelShellBackend",
+    "SrunBackend",
+    "get_backend",
+]
+
+
+class ExecBackend(ABC):
+    """The interface of the execution backends.
+
+    Attributes:
+        name (str): The name of the backend.
+        scheduled (bool): Whether the probes are Slurm jobs, which need a partition and may be cancelled.
+    """
+
+    name = ""
+    scheduled = False
+
+    def available(self, session: SSHSessionAuth) -> bool:  # noqa : ARG002
+        """Check if the backend can be used from the session.
+
+        Args:
+            session (SSHSessionAuth): The SSH session to the login node.
+
+        Returns:
+            bool: True if the backend can be used.
+        """
+        return True
+
+    @abstractmethod
+    def command(self, program: str, node: str, **kwargs) -> str:
+        """Build the command running a program on a node.
+
+        Args:
+            program (str): The program to run on the node.
+            node (str): The node.
+            kwargs (dict): The partition, qos, job name and other keyword arguments of the probe.
+
+        Returns:
+            str: The command to run on the session returned by 'target'.
+        """
+        pass
+
+    def batch_command(self, program: str, nodes: list[str], **kwargs) -> str:
+        """Build the command running a program on several nodes with labelled output.
+
+        Args:
+            program (str): The program to run on every node.
+            nodes (list[str]): The nodes.
+            kwargs (dict): The partition, qos, job name and other keyword arguments of the probe.
+
+        Raises:
+            NotImplementedError: If the backend runs a single node per command.
+
+        Returns:
+            str: The command to run on the login node.
+        """
+        raise NotImplementedError(
+            f"The {self.name} backend runs a single node per command."
+        )
+
+    def demultiplex(self, output: str) -> dict[str, str]:
+        """Split the labelled output of a batch command into per-node outputs.
+
+        Args:
+            output (str): The output of a batch command.
+
+        Raises:
+            NotImplementedError: If the backend runs a single node per command.
+
+        Returns:
+            dict[str, str]: The output keyed by node name.
+        """
+        raise NotImplementedError(
+            f"The {self.name} backend runs a single node per command."
+        )
+
+    def target(
+        self, session: SSHSessionAuth, node: str  # noqa : ARG002
+    ) -> SSHSessionAuth:
+        """Return the session the command of a node runs on.
+
+        Args:
+            session (SSHSessionAuth): The SSH session to the login node.
+            node (str): The node.
+
+        Returns:
+            SSHSessionAuth: The session, the login session unless the backend connects to the nodes.
+        """
+        return session
+
+    def release(self, session: SSHSessionAuth, target: SSHSessionAuth) -> None:
+        """Release a session returned by 'target'.
+
+        Args:
+            session (SSHSessionAuth): The SSH session to the login node.
+            target (SSHSessionAuth): The session returned by 'target'.
+        """
+        if target is not session:
+            target.close()
+        return
+
+    def __repr__(self) -> str:
+        """Return a string representation of the backend."""
+        return f"{self.__class__.__name__}({self.name})"
+
+
+class SrunBackend(ExecBackend):
+    """Runs the probes as Slurm jobs, or as job steps of an existing allocation with the 'jobid' keyword."""
+
+    name = "srun"
+    scheduled = True
+
+    # Header printed by every task of a batch command
+    _node_header = "@@node="
+
+    # Label prepended by 'srun --label' to every output line
+    _label_pattern = re.compile(r"^\s*(\d+): ?(.*)$")
+
+    def command(self, program: str, node: str, **kwargs) -> str:
+        """Build the 'srun' command running a program on a node.
+
+        Args:
+            program (str): The program to run on the node.
+            node (str): The node.
+            kwargs (dict): The 'partition', 'qos' and job 'name', or the 'jobid' of an allocation.
+
+        Returns:
+            str: The command to run on the login node.
+        """
+        if "jobid" in kwargs:
+            return f"srun --jobid={kwargs['jobid']} -N 1 -n 1 -c 1 --nodelist={node} {program}"
+        return f"srun -n 1 -c 1 -p {kwargs['partition']} --qos {kwargs['qos']} -J {kwargs['name']} --nodelist={node} {program}"
+
+    def batch_command(self, program: str, nodes: list[str], **kwargs) -> str:
+        """Build a multi-node 'srun' command, every task printing a header with its node name before the program.
+
+        Args:
+            program (str): The program to run on every node.
+            nodes (list[str]): The nodes.
+            kwargs (dict): The 'partition', 'qos' and job 'name'.
+
+        Returns:
+            str: The command to run on the login node.
+        """
+        return (
+            f"srun -N {len(nodes)} --ntasks-per-node=1 -c 1 -p {kwargs['partition']} --qos {kwargs['qos']} "
+            f"-J {kwargs['name']} --label --nodelist={','.join(nodes)} "
+            f"sh -c 'echo {self._node_header}$SLURMD_NODENAME; {program}'"
+        )
+
+    def demultiplex(self, output: str) -> dict[str, str]:
+        """Split the labelled output of a multi-node 'srun' into per-node outputs.
+
+        Args:
+            output (str): The output of a batch command.
+
+        Returns:
+            dict[str, str]: The output keyed by node name.
+        """
+        # Group the lines by task label, lines of different tasks may interleave
+        tasks: dict[str, list[str]] = {}
+        for line in output.splitlines():
+            match = self._label_pattern.match(line)
+            if match is None:
+                continue
+            task, content = match.groups()
+            tasks.setdefault(task, []).append(content)
+
+        # Map every task to its node using the header line
+        outputs = {}
+        for lines in tasks.values():
+            headers = [line for line in lines if line.startswith(self._node_header)]
+            if len(headers) == 0:
+                continue
+            node = headers[0][len(self._node_header) :].strip()
+            body = [line for line in lines if not line.startswith(self._node_header)]
+            outputs[node] = "\n".join(body) + "\n"
+
+        return outputs
+
+
+class ParallelShellBackend(ExecBackend):
+    """Fans the probes out with a parallel shell, 'pdsh' or 'clush', run on the login node.
+
+    Both prefix every output line with the name of its node, which labels the output of a batch command.
+
+    Args:
+        tool (str, optional): The parallel shell, 'pdsh' or 'clush'. Defaults to 'pdsh'.
+        fanout (int | None, optional): The number of concurrent connections of the parallel shell. Defaults to
+            the default of the tool.
+    """
+
+    _tools = ("pdsh", "clush")
+
+    # Node name prepended by the parallel shell to every output line
+    _label_pattern = re.compile(r"^([^\s:]+): ?(.*)$")
+
+    def __init__(self, tool: str = "pdsh", fanout: int | None = None) -> None:
+        """Initialize the ParallelShellBackend instance."""
+        if tool not in self._tools:
+            raise ValueError(f"tool must be one of {self._tools}. Got {tool} instead.")
+        self.name = tool
+        self.fanout = fanout
+
+    def available(self, session: SSHSessionAuth) -> bool:
+        """Check if the parallel shell is installed on the login node."""
+        try:
+            _, stdout, _ = session.session.exec_command(
+                f"command -v {self.name}", timeout=10
+            )
+            stdout.read()
+            return stdout.channel.recv_exit_status() == 0
+        except (OSError, paramiko.SSHException):
+            return False
+
+    def _options(self) -> str:
+        """Return the fan-out option of the tool, if any."""
+        return "" if self.fanout is None else f"-f {self.fanout} "
+
+    def command(self, program: str, node: str, **kwargs) -> str:  # noqa : ARG002
+        """Build the command running a program on a node, without the node label.
+
+        Args:
+            program (str): The program to run on the node.
+            node (str): The node.
+            kwargs (dict): Unused, the parallel shell does not go through the scheduler.
+
+        Returns:
+            str: The command to run on the login node.
+        """
+        return f"{self.name} -N -w {node} {shlex.quote(program)}"
+
+    def batch_command(
+        self, program: str, nodes: list[str], **kwargs  # noqa : ARG002
+    ) -> str:
+        """Build the command running a program on several nodes, every output line labelled with its node.
+
+        Args:
+            program (str): The program to run on every node.
+            nodes (list[str]): The nodes.
+            kwargs (dict): Unused, the parallel shell does not go through the scheduler.
+
+        Returns:
+            str: The command to run on the login node.
+        """
+        return (
+            f"{self.name} {self._options()}-w {','.join(nodes)} {shlex.quote(program)}"
+        )
+
+    def demultiplex(self, output: str) -> dict[str, str]:
+        """Split the node labelled output of a batch command into per-node outputs.
+
+        Args:
+            output (str): The output of a batch command.
+
+        Returns:
+            dict[str, str]: The output keyed by node name.
+        """
+        nodes: dict[str, list[str]] = {}
+        for line in output.splitlines():
+            match = self._label_pattern.match(line)
+            if match is None:
+                continue
+            node, content = match.groups()
+            nodes.setdefault(node, []).append(content)
+
+        return {node: "\n".join(lines) + "\n" for node, lines in nodes.items()}
+
+
+class DirectSSHBackend(ExecBackend):
+    """Runs the probes over SSH channels to the nodes, tunnelled through the login session as a jump host.
+
+    Args:
+        port (int, optional): The SSH port of the nodes. Defaults to 22.
+    """
+
+    name = "ssh"
+
+    def __init__(self, port: int = 22) -> None:
+        """Initialize the DirectSSHBackend instance."""
+        self.port = port
+
+    def command(self, program: str, node: str, **kwargs) -> str:  # noqa : ARG002
+        """Return the program, which runs on the session of the node.
+
+        Args:
+            program (str): The program to run on the node.
+            node (str): The node.
+            kwargs (dict): Unused, the node is reached directly.
+
+        Returns:
+            str: The command to run on the session returned by 'target'.
+        """
+        return program
+
+    def target(self, session: SSHSessionAuth, node: str) -> SSHSessionAuth:
+        """Connect to the node through the login session.
+
+        Args:
+            session (SSHSessionAuth): The SSH session to the login node.
+            node (str): The node.
+
+        Raises:
+            ConnectionError: If the node could not be reached.
+
+        Returns:
+            SSHSessionAuth: The session to the node.
+        """
+        target = session.jump(node, port=self.port)
+        target.connect()
+        return target
+
+
+def get_backend(name: str) -> ExecBackend:
+    """Return an execution backend by name.
+
+    Args:
+        name (str): One of 'srun', 'pdsh', 'clush' or 'ssh'.
+
+    Raises:
+        ValueError: If the backend is unknown.
+
+    Returns:
+        ExecBackend: The backend.
+    """
+    if name == "srun":
+        return SrunBackend()
+    if name in ParallelShellBackend._tools:
+        return ParallelShellBackend(tool=name)
+    if name == "ssh":
+        return DirectSSHBackend()
+    raise ValueError(
+        f"Unknown backend {name}. Expected one of srun, pdsh, clush or ssh."
+    )
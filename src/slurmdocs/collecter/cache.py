@@ -0,0 +1,300 @@
+"""The cache module that keeps the probe outputs of the nodes on the shared filesystem of the cluster.
+
+The hardware of a node does not change without a reboot, so its 'lscpu' output stays valid as long as its 'BootTime'
+and 'SlurmdStartTime' in 'scontrol show node' do not change. The 'RemoteCache' class stores the probe outputs of a
+sweep under a per-user directory of the cluster, one JSON entry per node keyed by its name and boot times. Later
+sweeps, from any workstation, read the entries of all their nodes with a single command and only submit probes for
+the nodes that were rebooted since, or never probed.
+
+An entry records the probes of the sweep that wrote it, so a sweep collecting more probes than the cached ones
+misses the cache rather than losing sections.
+
+Classes:
+    - 'RemoteCache': Reads and writes the probe outputs cached on the cluster.
+
+Example:
+    ```python
+    cache = RemoteCache()
+    keys = cache.keys(records)
+    hits = cache.lookup(ssh_session, keys, probes=("cpu",))  # {'node-1': {'cpu': '...'}}
+    cache.store(ssh_session, keys, {"node-2": {"cpu": lscpu_output}}, probes=("cpu",))
+    ```
+
+"""
+
+import base64
+import hashlib
+import io
+import json
+import re
+import shlex
+import tarfile
+
+import paramiko  # type: ignore
+
+from ..session.ssh_session import SSHSessionAuth
+from .icollecter.compression import StreamDecompressor, wrap_command
+
+__all__ = ["RemoteCache"]
+
+
+class RemoteCache:
+    """Reads and writes the probe outputs of the nodes cached on the shared filesystem of the cluster.
+
+    Args:
+        directory (str, optional): The cache directory on the cluster, relative to the home directory of the user
+            unless absolute. Defaults to '.cache/slurmdocs'.
+        timeout (float, optional): The read timeout in seconds of the cache commands. Defaults to 60.
+        compress (str | None, optional): Remote compression of the lookups ('gzip', 'zstd' or 'auto').
+            Defaults to None.
+        max_command (int, optional): The maximum length in bytes of a single cache command, below the argument
+            limit of the remote shell. Defaults to 65536.
+    """
+
+    # Fields of 'scontrol show node' that change when a node reboots
+    KEY_FIELDS = ("BootTime", "SlurmdStartTime")
+
+    # Header of every entry of a lookup: file name and length in bytes
+    _entry_header = "@@entry"
+
+    # Node names safe to use in a file name
+    _node_pattern = re.compile(r"^[\w.+-]+$")
+
+    def __init__(
+        self,
+        directory: str = ".cache/slurmdocs",
+        timeout: float = 60,
+        compress: str | None = None,
+        max_command: int = 65536,
+    ) -> None:
+        """Initialize the RemoteCache instance."""
+        # Validate the compression early
+        wrap_command("", compress)
+        # '~' is not expanded inside quotes, the commands already run in the home directory
+        self.directory = directory[2:] if directory.startswith("~/") else directory
+        self.timeout = timeout
+        self.max_command = max_command
+        self._compress = compress
+
+    def key(self, record: dict) -> str | None:
+        """Compute the cache key of a node.
+
+        Args:
+            record (dict): The raw 'scontrol show node' record of the node.
+
+        Returns:
+            str | None: The key, None if the node has no boot time or an unsafe name.
+        """
+        node = str(record.get("NodeName", ""))
+        if self._node_pattern.match(node) is None:
+            return None
+
+        times = [str(record.get(field)) for field in self.KEY_FIELDS]
+        if any(value in ("None", "", "(null)") for value in times):
+            return None
+
+        digest = hashlib.sha1("|".join(times).encode("utf-8")).hexdigest()[:16]
+        return f"{node}.{digest}"
+
+    def keys(self, records: dict[str, dict]) -> dict[str, str]:
+        """Compute the cache keys of many nodes, leaving out the ones without a key.
+
+        Args:
+            records (dict[str, dict]): The raw 'scontrol show node' records keyed by node name.
+
+        Returns:
+            dict[str, str]: The keys keyed by node name.
+        """
+        keys = {node: self.key(record) for node, record in records.items()}
+        return {node: key for node, key in keys.items() if key is not None}
+
+    def _run(self, session: SSHSessionAuth, command: str) -> bytes:
+        """Run a cache command and return its output.
+
+        Raises:
+            OSError: If the command failed.
+        """
+        try:
+            _, stdout, stderr = session.session.exec_command(
+                command, timeout=self.timeout
+            )
+            output = stdout.read()
+            status = stdout.channel.recv_exit_status()
+        except paramiko.SSHException as e:
+            raise OSError(f"Cache command failed: {e}")
+        if status != 0:
+            raise OSError(
+                f"Cache command failed with status {status}: {stderr.read().decode('utf-8', errors='replace').strip()}"
+            )
+        return output
+
+    def _chunks(self, items: list[str], overhead: int) -> list[list[str]]:
+        """Split items so that every chunk fits in a command."""
+        chunks: list[list[str]] = [[]]
+        size = overhead
+        for item in items:
+            if len(chunks[-1]) > 0 and size + len(item) + 1 > self.max_command:
+                chunks.append([])
+                size = overhead
+            chunks[-1].append(item)
+            size += len(item) + 1
+        return [chunk for chunk in chunks if len(chunk) > 0]
+
+    def entries(self, output: bytes) -> dict[str, bytes]:
+        """Split the framed output of a lookup into the cache entries.
+
+        Args:
+            output (bytes): The output of a lookup.
+
+        Raises:
+            ValueError: If the output is malformed or truncated.
+
+        Returns:
+            dict[str, bytes]: The content of every entry, keyed by file name.
+        """
+        entries, pos = {}, 0
+        while pos < len(output):
+            end = output.find(b"\n", pos)
+            header = output[pos : end if end != -1 else len(output)].decode().split()
+            if (
+                end == -1
+                or len(header) != 3
+                or header[0] != self._entry_header
+                or not header[2].isdigit()
+            ):
+                raise ValueError(f"Malformed entry header at byte {pos}: {header}.")
+
+            _, name, length = header
+            body = output[end + 1 : end + 1 + int(length)]
+            if len(body) < int(length):
+                raise ValueError(
+                    f"Entry {name} is truncated, got {len(body)} of {length} bytes."
+                )
+            entries[name] = body
+            pos = end + 1 + int(length)
+
+        return entries
+
+    def _lookup_command(self, files: list[str]) -> str:
+        """Build the command printing the framed cache entries that exist among files."""
+        return wrap_command(
+            f"{{ cd {shlex.quote(self.directory)} 2>/dev/null || exit 0; export LC_ALL=C; "
+            f'for f in {" ".join(files)}; do [ -f "$f" ] && d=$(cat "$f") && '
+            f"printf '{self._entry_header} %s %d\\n%s' \"$f\" ${{#d}} \"$d\"; done; exit 0; }}",
+            self._compress,
+        )
+
+    def lookup(
+        self, session: SSHSessionAuth, keys: dict[str, str], probes: tuple[str, ...]
+    ) -> dict[str, dict[str, str]]:
+        """Read the cached probe outputs of nodes, a single command for up to thousands of nodes.
+
+        Entries are read whole into a variable before being printed, and are pure ASCII JSON, so an entry replaced
+        by a concurrent sweep is never torn. Unreadable entries and entries lacking a probe are misses.
+
+        Args:
+            session (SSHSessionAuth): The SSH session to the login node.
+            keys (dict[str, str]): The cache keys keyed by node name, see 'keys'.
+            probes (tuple[str, ...]): The probes the entries must cover, keys of 'PROBES'.
+
+        Raises:
+            OSError: If a lookup command failed.
+
+        Returns:
+            dict[str, dict[str, str]]: The successful probe outputs of the cached nodes, keyed by node and probe.
+        """
+        nodes = {f"{key}.json": node for node, key in keys.items()}
+        overhead = len(self._lookup_command([]))
+
+        hits = {}
+        for chunk in self._chunks(sorted(nodes), overhead):
+            command = self._lookup_command(chunk)
+            output = self._run(session, command)
+            if self._compress is not None and len(output) > 0:
+                decompressor = StreamDecompressor()
+                output = decompressor.decompress(output) + decompressor.flush()
+
+            for name, data in self.entries(output).items():
+                try:
+                    entry = json.loads(data)
+                except ValueError:
+                    continue
+                if name not in nodes or not set(probes) <= set(entry.get("probes", [])):
+                    continue
+                sections = entry.get("sections", {})
+                if "cpu" not in sections:
+                    continue
+                hits[nodes[name]] = {
+                    probe: sections[probe] for probe in probes if probe in sections
+                }
+
+        return hits
+
+    @staticmethod
+    def _archive(files: dict[str, bytes]) -> str:
+        """Pack files into a base64 encoded gzip tarball."""
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+            for name, data in files.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                info.mode = 0o644
+                tar.addfile(info, io.BytesIO(data))
+        return base64.encodebytes(buffer.getvalue()).decode("ascii")
+
+    def _store_command(self, files: dict[str, bytes]) -> str:
+        """Build the command unpacking files into the cache, next to it first so readers never see partial files."""
+        directory = shlex.quote(self.directory)
+        return (
+            f"mkdir -p {directory} && cd {directory} && t=$(mktemp -d .part.XXXXXX) && "
+            "{ base64 -d <<'@@EOF' | tar -xzf - -C \"$t\" && mv -f \"$t\"/*.json . ; s=$?; rm -rf \"$t\"; exit $s; }\n"
+            f"{self._archive(files)}@@EOF"
+        )
+
+    def store(
+        self,
+        session: SSHSessionAuth,
+        keys: dict[str, str],
+        outputs: dict[str, dict[str, str]],
+        probes: tuple[str, ...],
+    ) -> int:
+        """Write the probe outputs of nodes to the cache, a single command for as many nodes as fit in it.
+
+        Args:
+            session (SSHSessionAuth): The SSH session to the login node.
+            keys (dict[str, str]): The cache keys keyed by node name, see 'keys'.
+            outputs (dict[str, dict[str, str]]): The successful probe outputs keyed by node and probe.
+            probes (tuple[str, ...]): The probes that ran, including the failed ones.
+
+        Raises:
+            OSError: If a store command failed.
+
+        Returns:
+            int: The number of nodes written, the ones without a key or a cpu output are left out.
+        """
+        files = {
+            f"{keys[node]}.json": json.dumps(
+                {"node": node, "probes": list(probes), "sections": sections},
+                sort_keys=True,
+            ).encode("ascii")
+            for node, sections in outputs.items()
+            if node in keys and "cpu" in sections
+        }
+
+        # Halve the batches whose archive does not fit in a single command
+        pending = [sorted(files)]
+        while len(pending) > 0:
+            names = pending.pop()
+            if len(names) == 0:
+                continue
+            command = self._store_command({name: files[name] for name in names})
+            if len(command) > self.max_command and len(names) > 1:
+                pending.extend([names[: len(names) // 2], names[len(names) // 2 :]])
+                continue
+            self._run(session, command)
+
+        return len(files)
+
+    def __repr__(self) -> str:
+        """Return a string representation of the RemoteCache instance."""
+        return f"{self.__class__.__name__}(directory={self.directory})"
@@ -32,11 +32,13 @@ Methods:
     - _collect(self, session: SSHSessionAuth) -> str: Collects data from the Slurm cluster.
     - __repr__(self) -> str: Returns a string representation of the AbstractCollecter instance.
     - __call__(self, session: SSHSessionAuth) -> str: Calls the collector to collect data from the Slurm cluster.
+    - stream(self, session: SSHSessionAuth, filename: str) -> Path: Streams data from the Slurm cluster straight to a file.
 
 """
 
 import os
 from abc import ABC, abstractmethod
+from collections.abc import Callable
 from pathlib import Path
 
 from ..session.ssh_session import SSHSessionAuth
@@ -105,26 +107,86 @@ class AbstractCollecter(ABC):
         # Get the data from the slurm cluster
         data = self._icollecter(session, **kwargs)
 
-        # Save the data to a text file with current timestamp
-        if hasattr(self, "_save_dir"):
-            if filename is None:
-                raise ValueError(
-                    "filename must be specified when save_dir is specified."
-                )
-            with open(
-                os.path.join(
-                    self._save_dir,
-                    filename + ".txt" if not filename.endswith(".txt") else filename,
-                ),
-                "w",
-            ) as f:
-                f.write(data)
-            # Close the file
-            f.close()
+        # Save the data to a text file
+        self._save(data, filename=filename)
 
         # Return the data
         return data
 
+    def _filepath(self, filename: str | None) -> Path:
+        """Return the path of a file in the save directory.
+
+        Args:
+            filename (str): The name of the file to save the collected data.
+
+        Raises:
+            ValueError: If save_dir is specified but filename is not.
+        """
+        if filename is None:
+            raise ValueError("filename must be specified when save_dir is specified.")
+
+        return self._save_dir / (
+            filename + ".txt" if not filename.endswith(".txt") else filename
+        )
+
+    def _save(self, data: str, filename: str | None = None) -> None:
+        """Save the collected data to the save directory if one is set.
+
+        Args:
+            data (str): The collected data.
+            filename (str): The name of the file to save the collected data.
+
+        Raises:
+            ValueError: If save_dir is specified but filename is not.
+        """
+        if not hasattr(self, "_save_dir"):
+            return
+
+        with open(self._filepath(filename), "w") as f:
+            f.write(data)
+
+        return
+
+    def stream(
+        self,
+        session: SSHSessionAuth,
+        filename: str,
+        on_chunk: Callable[[bytes], None] | None = None,
+        **kwargs,
+    ) -> Path:
+        """Stream data from the Slurm cluster straight into a file of the save directory.
+
+        The data is written to a temporary file which is atomically renamed once the transfer is complete, so a
+        failed transfer never leaves a truncated file behind.
+
+        Args:
+            session (SSHSessionAuth): The SSH session to the Slurm cluster.
+            filename (str): The name of the file to save the collected data.
+            on_chunk (Callable[[bytes], None] | None, optional): Called with every chunk, e.g. to feed an incremental parser. Defaults to None.
+            kwargs (dict): Keyword arguments to pass to the icollecter.
+
+        Raises:
+            ValueError: If the collecter has no save directory.
+
+        Returns:
+            Path: The path of the saved file.
+        """
+        if not hasattr(self, "_save_dir"):
+            raise ValueError("save_dir must be specified to stream the collected data.")
+
+        filepath = self._filepath(filename)
+        partpath = filepath.with_name(f".{filepath.name}.part")
+
+        try:
+            with open(partpath, "wb") as f:
+                self._icollecter.stream(session, f, on_chunk=on_chunk, **kwargs)
+            os.replace(partpath, filepath)
+        finally:
+            if partpath.exists():
+                os.remove(partpath)
+
+        return filepath
+
     def __repr__(self) -> str:
         """Return a string representation of the AbstractCollecter instance.
 
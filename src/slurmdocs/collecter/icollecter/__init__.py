@@ -1,4 +1,6 @@
 """Top level for the ICollecter interface."""
+from .bundle_icollecter import JSON_PROBES, PROBES, IbundleCollecter
 from .icollecter import ICollecter
-from .lscpu_icollecter import IlscpuCollecter
-from .scontrol_show_node_icollecter import IscontrolColllecter
+from .lscpu_array_icollecter import IlscpuArrayCollecter
+from .lscpu_icollecter import IlscpuCollecter, IlscpuJsonCollecter
+from .scontrol_show_node_icollecter import IscontrolColllecter, IscontrolJsonCollecter
@@ -0,0 +1,201 @@
+"""Ibundle Class.
+
+Implement the Ibundle class, which collects several probes of a Slurm cluster node ('lscpu', 'free -b', 'numactl -H',
+'nvidia-smi', '/proc/meminfo') in a single job step.
+
+Every probe of the bundle is a section of the output, framed by a header line with its name, exit status and length
+in bytes, followed by exactly that many bytes of output:
+
+    @@section cpu 0 1234
+    <1234 bytes of 'lscpu' output>@@section gpu 127 0
+    @@section memory 0 230
+    ...
+
+The framing does not depend on the content of the sections, so that their outputs may contain anything. Probes that
+are not installed on the node, such as 'nvidia-smi' on a CPU node, fail with a non-zero status and are left out.
+
+Classes:
+    - 'IbundleCollecter': Collects a bundle of probes.
+
+Example:
+    ```python
+    # Collect the 'lscpu' and 'free -b' outputs of a node with a single srun
+    bundle_collector = IbundleCollecter(sections=("cpu", "memory"))
+    output = bundle_collector(ssh_session, partition='my_partition', qos='my_qos', node='my_node')
+    sections = bundle_collector.sections(output)  # {'cpu': '...', 'memory': '...'}
+    ```
+
+"""
+
+import shlex
+
+from ..backend import ExecBackend
+from ..telemetry import SweepTelemetry
+from ..tracker import JobTracker
+from .lscpu_icollecter import IlscpuCollecter
+
+__all__ = ["IbundleCollecter", "JSON_PROBES", "PROBES"]
+
+# The command of every probe, keyed by the database key of its section
+PROBES = {
+    "cpu": "lscpu",
+    "memory": "free -b",
+    "numa": "numactl -H",
+    "gpu": "nvidia-smi --query-gpu=index,name,uuid,memory.total,driver_version --format=csv",
+    "meminfo": "cat /proc/meminfo",
+}
+
+# The structured variants of the probes that have one
+JSON_PROBES = {
+    "cpu": "lscpu -J",
+}
+
+
+class IbundleCollecter(IlscpuCollecter):
+    """Collect a bundle of probes of a node in a single job step.
+
+    The bundle runs as a single node 'srun' job, or as a job step of an existing allocation with the 'jobid' keyword,
+    or through another execution backend, like 'IlscpuCollecter'. Multi-node collections are not supported since their labelled output is line based.
+
+    Attributes:
+        probes (tuple[str, ...]): The sections of the bundle, in order.
+    """
+
+    # Header of every section: name, exit status and length in bytes
+    _section_header = "@@section"
+
+    def __init__(
+        self,
+        sections: tuple[str, ...] = ("cpu",),
+        timeout: float = 10,
+        compress: str | None = None,
+        tracker: JobTracker | None = None,
+        telemetry: SweepTelemetry | None = None,
+        backend: ExecBackend | None = None,
+        json_output: bool = False,
+    ) -> None:
+        """Initialize the Ibundle instance.
+
+        Args:
+            sections (tuple[str, ...], optional): The probes of the bundle, keys of 'PROBES'. Defaults to ("cpu",).
+            timeout (float, optional): Timeout time. Defaults to 10.
+            compress (str | None, optional): Remote compression of the output ('gzip', 'zstd' or 'auto'). Defaults to None.
+            tracker (JobTracker | None, optional): Names the probe jobs after its run. Defaults to None.
+            telemetry (SweepTelemetry | None, optional): Receives the latency of every probe. Defaults to None.
+            backend (ExecBackend | None, optional): How the bundle reaches the node. Defaults to 'srun'.
+            json_output (bool, optional): Run the structured variants of the probes that have one, see
+                'JSON_PROBES'. Defaults to False.
+
+        Raises:
+            ValueError: If a section is unknown or there are no sections.
+        """
+        if len(sections) == 0:
+            raise ValueError("sections must not be empty.")
+        unknown = [section for section in sections if section not in PROBES]
+        if len(unknown) > 0:
+            raise ValueError(
+                f"Unknown sections {unknown}. Expected some of {list(PROBES)}."
+            )
+
+        super().__init__(
+            timeout=timeout,
+            compress=compress,
+            tracker=tracker,
+            telemetry=telemetry,
+            backend=backend,
+        )
+        self.feature = "bundle"
+        self.probes = tuple(dict.fromkeys(sections))
+        self._commands = {**PROBES, **(JSON_PROBES if json_output else {})}
+        self._program = f"sh -c {shlex.quote(self.script())}"
+
+    def script(self) -> str:
+        """Build the shell script running the probes and framing their outputs.
+
+        Returns:
+            str: The shell script.
+        """
+        lines = ['f=$(mktemp) || exit 1']
+        for section in self.probes:
+            lines.append(
+                f'{self._commands[section]} >"$f" 2>/dev/null; s=$?; '
+                f"printf '{self._section_header} %s %d %d\\n' {section} \"$s\" $(wc -c <\"$f\"); "
+                'cat "$f"'
+            )
+        lines.append('rm -f "$f"')
+        return "\n".join(lines)
+
+    def _command(self, **kwargs) -> str:
+        """Build the 'srun' command running the bundle on the Slurm cluster node.
+
+        Args:
+            kwargs (dict): Keyword arguments to pass to the collect method.
+
+        Raises:
+            ValueError: If required arguments ('partition', 'qos', 'node') are missing, or 'nodes' is given.
+
+        Returns:
+            str: The command to run on the login node.
+        """
+        if "nodes" in kwargs:
+            raise ValueError(
+                f"{self.__class__.__name__} collects a single node per call."
+            )
+        return super()._command(**kwargs)
+
+    def sections(self, output: str) -> dict[str, str]:
+        """Split the framed output of a bundle into the outputs of its successful probes.
+
+        Args:
+            output (str): The output of the bundle.
+
+        Raises:
+            ValueError: If the output is malformed or truncated.
+
+        Returns:
+            dict[str, str]: The output of every probe that exited with status 0, keyed by section.
+        """
+        data = output.encode("utf-8")
+        sections, pos = {}, 0
+        while pos < len(data):
+            end = data.find(b"\n", pos)
+            header = data[pos : end if end != -1 else len(data)].decode("utf-8").split()
+            if (
+                end == -1
+                or len(header) != 4
+                or header[0] != self._section_header
+                or not header[2].isdigit()
+                or not header[3].isdigit()
+            ):
+                raise ValueError(f"Malformed section header at byte {pos}: {header}.")
+
+            _, section, status, length = header
+            body = data[end + 1 : end + 1 + int(length)]
+            if len(body) < int(length):
+                raise ValueError(
+                    f"Section {section} is truncated, got {len(body)} of {length} bytes."
+                )
+            pos = end + 1 + int(length)
+
+            if int(status) == 0:
+                sections[section] = body.decode("utf-8")
+
+        return sections
+
+    def _check(self, stdout: str, stderr: str, **kwargs) -> str:
+        """Check that the bundle produced a well framed output.
+
+        Args:
+            stdout (str): The standard output of the command.
+            stderr (str): The standard error of the command.
+            kwargs (dict): Keyword arguments to pass to the collect method.
+
+        Raises:
+            ValueError: If the command produced no output or a malformed one.
+
+        Returns:
+            str: The framed output of the bundle.
+        """
+        stdout = super()._check(stdout, stderr, **kwargs)
+        self.sections(stdout)
+        return stdout
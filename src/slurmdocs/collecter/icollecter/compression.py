@@ -0,0 +1,129 @@
+"""Compression Module.
+
+This module wraps remote commands so that their output is compressed on the cluster side, and decompresses the output
+locally as a stream. Text such as 'scontrol show node' is highly redundant, so compressing it before it crosses a
+high-latency link cuts the transfer time of large outputs.
+
+Functions:
+    - 'wrap_command': Pipes a remote command through a compressor.
+
+Classes:
+    - 'StreamDecompressor': Incrementally decompresses gzip or zstd output, detected from its magic bytes.
+
+Note:
+    zstd is only used when the optional 'zstandard' package is installed locally. gzip is always available.
+"""
+
+import zlib
+
+try:
+    import zstandard  # type: ignore
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+__all__ = ["COMPRESSIONS", "StreamDecompressor", "wrap_command"]
+
+# Supported remote compressions
+COMPRESSIONS = ("gzip", "zstd", "auto")
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def wrap_command(cmd: str, compress: str | None) -> str:
+    """Pipe a remote command through a compressor.
+
+    Args:
+        cmd (str): The remote command.
+        compress (str | None): The compression to use ('gzip', 'zstd' or 'auto'). No compression if None.
+            'auto' uses zstd when it is installed on both sides and falls back to gzip otherwise.
+
+    Raises:
+        ValueError: If the compression is not supported.
+        ImportError: If zstd is requested but the 'zstandard' package is not installed.
+
+    Returns:
+        str: The wrapped command.
+    """
+    if compress is None:
+        return cmd
+
+    if compress not in COMPRESSIONS:
+        raise ValueError(
+            f"compress must be one of {COMPRESSIONS}. Got {compress} instead."
+        )
+
+    if compress == "zstd" and zstandard is None:
+        raise ImportError("The zstandard package is required for zstd compression.")
+
+    if compress == "gzip" or (compress == "auto" and zstandard is None):
+        return f"{cmd} | gzip -1 -c"
+
+    if compress == "zstd":
+        return f"{cmd} | zstd -1 -c -q"
+
+    return f"{cmd} | if command -v zstd >/dev/null 2>&1; then zstd -1 -c -q; else gzip -1 -c; fi"
+
+
+class StreamDecompressor:
+    """Incrementally decompresses gzip or zstd output.
+
+    The format is detected from the magic bytes of the stream, so the same decompressor handles every
+    compression selected by 'wrap_command', including the remote fallback of 'auto'.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the StreamDecompressor instance."""
+        self._head = b""
+        self._decompressor = None
+
+    def _detect(self) -> None:
+        """Create the decompressor from the magic bytes of the stream."""
+        if self._head.startswith(_GZIP_MAGIC):
+            self._decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+        elif self._head.startswith(_ZSTD_MAGIC):
+            if zstandard is None:
+                raise ImportError(
+                    "The zstandard package is required to decompress zstd output."
+                )
+            self._decompressor = zstandard.ZstdDecompressor().decompressobj()
+        else:
+            raise ValueError("The remote output is neither gzip nor zstd compressed.")
+
+    def decompress(self, chunk: bytes) -> bytes:
+        """Decompress a chunk of the stream.
+
+        Args:
+            chunk (bytes): A chunk of compressed data.
+
+        Returns:
+            bytes: The decompressed data available so far.
+        """
+        if self._decompressor is None:
+            # Wait for enough bytes to detect the format
+            self._head += chunk
+            if len(self._head) < len(_ZSTD_MAGIC):
+                return b""
+            self._detect()
+            chunk, self._head = self._head, b""
+
+        return self._decompressor.decompress(chunk)
+
+    def flush(self) -> bytes:
+        """Flush the remaining decompressed data at the end of the stream.
+
+        Returns:
+            bytes: The remaining decompressed data.
+        """
+        if self._decompressor is None:
+            # The stream is empty or too short to be compressed
+            if len(self._head) == 0:
+                return b""
+            self._detect()
+            head, self._head = self._head, b""
+            return self._decompressor.decompress(head) + self.flush()
+
+        if hasattr(self._decompressor, "flush"):
+            return self._decompressor.flush()
+
+        return b""
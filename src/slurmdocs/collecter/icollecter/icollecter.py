@@ -7,11 +7,21 @@ Classes:
 
 Usage:
     To implement custom data collection from the Slurm cluster, you can create a class that inherits from 'ICollecter' and implement the '_collect' method.
+    Implementing the '_command' and '_check' methods as well enables the asynchronous '__acall__' path.
+    Overriding '_on_timing' receives the duration of the phases of every collection run through '_exec'.
+    Collections of idempotent collectors are retried on transient connection errors after a reconnect.
 
 """
+import asyncio
+import functools
+import time
 from abc import ABC, abstractmethod
+from collections.abc import Callable
+from typing import BinaryIO
 
+from ...session.health import backoff_delays, is_transient
 from ...session.ssh_session import SSHSessionAuth
+from .compression import StreamDecompressor, wrap_command
 
 __all__ = ["ICollecter"]
 
@@ -26,6 +36,7 @@ class ICollecter(ABC):
 
     Attributes:
         _feature (str): The name or identifier of the data collection feature.
+        _compress (str | None): The remote compression of the output ('gzip', 'zstd', 'auto') or None.
 
     Methods:
         __init__(self, feature: str = None) -> None: Initializes the ICollecter instance.
@@ -34,13 +45,34 @@ class ICollecter(ABC):
         feature (setter): Set the name or identifier of the data collection feature.
         __repr__(self) -> str: Return a string representation of the ICollecter instance.
         __call__(self, session: SSHSessionAuth, key: str) -> Any: Calls the collector to collect data from the Slurm cluster.
+        __acall__(self, session: SSHSessionAuth, key: str) -> Any: Asynchronously collects data from the Slurm cluster.
+        stream(self, session: SSHSessionAuth, sink: BinaryIO, on_chunk: Callable) -> int: Streams data from the Slurm cluster into a sink.
 
     """
 
-    def __init__(self, timeout: float = 10.0, feature: str = None) -> None:
-        """Initialize the ICollecter instance."""
+    # Interval in seconds between polls of a channel in the asynchronous path
+    _poll_interval = 0.05
+
+    # Whether the remote command can safely run again, and how many times after a transient error
+    _idempotent = True
+    _retries = 2
+
+    def __init__(
+        self, timeout: float = 10.0, feature: str = None, compress: str | None = None
+    ) -> None:
+        """Initialize the ICollecter instance.
+
+        Args:
+            timeout (float, optional): Timeout time. Defaults to 10.
+            feature (str, optional): The name or identifier of the data collection feature. Defaults to None.
+            compress (str | None, optional): Compress the output on the remote side with 'gzip', 'zstd' or 'auto'
+                and decompress it locally as a stream. Defaults to no compression.
+        """
         self._feature = feature if feature is not None else "NoneType"
         self._timeout = timeout
+        # Validate the compression early
+        wrap_command("", compress)
+        self._compress = compress
         pass
 
     @abstractmethod
@@ -56,6 +88,288 @@ class ICollecter(ABC):
         """
         pass
 
+    def _command(self, **kwargs) -> str:
+        """Build the remote command run by the collector.
+
+        Args:
+            kwargs (dict): Keyword arguments to pass to the collect method.
+
+        Raises:
+            NotImplementedError: If the collector does not expose its remote command.
+
+        Returns:
+            str: The command to run on the remote server.
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not expose its remote command."
+        )
+
+    def _remote_command(self, **kwargs) -> str:
+        """Build the remote command, wrapped with the remote compression if any.
+
+        Args:
+            kwargs (dict): Keyword arguments to pass to the collect method.
+
+        Returns:
+            str: The command to run on the remote server.
+        """
+        return wrap_command(self._command(**kwargs), self._compress)
+
+    def _exec(self, session: SSHSessionAuth, **kwargs) -> tuple[str, str]:
+        """Run the remote command and read its whole output.
+
+        Args:
+            session (SSHSessionAuth): The SSH session to the Slurm cluster.
+            kwargs (dict): Keyword arguments to pass to the collect method.
+
+        Raises:
+            TimeoutError: If the command timed out.
+
+        Returns:
+            tuple[str, str]: The standard output and the standard error of the command.
+        """
+        started = time.monotonic()
+        _, stdout, stderr = session.session.exec_command(
+            self._remote_command(**kwargs), timeout=self._timeout
+        )
+        opened = time.monotonic()
+
+        try:
+            # Time the first byte apart, it ends the wait on the scheduler
+            output = stdout.read(1)
+            first = time.monotonic()
+            output += stdout.read()
+        except TimeoutError as e:
+            # Keep what the command reported before timing out, such as the job id of a queued 'srun'
+            e.stderr = self._drain_stderr(stdout.channel)
+            raise
+        self._on_timing(
+            {
+                "channel": opened - started,
+                "queue": first - opened,
+                "runtime": time.monotonic() - first,
+            },
+            **kwargs,
+        )
+        if self._compress is not None:
+            decompressor = StreamDecompressor()
+            output = decompressor.decompress(output) + decompressor.flush()
+
+        return output.decode("utf-8"), stderr.read().decode("utf-8")
+
+    @staticmethod
+    def _drain_stderr(channel: object) -> str:
+        """Read the error stream already received on a channel, without blocking."""
+        error = b""
+        while channel.recv_stderr_ready():
+            error += channel.recv_stderr(32768)
+        return error.decode("utf-8", errors="replace")
+
+    def _check(self, stdout: str, stderr: str, **kwargs) -> str:  # noqa : ARG002
+        """Validate the output of the remote command.
+
+        Args:
+            stdout (str): The standard output of the remote command.
+            stderr (str): The standard error of the remote command.
+            kwargs (dict): Keyword arguments to pass to the collect method.
+
+        Returns:
+            str: The collected data as a string.
+        """
+        return stdout
+
+    def demultiplex(self, output: str) -> dict[str, str]:
+        """Split the output of a multi-node collection into per-node outputs.
+
+        Args:
+            output (str): The collected data of several nodes.
+
+        Raises:
+            NotImplementedError: If the collector only collects a single node per call.
+
+        Returns:
+            dict[str, str]: The collected data keyed by node name.
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not collect multiple nodes per call."
+        )
+
+    def _on_cancel(self, session: SSHSessionAuth, **kwargs) -> None:  # noqa : ARG002
+        """Clean up the remote side after a collection timed out or was cancelled.
+
+        Args:
+            session (SSHSessionAuth): The SSH session to the Slurm cluster.
+            kwargs (dict): Keyword arguments to pass to the collect method, and the 'output' of the error stream
+                received before the cancellation.
+        """
+        return
+
+    def _on_timing(self, timings: dict[str, float], **kwargs) -> None:  # noqa : ARG002
+        """Report the duration of the phases of a collection.
+
+        Args:
+            timings (dict[str, float]): The duration in seconds of opening the channel ('channel'), of waiting for
+                the first output ('queue') and of reading the rest of the output ('runtime').
+            kwargs (dict): Keyword arguments to pass to the collect method.
+        """
+        return
+
+    async def _acollect(self, session: SSHSessionAuth, **kwargs) -> str:
+        """Asynchronously collect data from the Slurm cluster.
+
+        The channel is opened in the default executor, then polled from the event loop so that thousands of
+        in-flight commands do not hold an OS thread each while waiting on the scheduler.
+
+        Args:
+            session (SSHSessionAuth): The SSH session to the Slurm cluster.
+            kwargs (dict): Keyword arguments to pass to the collect method.
+
+        Raises:
+            asyncio.CancelledError: If the collection is cancelled, after the channel is closed.
+            ConnectionError: If the channel closed before the command exited.
+
+        Returns:
+            str: The collected data as a string.
+        """
+        cmd = self._remote_command(**kwargs)
+        loop = asyncio.get_running_loop()
+
+        # Opening a channel waits on the server, keep it off the event loop
+        started = time.monotonic()
+        _, stdout, _ = await loop.run_in_executor(
+            None,
+            functools.partial(session.session.exec_command, cmd, timeout=self._timeout),
+        )
+        opened = time.monotonic()
+        channel = stdout.channel
+        first = None
+
+        out, err = bytearray(), bytearray()
+        try:
+            while True:
+                idle = True
+                if channel.recv_ready():
+                    out += channel.recv(32768)
+                    idle = False
+                    if first is None:
+                        first = time.monotonic()
+                if channel.recv_stderr_ready():
+                    err += channel.recv_stderr(32768)
+                    idle = False
+                if (
+                    idle
+                    and channel.exit_status_ready()
+                    and not channel.recv_ready()
+                    and not channel.recv_stderr_ready()
+                ):
+                    break
+                # A dead transport closes the channel without an exit status
+                if (
+                    idle
+                    and channel.closed
+                    and not channel.recv_ready()
+                    and not channel.recv_stderr_ready()
+                ):
+                    raise ConnectionError(
+                        f"The channel closed before the command exited: {self._command(**kwargs)}."
+                    )
+                if idle:
+                    await asyncio.sleep(self._poll_interval)
+        except asyncio.CancelledError:
+            channel.close()
+            await loop.run_in_executor(
+                None,
+                functools.partial(
+                    self._on_cancel,
+                    session,
+                    output=err.decode("utf-8", errors="replace"),
+                    **kwargs,
+                ),
+            )
+            raise
+
+        channel.close()
+        ended = time.monotonic()
+        first = first if first is not None else ended
+        self._on_timing(
+            {
+                "channel": opened - started,
+                "queue": first - opened,
+                "runtime": ended - first,
+            },
+            **kwargs,
+        )
+
+        if self._compress is not None:
+            decompressor = StreamDecompressor()
+            out = decompressor.decompress(bytes(out)) + decompressor.flush()
+
+        return self._check(out.decode("utf-8"), err.decode("utf-8"), **kwargs)
+
+    def stream(
+        self,
+        session: SSHSessionAuth,
+        sink: BinaryIO,
+        on_chunk: Callable[[bytes], None] | None = None,
+        chunk_size: int = 32768,
+        **kwargs,
+    ) -> int:
+        """Stream the output of the remote command into a sink as it arrives.
+
+        The output is never held in memory as a whole. The first chunk and the error stream are validated with '_check'.
+
+        Args:
+            session (SSHSessionAuth): The SSH session to the Slurm cluster.
+            sink (BinaryIO): The binary file-like object receiving the output.
+            on_chunk (Callable[[bytes], None] | None, optional): Called with every chunk, e.g. to feed an incremental parser. Defaults to None.
+            chunk_size (int, optional): The maximum size of a chunk in bytes. Defaults to 32768.
+            kwargs (dict): Keyword arguments to pass to the collect method.
+
+        Returns:
+            int: The number of bytes written to the sink.
+        """
+        session.connect()
+
+        try:
+            _, stdout, stderr = session.session.exec_command(
+                self._remote_command(**kwargs), timeout=self._timeout
+            )
+        except TimeoutError:
+            self._on_cancel(session, **kwargs)
+            raise TimeoutError(
+                f"Timeout when running the command: {self._command(**kwargs)}."
+            )
+
+        channel = stdout.channel
+        decompressor = StreamDecompressor() if self._compress is not None else None
+        head, written = b"", 0
+        while True:
+            raw = channel.recv(chunk_size)
+
+            # Decompress as the chunks arrive and flush at the end of the stream
+            if decompressor is None:
+                chunk = raw
+            elif len(raw) > 0:
+                chunk = decompressor.decompress(raw)
+            else:
+                chunk = decompressor.flush()
+
+            if len(chunk) > 0:
+                if written == 0:
+                    head = chunk
+                sink.write(chunk)
+                if on_chunk is not None:
+                    on_chunk(chunk)
+                written += len(chunk)
+
+            if len(raw) == 0:
+                break
+
+        error = stderr.read().decode("utf-8", errors="replace")
+        self._check(head.decode("utf-8", errors="ignore"), error, **kwargs)
+
+        return written
+
     @property
     def feature(self) -> str:
         """Get the name or identifier of the data collection feature.
@@ -83,9 +397,46 @@ class ICollecter(ABC):
         """
         return f"{self.__class__.__name__}({self.feature})"
 
+    def _should_retry(self, error: BaseException, attempt: int) -> bool:
+        """Check if a failed collection should be retried.
+
+        Args:
+            error (BaseException): The error raised by the collection.
+            attempt (int): The number of the failed attempt, starting at 0.
+
+        Returns:
+            bool: True if the collection should be retried after a reconnect.
+        """
+        return self._idempotent and attempt < self._retries and is_transient(error)
+
     def __call__(self, session: SSHSessionAuth, **kwargs) -> str:
         """Call method for collecting data from the Slurm cluster.
 
+        Idempotent collections are retried on transient connection errors, after re-establishing the session.
+
+        Args:
+            session (SSHSessionAuth): The SSH session to the Slurm cluster.
+            kwargs (dict): Keyword arguments to pass to the collect method.
+
+        Returns:
+            Any: The collected data.
+        """
+        delays = backoff_delays()
+        attempt = 0
+        while True:
+            try:
+                return self._collect(session, **kwargs)
+            except Exception as e:
+                if not self._should_retry(e, attempt):
+                    raise
+            # Re-establish the session only if the transport itself was dropped
+            time.sleep(next(delays))
+            session.connect()
+            attempt += 1
+
+    async def __acall__(self, session: SSHSessionAuth, **kwargs) -> str:
+        """Asynchronous call method for collecting data from the Slurm cluster.
+
         Args:
             session (SSHSessionAuth): The SSH session to the Slurm cluster.
             kwargs (dict): Keyword arguments to pass to the collect method.
@@ -93,4 +444,16 @@ class ICollecter(ABC):
         Returns:
             Any: The collected data.
         """
-        return self._collect(session, **kwargs)
+        loop = asyncio.get_running_loop()
+        delays = backoff_delays()
+        attempt = 0
+        while True:
+            try:
+                return await self._acollect(session, **kwargs)
+            except Exception as e:
+                if not self._should_retry(e, attempt):
+                    raise
+            # Re-establish the session only if the transport itself was dropped
+            await asyncio.sleep(next(delays))
+            await loop.run_in_executor(None, session.connect)
+            attempt += 1
@@ -0,0 +1,266 @@
+"""IlscpuArray Class.
+
+Implement the IlscpuArray class, which collects 'lscpu' information from many Slurm cluster nodes with a single job array.
+
+Classes:
+    - 'IlscpuArrayCollecter': Collects 'lscpu' information with one 'sbatch --array' submission.
+
+Usage:
+    Every task of the job array runs 'lscpu' on its assigned node and writes the output to a scratch directory on the
+    shared filesystem. Once the array is done, all the outputs are fetched in one streamed tar over the SSH session,
+    which replaces thousands of interactive 'srun' sessions with one submission and one bulk transfer.
+
+Example:
+    ```python
+    from my_module import IlscpuArrayCollecter
+    from my_ssh_session_module import SSHSessionAuth
+
+    # Instantiate the collector
+    icollecter = IlscpuArrayCollecter(timeout=600)
+
+    # Create an SSH session
+    ssh_session = SSHSessionAuth(host='slurm-cluster.example.com', username='user', password='password')
+
+    # Collect 'lscpu' information for several nodes and split it per node
+    output = icollecter(ssh_session, partition='my_partition', qos='my_qos', nodes=['node-1', 'node-2'])
+    node_infos = icollecter.demultiplex(output)
+    ```
+
+Raises:
+    - 'ValueError': If required arguments ('partition', 'qos', 'nodes') are missing or invalid.
+    - 'RuntimeError': If the job array could not be submitted.
+
+Returns:
+    - 'str': The collected 'lscpu' information of every node as a JSON object.
+
+"""
+
+import json
+import shlex
+import tarfile
+import time
+import uuid
+from pathlib import PurePosixPath
+
+from slurmdocs.session.ssh_session import SSHSessionAuth
+
+from ..tracker import JobTracker
+from .icollecter import ICollecter
+
+__all__ = ["IlscpuArrayCollecter"]
+
+
+class IlscpuArrayCollecter(ICollecter):
+    """Collect the lscpu information of many nodes with a single job array.
+
+    The array is submitted held, every pending task is pinned to its node with 'scontrol update ReqNodeList' and
+    the array is then released, or cancelled if any update fails. The collector polls 'squeue' until the array leaves the queue, or cancels it after the timeout, and
+    fetches whatever results exist in one tar stream.
+    """
+
+    # A retry would submit a second job array
+    _idempotent = False
+
+    def __init__(
+        self,
+        timeout: float = 600,
+        scratch_dir: str = ".slurmdocs/scratch",
+        poll_interval: float = 5.0,
+        tracker: JobTracker | None = None,
+    ) -> None:
+        """Initialize the IlscpuArray instance.
+
+        Args:
+            timeout (float, optional): Time to wait for the whole array to finish. Defaults to 600.
+            scratch_dir (str, optional): Scratch directory on the shared filesystem, relative to the remote home. Defaults to ".slurmdocs/scratch".
+            poll_interval (float, optional): Interval between 'squeue' polls. Defaults to 5.
+            tracker (JobTracker | None, optional): Names the job arrays after its run, records their job ids and
+                cancels the timed-out ones in bulk. Defaults to one job name per array.
+        """
+        self._tracker = tracker
+        self._scratch_dir = scratch_dir
+        self._squeue_interval = poll_interval
+        super().__init__(timeout, feature="lscpu")
+
+    def _run_dir(self, run: str) -> str:
+        """Return the remote scratch directory of a run."""
+        return str(PurePosixPath("$HOME") / self._scratch_dir / run)
+
+    def _job_name(self, run: str) -> str:
+        """Return the Slurm job name of a job array."""
+        return self._tracker.name if self._tracker is not None else f"lscpu-{run}"
+
+    def _command(self, **kwargs) -> str:
+        """Build the script submitting the held job array and pinning each task to a node.
+
+        Args:
+            kwargs (dict): Keyword arguments to pass to the collect method.
+
+        Raises:
+            ValueError: If required arguments ('partition', 'qos', 'nodes', 'run') are missing or invalid.
+
+        Returns:
+            str: The script to run on the login node. It prints the job id of the array.
+        """
+        for arg in ("partition", "qos", "nodes", "run"):
+            if arg not in kwargs:
+                raise ValueError(f"{arg} argument is required.")
+        if len(kwargs["nodes"]) == 0:
+            raise ValueError("nodes argument must not be empty.")
+
+        nodes = list(kwargs["nodes"])
+        run_dir = self._run_dir(kwargs["run"])
+
+        # Every task writes its output atomically under the node name
+        wrap = (
+            f'lscpu > {run_dir}/.\\$SLURMD_NODENAME.tmp '
+            f'&& mv {run_dir}/.\\$SLURMD_NODENAME.tmp {run_dir}/\\$SLURMD_NODENAME.txt'
+        )
+
+        return "\n".join(
+            [
+                "set -e",
+                f'mkdir -p "{run_dir}"',
+                f"jid=$(sbatch --parsable --hold --array=0-{len(nodes) - 1} -n 1 -c 1 "
+                f"-p {kwargs['partition']} --qos {kwargs['qos']} -J {self._job_name(kwargs['run'])} "
+                f'-o /dev/null --wrap "{wrap}" | cut -d";" -f1)',
+                # A held array left behind by a failed update would stay queued forever
+                "trap 'scancel \"$jid\"' ERR",
+                "i=0",
+                f"for node in {' '.join(shlex.quote(node) for node in nodes)}; do",
+                '  scontrol update JobId="${jid}_${i}" ReqNodeList="$node"',
+                "  i=$((i+1))",
+                "done",
+                'scontrol release "$jid"',
+                'echo "$jid"',
+            ]
+        )
+
+    def _submit(self, session: SSHSessionAuth, **kwargs) -> str:
+        """Submit the job array and return its job id."""
+        _, stdout, stderr = session.session.exec_command(self._command(**kwargs))
+        jobid = stdout.read().decode("utf-8").strip()
+        error = stderr.read().decode("utf-8")
+
+        if stdout.channel.recv_exit_status() != 0 or not jobid.isdigit():
+            raise RuntimeError(f"Unable to submit the lscpu job array: {error}")
+
+        return jobid
+
+    def _wait(self, session: SSHSessionAuth, jobid: str) -> bool:
+        """Wait for the job array to leave the queue.
+
+        A failed 'squeue', e.g. on a transient slurmctld timeout, counts as still running, unless the job id is no
+        longer known to the controller.
+
+        Returns:
+            bool: True if the array finished before the timeout, False otherwise.
+        """
+        deadline = time.monotonic() + self._timeout
+        while time.monotonic() < deadline:
+            _, stdout, stderr = session.session.exec_command(
+                f"squeue -h -j {jobid} -o %i"
+            )
+            output = stdout.read().decode("utf-8").strip()
+            error = stderr.read().decode("utf-8")
+            status = stdout.channel.recv_exit_status()
+            if status == 0 and len(output) == 0:
+                return True
+            if status != 0 and "invalid job id" in error.lower():
+                return True
+            time.sleep(self._squeue_interval)
+
+        return False
+
+    def _fetch(self, session: SSHSessionAuth, run: str) -> dict[str, str]:
+        """Fetch every result of the run in one streamed tar, then remove the scratch directory.
+
+        The directory is only removed once the whole archive has been read, so that a failed transfer keeps the
+        results on the cluster.
+        """
+        run_dir = self._run_dir(run)
+        _, stdout, _ = session.session.exec_command(f'cd "{run_dir}" && tar -cf - .')
+
+        outputs = {}
+        try:
+            with tarfile.open(fileobj=stdout, mode="r|") as archive:
+                for member in archive:
+                    # Skip the temporary files of unfinished tasks
+                    if not member.isfile() or not member.name.endswith(".txt"):
+                        continue
+                    node = PurePosixPath(member.name).name[: -len(".txt")]
+                    outputs[node] = archive.extractfile(member).read().decode("utf-8")
+        except tarfile.ReadError:
+            # The scratch directory does not exist, no task has run
+            return {}
+
+        if stdout.channel.recv_exit_status() == 0:
+            _, stdout, _ = session.session.exec_command(f'rm -rf "{run_dir}"')
+            stdout.channel.recv_exit_status()
+
+        return outputs
+
+    def _on_cancel(self, session: SSHSessionAuth, **kwargs) -> None:
+        """Cancel the job array after a timeout or cancellation.
+
+        Args:
+            session (SSHSessionAuth): The SSH session to the Slurm cluster.
+            kwargs (dict): Keyword arguments to pass to the collect method, and the 'jobid' of the array.
+        """
+        # Leave the arrays of a run to its tracker, an array not submitted yet is cancelled with the run
+        if self._tracker is not None:
+            if "jobid" in kwargs:
+                self._tracker.abandon(session, [kwargs["jobid"]])
+            return
+
+        session.session.exec_command(
+            f"scancel -n {self._job_name(kwargs['run'])} -u {session.remote_username}"
+        )
+        return
+
+    def _collect(self, session: SSHSessionAuth, **kwargs) -> str:
+        """Collect 'lscpu' information from many Slurm cluster nodes with a job array.
+
+        Args:
+            session (SSHSessionAuth): The SSH session to the Slurm cluster.
+            kwargs (dict): Keyword arguments to pass to the collect method.
+
+        Raises:
+            ValueError: If required arguments ('partition', 'qos', 'nodes') are missing or invalid.
+            RuntimeError: If the job array could not be submitted.
+
+        Returns:
+            str: The collected 'lscpu' information of every node as a JSON object.
+        """
+        # Connect to the session
+        session.connect()
+
+        # Unique identifier of the run for the scratch directory and job name
+        kwargs.setdefault("run", uuid.uuid4().hex[:12])
+
+        jobid = self._submit(session, **kwargs)
+        if self._tracker is not None:
+            self._tracker.track([jobid])
+
+        # Cancel the remaining tasks on timeout and keep the partial results
+        if not self._wait(session, jobid):
+            self._on_cancel(session, jobid=jobid, **kwargs)
+
+        outputs = self._fetch(session, kwargs["run"])
+        if len(outputs) == 0:
+            raise ValueError(
+                f"No output from the lscpu job array {jobid}. Check if the nodes are available under partition : {kwargs['partition']} and QOS: {kwargs['qos']}."
+            )
+
+        return json.dumps(outputs)
+
+    def demultiplex(self, output: str) -> dict[str, str]:
+        """Split the output of a job array collection into per-node 'lscpu' outputs.
+
+        Args:
+            output (str): The output of a job array collection.
+
+        Returns:
+            dict[str, str]: The 'lscpu' output keyed by node name.
+        """
+        return json.loads(output)
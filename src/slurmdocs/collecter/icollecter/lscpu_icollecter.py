@@ -4,6 +4,7 @@ Implement the Ilscpu class, which collects 'lscpu' information from a specific S
 
 Classes:
     - 'Ilscpu': Collects 'lscpu' information.
+    - 'IlscpuJsonCollecter': Collects the structured 'lscpu -J' information.
 
 Usage:
     To collect 'lscpu' information from a Slurm cluster node, create an instance of the 'Ilscpu' class and call it with the required arguments.
@@ -21,6 +22,21 @@ Example:
 
     # Collect 'lscpu' information for a specific node
     node_info = ilscpu_collector(ssh_session, partition='my_partition', qos='my_qos', node='my_node')
+
+    # Collect 'lscpu' information as a job step inside an existing allocation
+    node_info = ilscpu_collector(ssh_session, node='my_node', jobid='1234')
+
+    # Tag the probe jobs with the name of a run, to cancel the jobs left by timed-out probes in bulk
+    tracker = JobTracker()
+    node_info = Ilscpu(tracker=tracker)(ssh_session, partition='my_partition', qos='my_qos', node='my_node')
+    tracker.cancel(ssh_session)
+
+    # Collect 'lscpu' information over SSH, through the login node, without going through the scheduler
+    node_info = Ilscpu(backend=DirectSSHBackend())(ssh_session, node='my_node')
+
+    # Collect 'lscpu' information for several nodes with a single srun and split it per node
+    output = ilscpu_collector(ssh_session, partition='my_partition', qos='my_qos', nodes=['node-1', 'node-2'])
+    node_infos = ilscpu_collector.demultiplex(output)
     ```
 
 Attributes:
@@ -29,9 +45,10 @@ Attributes:
 Methods:
     - '__init__(self, timeout: float = 10) -> None': Initializes the Ilscpu instance.
     - '_collect(self, session: SSHSessionAuth, **kwargs) -> str': Collects 'lscpu' information from the Slurm cluster node.
+    - 'demultiplex(self, output: str) -> dict[str, str]': Splits the labelled output of a batched collection per node.
 
 Raises:
-    - 'ValueError': If required arguments ('partition', 'qos', 'node') are missing or invalid.
+    - 'ValueError': If required arguments ('partition', 'qos', 'node' or 'nodes') are missing or invalid.
 
 Returns:
     - 'str': The collected 'lscpu' information as a string.
@@ -39,78 +56,254 @@ Returns:
 """
 
 
+import asyncio
+import time
+
 from slurmdocs.session.ssh_session import SSHSessionAuth
 
+from ..backend import ExecBackend, SrunBackend
+from ..telemetry import SweepTelemetry
+from ..tracker import JobTracker
 from .icollecter import ICollecter
 
-__all__ = ["IlscpuCollecter"]
+__all__ = ["IlscpuCollecter", "IlscpuJsonCollecter"]
 
 
 class IlscpuCollecter(ICollecter):
-    """Collect the lscpu information."""
+    """Collect the lscpu information.
+
+    A single node is probed with one 'srun' job when the 'node' keyword is given. When the 'nodes' keyword is given
+    instead, all the nodes are probed with one multi-node 'srun' with labelled output, which costs a single
+    scheduler round trip. Each task prints a header with its node name so that 'demultiplex' can split the output.
+    Other execution backends reach the nodes with a parallel shell or direct SSH instead of 'srun'.
+    """
 
-    def __init__(self, timeout: float = 10) -> None:
+    # Program run on a single node by the job or job step
+    _program = "lscpu"
+
+    def __init__(
+        self,
+        timeout: float = 10,
+        compress: str | None = None,
+        tracker: JobTracker | None = None,
+        telemetry: SweepTelemetry | None = None,
+        backend: ExecBackend | None = None,
+    ) -> None:
         """Initialize the Ilscpu instance.
 
         Args:
             timeout (float, optional): Timeout time. Defaults to 10.
+            compress (str | None, optional): Remote compression of the output ('gzip', 'zstd' or 'auto'). Defaults to None.
+            tracker (JobTracker | None, optional): Names the probe jobs after its run, records their job ids and
+                cancels the timed-out ones in bulk. Defaults to one job name per node and one 'scancel' per timeout.
+            telemetry (SweepTelemetry | None, optional): Receives the latency of every probe split into phases.
+                Defaults to None.
+            backend (ExecBackend | None, optional): How the probes reach the nodes. Defaults to 'srun'.
         """
-        super().__init__(timeout, feature="lscpu")
+        self._tracker = tracker
+        self._telemetry = telemetry
+        self._backend = backend if backend is not None else SrunBackend()
+        super().__init__(timeout, feature="lscpu", compress=compress)
 
-    def _collect(self, session: SSHSessionAuth, **kwargs) -> str:
-        """Collect 'lscpu' information from the Slurm cluster node.
+    def _command(self, **kwargs) -> str:
+        """Build the 'srun lscpu' command for the Slurm cluster node(s), or its equivalent for the backend.
 
         Args:
-            session (SSHSessionAuth): The SSH session to the Slurm cluster.
             kwargs (dict): Keyword arguments to pass to the collect method.
 
         Raises:
-            ValueError: If required arguments ('partition', 'qos', 'node') are missing or invalid.
+            ValueError: If required arguments ('partition', 'qos', 'node' or 'nodes') are missing or invalid.
+                The partition and qos are not required when 'jobid' names an existing allocation, or when the
+                backend does not go through the scheduler.
 
         Returns:
-            str: The collected 'lscpu' information as a string.
+            str: The command to run on the login node.
         """
-        # Connect to the session
-        session.connect()
-
         # Check for additional arguments
-        if "node" not in kwargs:
-            raise ValueError("node argument is required.")
-        if "partition" not in kwargs:
+        if "node" not in kwargs and "nodes" not in kwargs:
+            raise ValueError("node or nodes argument is required.")
+
+        # Slurm srun command to run lscpu as a job step inside an existing allocation
+        if "jobid" in kwargs:
+            if "node" not in kwargs:
+                raise ValueError("node argument is required with jobid.")
+            if not self._backend.scheduled:
+                raise ValueError(
+                    f"jobid requires the srun backend. Got {self._backend.name} instead."
+                )
+            return self._backend.command(
+                self._program, kwargs["node"], jobid=kwargs["jobid"]
+            )
+
+        if self._backend.scheduled and "partition" not in kwargs:
             raise ValueError("partition argument is required.")
-        if "qos" not in kwargs:
+        if self._backend.scheduled and "qos" not in kwargs:
             raise ValueError("qos argument is required.")
+        if "nodes" in kwargs and len(kwargs["nodes"]) == 0:
+            raise ValueError("nodes argument must not be empty.")
 
-        # Get the partition, qos, and node
-        partition = kwargs["partition"]
-        qos = kwargs["qos"]
-        node = kwargs["node"]
-
-        # Slurm srun command to run lscpu on the node
-        cmd = f"srun -n 1 -c 1 -p {partition} --qos {qos} -J {node[-1:-5]} --nodelist={node} lscpu"
+        # Get the partition, qos
+        job = dict(
+            partition=kwargs.get("partition"),
+            qos=kwargs.get("qos"),
+            name=self._job_name(**kwargs),
+        )
 
-        # Run the command
-        try:
-            stdin, stdout, stderr = session.session.exec_command(
-                cmd, timeout=self._timeout
-            )
-        except TimeoutError:
-            session.session.exec_command(
-                f"scancel -n {node[-1:-5]} -u {session.remote_username}"
-            )
-            raise TimeoutError(
-                f"""Timeout when running the command: {cmd}.
-                               Check if the node {node} is available under partition : {partition} and QOS: {qos}.
-                               Check if the node is not busy."""
+        # Run lscpu on every node in one command with labelled output
+        if "nodes" in kwargs:
+            return self._backend.batch_command(
+                self._program, list(kwargs["nodes"]), **job
             )
 
-        # Read the output
-        stdout = stdout.read().decode("utf-8")
+        # Run lscpu on the node
+        return self._backend.command(self._program, kwargs["node"], **job)
+
+    def _job_name(self, **kwargs) -> str:
+        """Return the Slurm job name of a probe."""
+        if self._tracker is not None:
+            return self._tracker.name
+        node = kwargs["node"] if "node" in kwargs else kwargs["nodes"][0]
+        return f"lscpu-{node}"
+
+    def _on_timing(self, timings: dict[str, float], **kwargs) -> None:
+        """Report the duration of the phases of a probe to the telemetry, for every probed node.
+
+        Args:
+            timings (dict[str, float]): The duration in seconds of the phases of the probe.
+            kwargs (dict): Keyword arguments to pass to the collect method.
+        """
+        if self._telemetry is None:
+            return
+        nodes = [kwargs["node"]] if "node" in kwargs else list(kwargs["nodes"])
+        self._telemetry.time(nodes, **timings)
+        return
+
+    def _check(self, stdout: str, stderr: str, **kwargs) -> str:  # noqa : ARG002
+        """Check that the 'lscpu' command produced an output.
+
+        Args:
+            stdout (str): The standard output of the command.
+            stderr (str): The standard error of the command.
+            kwargs (dict): Keyword arguments to pass to the collect method.
+
+        Raises:
+            ValueError: If the command produced no output.
+
+        Returns:
+            str: The collected 'lscpu' information as a string.
+        """
+        if self._tracker is not None:
+            self._tracker.record(stderr)
 
         # Check if there is any output
         if len(stdout) == 0:
+            node = kwargs["node"] if "node" in kwargs else ",".join(kwargs["nodes"])
             raise ValueError(
-                f"No output from lscpu command. Check if the node {node} is available under partition : {partition} and QOS: {qos}."
+                f"No output from lscpu command. Check if the node {node} is available under partition : {kwargs.get('partition')} and QOS: {kwargs.get('qos')}."
             )
 
         return stdout
+
+    def demultiplex(self, output: str) -> dict[str, str]:
+        """Split the labelled output of a batched collection into per-node 'lscpu' outputs.
+
+        Args:
+            output (str): The output of a batched collection.
+
+        Returns:
+            dict[str, str]: The 'lscpu' output keyed by node name.
+        """
+        return self._backend.demultiplex(output)
+
+    def _on_cancel(self, session: SSHSessionAuth, **kwargs) -> None:
+        """Cancel the probe job after a timeout or cancellation.
+
+        Args:
+            session (SSHSessionAuth): The SSH session to the Slurm cluster.
+            kwargs (dict): Keyword arguments to pass to the collect method, and the 'output' of the error stream
+                received before the timeout.
+        """
+        # Job steps end with the release of their allocation, and only Slurm jobs wait in a queue
+        if "jobid" in kwargs or not self._backend.scheduled:
+            return
+
+        # Leave the jobs of a run to its tracker, jobs not queued yet are cancelled with the run
+        if self._tracker is not None:
+            jobids = self._tracker.record(kwargs.get("output", ""))
+            if len(jobids) > 0:
+                self._tracker.abandon(session, jobids)
+            return
+
+        session.session.exec_command(
+            f"scancel -n {self._job_name(**kwargs)} -u {session.remote_username}"
+        )
+        return
+
+    def _collect(self, session: SSHSessionAuth, **kwargs) -> str:
+        """Collect 'lscpu' information from the Slurm cluster node.
+
+        Args:
+            session (SSHSessionAuth): The SSH session to the Slurm cluster.
+            kwargs (dict): Keyword arguments to pass to the collect method.
+
+        Raises:
+            ValueError: If required arguments ('partition', 'qos', 'node' or 'nodes') are missing or invalid.
+
+        Returns:
+            str: The collected 'lscpu' information as a string.
+        """
+        # Connect to the session, and to the node if the backend reaches it directly
+        session.connect()
+        if "node" in kwargs:
+            started = time.monotonic()
+            target = self._backend.target(session, kwargs["node"])
+            self._on_timing({"channel": time.monotonic() - started}, **kwargs)
+        else:
+            target = session
+
+        # Run the command
+        try:
+            stdout, stderr = self._exec(target, **kwargs)
+        except TimeoutError as e:
+            self._on_cancel(session, output=getattr(e, "stderr", ""), **kwargs)
+            raise TimeoutError(
+                f"""Timeout when running the command: {self._command(**kwargs)}.
+                               Check if the node {kwargs.get('node', kwargs.get('nodes'))} is available under partition : {kwargs.get('partition')} and QOS: {kwargs.get('qos')}.
+                               Check if the node is not busy."""
+            )
+        finally:
+            self._backend.release(session, target)
+
+        return self._check(stdout, stderr, **kwargs)
+
+    async def _acollect(self, session: SSHSessionAuth, **kwargs) -> str:
+        """Asynchronously collect 'lscpu' information, on the node itself if the backend reaches it directly.
+
+        Args:
+            session (SSHSessionAuth): The SSH session to the Slurm cluster.
+            kwargs (dict): Keyword arguments to pass to the collect method.
+
+        Returns:
+            str: The collected 'lscpu' information as a string.
+        """
+        if "node" not in kwargs:
+            return await super()._acollect(session, **kwargs)
+
+        loop = asyncio.get_running_loop()
+        target = await loop.run_in_executor(
+            None, self._backend.target, session, kwargs["node"]
+        )
+        try:
+            return await super()._acollect(target, **kwargs)
+        finally:
+            self._backend.release(session, target)
+
+
+class IlscpuJsonCollecter(IlscpuCollecter):
+    """Collect the lscpu information as JSON with 'lscpu -J', parsed by 'IlscpuJsonParser'.
+
+    The probes are run and batched like the ones of 'IlscpuCollecter'.
+    """
+
+    # Program run on a single node by the job or job step
+    _program = "lscpu -J"
@@ -4,6 +4,7 @@ Implement the Iscontrol class, which collects information using the 'scontrol sh
 
 Classes:
     - 'Iscontrol': Collects information using the 'scontrol show node' command.
+    - 'IscontrolJsonCollecter': Collects the structured 'scontrol show node --json' output of Slurm 21.08 and later.
 
 Attributes:
     None
@@ -43,11 +44,24 @@ Version:
     1.0.0
 
 """
+import re
+import shlex
+
 from slurmdocs.session.ssh_session import SSHSessionAuth
 
 from .icollecter import ICollecter
 
-__all__ = ["IscontrolColllecter"]
+__all__ = ["IscontrolColllecter", "IscontrolJsonCollecter"]
+
+# Keeps the 'key=value' fields in 'keep' of every one-line record, records separated by a blank line. A value runs
+# up to the next 'Key=' word, so the values with spaces of 'Reason', 'OS' or 'Comment' are kept whole
+_PROJECTION = (
+    'BEGIN { n = split(keep, k, ","); for (i = 1; i <= n; i++) w[k[i]] = 1 } '
+    '{ s = ""; on = 0; for (i = 1; i <= NF; i++) { p = index($i, "="); sep = " "; '
+    'if (p > 1 && substr($i, 1, p - 1) ~ /^[A-Za-z][A-Za-z0-9_]*$/) '
+    '{ on = (substr($i, 1, p - 1) in w); sep = (s == "" ? "" : " ") } '
+    'if (on) s = s sep $i } print s; print "" }'
+)
 
 
 class IscontrolColllecter(ICollecter):
@@ -66,15 +80,72 @@ class IscontrolColllecter(ICollecter):
         To collect information from a Slurm cluster using the 'scontrol show node' command, create an instance of the 'Iscontrol' class and call it with the required arguments.
     """
 
-    def __init__(self, timeout: float = 10) -> None:
+    def __init__(
+        self,
+        timeout: float = 10,
+        compress: str | None = None,
+        fields: tuple[str, ...] | None = None,
+    ) -> None:
         """Initialize the Iscontrol instance.
 
         Args:
             timeout (float, optional): Timeout time for the SSH session. Defaults to 10.
+            compress (str | None, optional): Remote compression of the output ('gzip', 'zstd' or 'auto'). Defaults to None.
+            fields (tuple[str, ...] | None, optional): Only collect these fields of every node, projected on the
+                cluster side. 'NodeName' is always collected. Defaults to every field.
+
+        Raises:
+            ValueError: If a field name is invalid.
         """
-        super().__init__(timeout, feature="lscpu")
+        super().__init__(timeout, feature="lscpu", compress=compress)
+
+        if fields is not None:
+            invalid = [field for field in fields if re.match(r"^\w+$", field) is None]
+            if len(invalid) > 0:
+                raise ValueError(f"Invalid field names {invalid}.")
+            fields = tuple(dict.fromkeys(("NodeName", *fields)))
+        self.fields = fields
+
+    def _command(self, **kwargs) -> str:  # noqa : ARG002
+        """Build the 'scontrol show node' command.
+
+        With fields, the one-line records of 'scontrol -o' are projected with 'awk' on the cluster side, so that only
+        the fields cross the wire. The records keep the 'key=value' tokens and the blank line separator of the full
+        output, which the parsers read the same way.
+
+        Args:
+            **kwargs: Additional keyword arguments (not used in this implementation).
+
+        Returns:
+            str: The command to run on the login node.
+        """
+        if self.fields is None:
+            return "scontrol show node"
+        return f"scontrol -o show node | awk -v keep={','.join(self.fields)} {shlex.quote(_PROJECTION)}"
+
+    def _check(self, stdout: str, stderr: str, **kwargs) -> str:  # noqa : ARG002
+        """Check the error stream of the 'scontrol show node' command.
+
+        Args:
+            stdout (str): The standard output of the command.
+            stderr (str): The standard error of the command.
+            **kwargs: Additional keyword arguments (not used in this implementation).
+
+        Raises:
+            RuntimeError: If there is an error in the 'scontrol show node' command or if the server does not have Slurm installed.
+
+        Returns:
+            str: The collected information as a string.
+        """
+        # Check if there was an error
+        if "error" in stderr.lower():
+            raise RuntimeError(
+                "Error in scontrol show node command. Please check server has Slurm installed."
+            )
+
+        return stdout
 
-    def _collect(self, session: SSHSessionAuth, **kwargs) -> str:  # noqa : ARG002
+    def _collect(self, session: SSHSessionAuth, **kwargs) -> str:
         """Collect information using the 'scontrol show node' command.
 
         Args:
@@ -87,22 +158,58 @@ class IscontrolColllecter(ICollecter):
         Returns:
             str: The collected information as a string.
         """
-        # Run the scontrol show node command
+        # Run the scontrol show node command and read the output and error
         try:
-            stdin, stdout, stderr = session.session.exec_command(
-                "scontrol show node", timeout=self._timeout
-            )
+            output, error = self._exec(session, **kwargs)
         except TimeoutError:
             raise TimeoutError("Timeout occured! See if the server is available")
 
-        # Read the output and error
-        output = stdout.read().decode("utf-8")
-        error = stderr.read().decode("utf-8")
+        return self._check(output, error, **kwargs)
 
-        # Check if there was an error
-        if "error" in error.lower():
+
+class IscontrolJsonCollecter(IscontrolColllecter):
+    """Collects the structured 'scontrol show node --json' output, parsed by 'IscontrolJsonParser'.
+
+    The JSON output is not projected on fields, it is decoded node by node instead of munged as text.
+    """
+
+    def __init__(self, timeout: float = 10, compress: str | None = None) -> None:
+        """Initialize the IscontrolJson instance.
+
+        Args:
+            timeout (float, optional): Timeout time for the SSH session. Defaults to 10.
+            compress (str | None, optional): Remote compression of the output ('gzip', 'zstd' or 'auto'). Defaults to None.
+        """
+        super().__init__(timeout, compress=compress)
+
+    def _command(self, **kwargs) -> str:  # noqa : ARG002
+        """Build the 'scontrol show node --json' command.
+
+        Args:
+            **kwargs: Additional keyword arguments (not used in this implementation).
+
+        Returns:
+            str: The command to run on the login node.
+        """
+        return "scontrol show node --json"
+
+    def _check(self, stdout: str, stderr: str, **kwargs) -> str:  # noqa : ARG002
+        """Check that the output of the 'scontrol show node --json' command is JSON.
+
+        Args:
+            stdout (str): The standard output of the command, or its first chunk when streamed.
+            stderr (str): The standard error of the command.
+            **kwargs: Additional keyword arguments (not used in this implementation).
+
+        Raises:
+            RuntimeError: If the output is not JSON, e.g. with Slurm older than 21.08.
+
+        Returns:
+            str: The collected information as a string.
+        """
+        if not stdout.lstrip().startswith("{"):
             raise RuntimeError(
-                "Error in scontrol show node command. Please check server has Slurm installed."
+                f"scontrol show node --json did not output JSON, it needs Slurm 21.08 or later: {stderr.strip()}"
             )
 
-        return output
+        return stdout
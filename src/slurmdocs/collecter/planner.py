@@ -0,0 +1,303 @@
+"""The planner module that assigns every node of a sweep to a single partition.
+
+A node usually belongs to several partitions, and probing it once per partition submits redundant jobs that race to
+write the same cpu file. The 'SweepPlanner' class computes a minimal assignment with one probe per node, balanced
+across the partitions, preferring partitions with short queues and permissive access. It then schedules the probes
+from the state of the nodes: unavailable nodes (down, drained, not responding, ...) are skipped, busy nodes (fully
+allocated, completing, reserved, powering up) are deferred to a later wave, and idle nodes run first.
+
+Classes:
+    - 'SweepPlanner': Plans the probes of a sweep.
+
+Example:
+    ```python
+    planner = SweepPlanner()
+    planner.survey(ssh_session)
+    plan = planner.plan(jobs)
+    print(planner.describe(plan))
+    ready, deferred, skipped = planner.schedule(plan, {r["NodeName"]: r for r in stream_parser.records})
+    ```
+
+"""
+
+import math
+
+import paramiko  # type: ignore
+
+from ..session.ssh_session import SSHSessionAuth
+
+__all__ = ["SweepPlanner"]
+
+
+class SweepPlanner:
+    """Plans the probes of a sweep, assigning every node to a single partition and QOS.
+
+    The cost of a partition is its number of pending jobs times the queue weight, plus the number of probes already
+    assigned to it, plus a penalty if its access is restricted. Nodes are assigned greedily, the ones with the fewest
+    candidate partitions first, to the cheapest candidate. Partitions that are not up are only used as a last resort.
+    """
+
+    # Fields of 'scontrol show partition' that restrict the jobs of the partition
+    _restrictions = ("AllowQos", "AllowAccounts", "AllowGroups")
+
+    # Node states of 'scontrol show node', a base state and '+' separated flags
+    READY = "ready"
+    BUSY = "busy"
+    UNAVAILABLE = "unavailable"
+    _unavailable_states = {
+        "DOWN",
+        "DRAIN",
+        "DRAINED",
+        "DRAINING",
+        "FAIL",
+        "FAILING",
+        "FUTURE",
+        "MAINT",
+        "NOT_RESPONDING",
+        "POWERED_DOWN",
+        "POWERING_DOWN",
+        "POWER_DOWN",
+        "UNKNOWN",
+    }
+    _busy_states = {
+        "ALLOCATED",
+        "COMPLETING",
+        "PLANNED",
+        "POWERING_UP",
+        "REBOOT_ISSUED",
+        "REBOOT_REQUESTED",
+        "RESERVED",
+    }
+    # Suffixes of the base state: not responding, powering down, pending power down, powered down, powering up
+    _unavailable_suffixes = "*%!"
+    _busy_suffixes = "~#"
+
+    def __init__(
+        self, queue_weight: float = 1.0, restricted_penalty: float = 10.0
+    ) -> None:
+        """Initialize the SweepPlanner instance.
+
+        Args:
+            queue_weight (float, optional): The cost of a pending job in the queue of a partition, relative to a
+                probe. Defaults to 1.
+            restricted_penalty (float, optional): The cost added to a partition with restricted access.
+                Defaults to 10.
+        """
+        self.queue_weight = queue_weight
+        self.restricted_penalty = restricted_penalty
+        self.queue: dict[str, int] = {}
+        self.partitions: dict[str, dict] = {}
+
+    @staticmethod
+    def _run(session: SSHSessionAuth, command: str) -> str:
+        """Run a command and return its output, or an empty string if it failed."""
+        try:
+            _, stdout, _ = session.session.exec_command(command, timeout=10)
+            output = stdout.read().decode("utf-8")
+            if stdout.channel.recv_exit_status() != 0:
+                return ""
+        except (OSError, paramiko.SSHException):
+            return ""
+        return output
+
+    def survey(self, session: SSHSessionAuth) -> None:
+        """Survey the queue length and the access of the partitions.
+
+        The survey is best effort, partitions without information are assumed to be up, unrestricted and idle.
+
+        Args:
+            session (SSHSessionAuth): The SSH session to the Slurm cluster.
+        """
+        session.connect()
+
+        # Pending jobs, a job pending on many partitions counts for each of them
+        self.queue = {}
+        for line in self._run(session, "squeue -h -t PENDING -o %P").splitlines():
+            for part in line.strip().split(","):
+                if part:
+                    self.queue[part] = self.queue.get(part, 0) + 1
+
+        # One line of 'Key=Value' fields per partition
+        self.partitions = {}
+        for line in self._run(session, "scontrol show partition -o").splitlines():
+            fields = dict(field.split("=", 1) for field in line.split() if "=" in field)
+            if "PartitionName" in fields:
+                self.partitions[fields["PartitionName"]] = fields
+        return
+
+    def is_up(self, partition: str) -> bool:
+        """Check if a partition accepts jobs."""
+        return self.partitions.get(partition, {}).get("State", "UP") == "UP"
+
+    def is_restricted(self, partition: str, qos: str) -> bool:
+        """Check if the access to a partition is restricted for a QOS."""
+        info = self.partitions.get(partition, {})
+        for field in self._restrictions:
+            allowed = info.get(field, "ALL")
+            if allowed == "ALL" or (field == "AllowQos" and qos in allowed.split(",")):
+                continue
+            return True
+        return False
+
+    def cost(self, partition: str, qos: str, load: int = 0) -> float:
+        """Compute the cost of the next probe on a partition.
+
+        Args:
+            partition (str): The partition.
+            qos (str): The quality of service.
+            load (int, optional): The number of probes already assigned to the partition. Defaults to 0.
+
+        Returns:
+            float: The cost, infinite if the partition is not up.
+        """
+        if not self.is_up(partition):
+            return math.inf
+        cost = self.queue_weight * self.queue.get(partition, 0) + load
+        if self.is_restricted(partition, qos):
+            cost += self.restricted_penalty
+        return cost
+
+    def plan(self, jobs: list[dict]) -> list[dict]:
+        """Assign every node to a single partition and QOS.
+
+        Args:
+            jobs (list[dict]): Keyword arguments of every (node, partition) collection.
+
+        Returns:
+            list[dict]: Keyword arguments of a single collection per node.
+        """
+        candidates: dict[str, list[dict]] = {}
+        for job in jobs:
+            candidates.setdefault(job["node"], []).append(job)
+
+        # The most constrained nodes first, keeping the input order otherwise
+        load: dict[str, int] = {}
+        assigned = {}
+        for node in sorted(candidates, key=lambda node: len(candidates[node])):
+            job = min(
+                candidates[node],
+                key=lambda job: self.cost(
+                    job["partition"], job["qos"], load.get(job["partition"], 0)
+                ),
+            )
+            load[job["partition"]] = load.get(job["partition"], 0) + 1
+            assigned[node] = job
+
+        return [assigned[node] for node in candidates]
+
+    @classmethod
+    def node_state(cls: type["SweepPlanner"], record: dict) -> str:
+        """Classify a node from the 'State' field of its raw 'scontrol show node' record.
+
+        Args:
+            record (dict): The raw 'scontrol show node' record of the node.
+
+        Returns:
+            str: 'ready' if the node can run a probe now, 'busy' if it may later, 'unavailable' otherwise.
+        """
+        state = str(record.get("State") or "UNKNOWN").upper()
+        flags = state.split("+")
+        base = flags[0].rstrip(cls._unavailable_suffixes + cls._busy_suffixes)
+
+        if any(flag in cls._unavailable_states for flag in [base, *flags[1:]]):
+            return cls.UNAVAILABLE
+        if any(suffix in flags[0] for suffix in cls._unavailable_suffixes):
+            return cls.UNAVAILABLE
+        if any(flag in cls._busy_states for flag in [base, *flags[1:]]):
+            return cls.BUSY
+        if any(suffix in flags[0] for suffix in cls._busy_suffixes):
+            return cls.BUSY
+        return cls.READY
+
+    def schedule(
+        self, plan: list[dict], records: dict[str, dict]
+    ) -> tuple[list[dict], list[dict], list[dict]]:
+        """Split a plan by the state of the nodes.
+
+        Nodes without a record are assumed to be ready. The ready collections are ordered with the idle nodes first,
+        then the partially allocated ones.
+
+        Args:
+            plan (list[dict]): The planned collections.
+            records (dict[str, dict]): The raw 'scontrol show node' records keyed by node name.
+
+        Returns:
+            tuple[list[dict], list[dict], list[dict]]: The ready, deferred and skipped collections.
+        """
+        ready, deferred, skipped = [], [], []
+        for job in plan:
+            record = records.get(job["node"], {"State": "IDLE"})
+            state = self.node_state(record)
+            if state == self.READY:
+                ready.append(job)
+            elif state == self.BUSY:
+                deferred.append(job)
+            else:
+                skipped.append(job)
+
+        # Idle nodes answer right away, mixed ones may wait for free cores
+        ready.sort(
+            key=lambda job: not str(
+                records.get(job["node"], {}).get("State") or "IDLE"
+            ).startswith("IDLE")
+        )
+        return ready, deferred, skipped
+
+    @staticmethod
+    def _probes(plan: list[dict]) -> dict[tuple[str, str], int]:
+        """Count the probes of a plan per (partition, qos)."""
+        probes: dict[tuple[str, str], int] = {}
+        for job in plan:
+            key = (job["partition"], job["qos"])
+            probes[key] = probes.get(key, 0) + 1
+        return probes
+
+    def estimate(self, plan: list[dict]) -> dict[tuple[str, str], float]:
+        """Estimate the cost of every partition of a plan.
+
+        The cost of a partition is the weighted length of its queue plus its number of probes, plus the penalty if
+        its access is restricted. Partitions run concurrently, so the cost of the plan is the largest one.
+
+        Args:
+            plan (list[dict]): The planned collections.
+
+        Returns:
+            dict[tuple[str, str], float]: The cost keyed by (partition, qos).
+        """
+        return {
+            (partition, qos): self.cost(partition, qos, load=count)
+            for (partition, qos), count in self._probes(plan).items()
+        }
+
+    def describe(self, plan: list[dict], jobs: list[dict] | None = None) -> str:
+        """Describe a plan and its estimated cost.
+
+        Args:
+            plan (list[dict]): The planned collections.
+            jobs (list[dict] | None, optional): The unplanned collections, to report the saving. Defaults to None.
+
+        Returns:
+            str: A table of the probes, pending jobs and cost of every partition.
+        """
+        estimate = self.estimate(plan)
+        probes = self._probes(plan)
+
+        lines = [
+            f"{'PARTITION':<20} {'QOS':<20} {'PROBES':>8} {'PENDING':>8} {'COST':>8}"
+        ]
+        for (partition, qos), cost in sorted(estimate.items()):
+            lines.append(
+                f"{partition:<20} {qos:<20} {probes[(partition, qos)]:>8} "
+                f"{self.queue.get(partition, 0):>8} {cost:>8.1f}"
+            )
+
+        summary = f"{len(plan)} probes"
+        if jobs is not None:
+            summary += f" instead of {len(jobs)}"
+        summary += f", estimated cost {max(estimate.values(), default=0):.1f}."
+        lines.append(summary)
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        """Return a string representation of the SweepPlanner instance."""
+        return f"{self.__class__.__name__}(queue_weight={self.queue_weight}, restricted_penalty={self.restricted_penalty})"
@@ -0,0 +1,277 @@
+"""The telemetry module that reports the progress, the latencies and the failures of a sweep.
+
+Tuning the number of threads or the partitions of a sweep needs numbers. The 'SweepTelemetry' class counts the
+finished and failed nodes, prints a live progress line with the throughput and the estimated time left, splits the
+latency of every node into phases and writes a JSON report of the run. The phases of a probe are:
+    - 'channel': Opening the SSH channel and sending the command.
+    - 'queue': From the submission to the first output, the Slurm queue wait and the job step launch.
+    - 'runtime': From the first output to the end of the command.
+
+Classes:
+    - 'SweepTelemetry': Collects the telemetry of a sweep.
+
+Example:
+    ```python
+    telemetry = SweepTelemetry(total=len(jobs), echo=print)
+    telemetry.start()
+    IlscpuCollecter(telemetry=telemetry)(ssh_session, node="node-1", partition="debug", qos="debug")
+    telemetry.finish(["node-1"])
+    telemetry.stop()
+    print(telemetry.summary())
+    telemetry.write(db.db_path / "report.json")
+    ```
+
+"""
+
+import datetime
+import json
+import math
+import os
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+__all__ = ["SweepTelemetry"]
+
+
+def _percentile(values: list[float], q: float) -> float:
+    """Return the nearest-rank percentile of values, 0 if there are none."""
+    if len(values) == 0:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+class SweepTelemetry:
+    """Collects the progress, the per-node latencies and the failures of a sweep.
+
+    Args:
+        total (int, optional): The number of nodes of the sweep. Defaults to 0.
+        echo (Callable[[str], None] | None, optional): Prints the progress line. Defaults to no progress line.
+        interval (float, optional): The delay in seconds between two progress lines. Defaults to 1.
+    """
+
+    PHASES = ("channel", "queue", "runtime")
+
+    def __init__(
+        self,
+        total: int = 0,
+        echo: Callable[[str], None] | None = None,
+        interval: float = 1.0,
+    ) -> None:
+        """Initialize the SweepTelemetry instance."""
+        self.total = total
+        self.wave = 0
+        self.latencies: dict[str, dict[str, float]] = {}
+        self.done: set[str] = set()
+        self.failures: dict[str, str] = {}
+        self.skipped: dict[str, str] = {}
+        self._echo = echo
+        self._interval = interval
+        self._started_at = time.monotonic()
+        self._started_on = time.time()
+        self._stopped_at: float | None = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._ticker: threading.Thread | None = None
+
+    def time(self, nodes: list[str], **phases: float) -> None:
+        """Add the duration of phases to the latency of nodes.
+
+        Args:
+            nodes (list[str]): The nodes, several for a batched probe.
+            phases (dict): The duration in seconds of the phases, keyed by phase name.
+        """
+        with self._lock:
+            for node in nodes:
+                latency = self.latencies.setdefault(node, {})
+                for phase, seconds in phases.items():
+                    latency[phase] = latency.get(phase, 0.0) + seconds
+        return
+
+    def finish(
+        self, nodes: list[str], latency: float | None = None, error: str | None = None
+    ) -> None:
+        """Record the end of the probe of nodes.
+
+        Args:
+            nodes (list[str]): The nodes.
+            latency (float | None, optional): The wall time of the probe in seconds. Defaults to the sum of its phases.
+            error (str | None, optional): The error of a failed probe. Defaults to None.
+        """
+        with self._lock:
+            for node in nodes:
+                phases = self.latencies.setdefault(node, {})
+                phases["total"] = (
+                    latency
+                    if latency is not None
+                    else sum(phases.get(phase, 0.0) for phase in self.PHASES)
+                )
+                if error is None:
+                    self.done.add(node)
+                    self.failures.pop(node, None)
+                elif node not in self.done:
+                    self.failures[node] = error
+        return
+
+    def skip(self, nodes: list[str], reason: str) -> None:
+        """Record nodes that were not probed.
+
+        Args:
+            nodes (list[str]): The nodes.
+            reason (str): Why they were not probed.
+        """
+        with self._lock:
+            for node in nodes:
+                self.skipped[node] = reason
+        return
+
+    @property
+    def elapsed(self) -> float:
+        """The duration of the sweep in seconds."""
+        end = self._stopped_at if self._stopped_at is not None else time.monotonic()
+        return end - self._started_at
+
+    @property
+    def throughput(self) -> float:
+        """The number of finished nodes per second."""
+        finished = len(self.done) + len(self.failures)
+        return finished / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def remaining(self) -> int:
+        """The number of nodes still to probe."""
+        return max(
+            0, self.total - len(self.done) - len(self.failures) - len(self.skipped)
+        )
+
+    @property
+    def eta(self) -> float | None:
+        """The estimated time left in seconds, None before the first node finishes."""
+        if self.throughput == 0:
+            return None
+        return self.remaining / self.throughput
+
+    def progress(self) -> str:
+        """Return the progress line of the sweep."""
+        eta = (
+            "--:--:--"
+            if self.eta is None
+            else str(datetime.timedelta(seconds=round(self.eta)))
+        )
+        line = f"{len(self.done) + len(self.failures)}/{self.total} nodes"
+        if self.wave > 0:
+            line = f"Wave {self.wave}: {line}"
+        return (
+            f"{line}, {len(self.failures)} failed, {len(self.skipped)} skipped, "
+            f"{self.throughput:.1f} nodes/s, ETA {eta}"
+        )
+
+    def _tick(self) -> None:
+        """Print the progress line every interval until stopped."""
+        while not self._stop.wait(self._interval):
+            self._echo(self.progress())
+
+    def start(self) -> None:
+        """Start the clock, and printing the progress line if an echo is set."""
+        self._started_at = time.monotonic()
+        self._started_on = time.time()
+        if self._echo is None or self._ticker is not None:
+            return
+        self._ticker = threading.Thread(target=self._tick, daemon=True)
+        self._ticker.start()
+        return
+
+    def stop(self) -> None:
+        """Stop the clock and print the last progress line."""
+        if self._stopped_at is not None:
+            return
+        self._stopped_at = time.monotonic()
+        self._stop.set()
+        if self._ticker is not None:
+            self._ticker.join()
+        if self._echo is not None:
+            self._echo(self.progress())
+        return
+
+    def _errors(self) -> dict[str, list[str]]:
+        """Group the failed nodes by the type of their error."""
+        errors: dict[str, list[str]] = {}
+        for node, error in sorted(self.failures.items()):
+            errors.setdefault(error.split(":", 1)[0], []).append(node)
+        return errors
+
+    def summary(self) -> str:
+        """Return the failure summary of the sweep, one line per error type and skip reason."""
+        lines = [
+            f"{len(self.done)} done, {len(self.failures)} failed and {len(self.skipped)} skipped "
+            f"of {self.total} nodes in {datetime.timedelta(seconds=round(self.elapsed))}."
+        ]
+        for error, nodes in sorted(self._errors().items(), key=lambda e: -len(e[1])):
+            sample = self.failures[nodes[0]].splitlines()[0]
+            lines.append(
+                f"{len(nodes):>6} failed  {sample} ({', '.join(nodes[:3])}{', ...' if len(nodes) > 3 else ''})"
+            )
+        reasons: dict[str, int] = {}
+        for reason in self.skipped.values():
+            reasons[reason] = reasons.get(reason, 0) + 1
+        for reason, count in sorted(reasons.items(), key=lambda r: -r[1]):
+            lines.append(f"{count:>6} skipped {reason}")
+        return "\n".join(lines)
+
+    def report(self) -> dict:
+        """Build the report of the sweep.
+
+        Returns:
+            dict: The counts, the throughput, the latency percentiles per phase, the per-node latencies, the failures
+                and the skipped nodes.
+        """
+        with self._lock:
+            phases = {}
+            for phase in (*self.PHASES, "total"):
+                values = [
+                    latency[phase]
+                    for latency in self.latencies.values()
+                    if phase in latency
+                ]
+                phases[phase] = {
+                    "p50": _percentile(values, 50),
+                    "p95": _percentile(values, 95),
+                    "max": max(values, default=0.0),
+                }
+            return {
+                "started": self._started_on,
+                "elapsed": self.elapsed,
+                "total": self.total,
+                "done": len(self.done),
+                "failed": len(self.failures),
+                "skipped": len(self.skipped),
+                "throughput": self.throughput,
+                "latency": phases,
+                "nodes": {
+                    node: dict(latency) for node, latency in self.latencies.items()
+                },
+                "failures": dict(self.failures),
+                "errors": self._errors(),
+                "skips": dict(self.skipped),
+            }
+
+    def write(self, path: str | Path) -> None:
+        """Write the report of the sweep as JSON.
+
+        Args:
+            path (str | Path): The path of the report.
+        """
+        path = Path(path)
+
+        # Write atomically so an interrupted sweep never leaves a truncated file
+        tmp_path = path.with_name(f".{path.name}.part")
+        with open(tmp_path, "w") as f:
+            json.dump(self.report(), f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+        return
+
+    def __repr__(self) -> str:
+        """Return a string representation of the SweepTelemetry instance."""
+        return f"{self.__class__.__name__}(total={self.total}, done={len(self.done)}, failed={len(self.failures)}, skipped={len(self.skipped)})"
@@ -0,0 +1,406 @@
+"""The throttle module that adapts the submission rate of the probes to the health of the cluster.
+
+A fixed concurrency either wastes time or floods slurmctld, which then times out the probes. The 'Throttle' class
+combines three controls, shared by all the threads or coroutines of a sweep:
+    - An AIMD controller that widens the number of in-flight probes while their latencies stay flat, and halves it
+      on timeouts or 'srun' errors, like TCP congestion control.
+    - A circuit breaker per partition that stops submitting to a partition after repeated failures, and lets a
+      single trial probe through once a cooldown has passed.
+    - A token bucket that caps the number of submissions per second.
+
+Classes:
+    - 'AIMDController': Additive increase, multiplicative decrease of a concurrency limit.
+    - 'CircuitBreaker': Stops the submissions to a failing partition.
+    - 'TokenBucket': Caps the rate of submissions.
+    - 'Throttle': Combines the controls.
+    - 'CircuitOpenError': Raised when submitting to a partition whose circuit is open.
+
+Example:
+    ```python
+    throttle = Throttle(AIMDController(initial=4, maximum=64), bucket=TokenBucket(rate=10))
+
+    with throttle.slot("debug"):
+        IlscpuCollecter()(ssh_session, node="node-1", partition="debug", qos="debug")
+    ```
+
+"""
+
+import asyncio
+import contextlib
+import threading
+import time
+from collections.abc import Iterator
+
+__all__ = [
+    "AIMDController",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "Throttle",
+    "TokenBucket",
+]
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when submitting to a partition whose circuit is open."""
+
+
+class AIMDController:
+    """Additive increase, multiplicative decrease of a concurrency limit.
+
+    Every successful call whose latency stays within the tolerance of the baseline latency widens the limit by
+    'increase / limit', so about 'increase' per round of calls. A failure or a latency spike multiplies the limit by
+    'decrease', at most once per baseline latency so that a burst of failures of the same round counts once.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        minimum: int = 1,
+        maximum: int = 64,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        tolerance: float = 2.0,
+    ) -> None:
+        """Initialize the AIMDController instance.
+
+        Args:
+            initial (int, optional): The initial limit. Defaults to 4.
+            minimum (int, optional): The smallest limit. Defaults to 1.
+            maximum (int, optional): The largest limit. Defaults to 64.
+            increase (float, optional): The additive increase per round of calls. Defaults to 1.
+            decrease (float, optional): The multiplicative decrease on congestion. Defaults to 0.5.
+            tolerance (float, optional): The latency, relative to the baseline, above which the cluster is
+                considered congested. Defaults to 2.
+
+        Raises:
+            ValueError: If the bounds are not ordered or the decrease is not in (0, 1).
+        """
+        if not 1 <= minimum <= initial <= maximum:
+            raise ValueError(
+                f"Expected 1 <= minimum <= initial <= maximum. Got {minimum}, {initial} and {maximum} instead."
+            )
+        if not 0 < decrease < 1:
+            raise ValueError(f"decrease must be in (0, 1). Got {decrease} instead.")
+
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.tolerance = tolerance
+        self._limit = float(initial)
+        self._baseline: float | None = None
+        self._decreased_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        """The current concurrency limit."""
+        return int(self._limit)
+
+    def record(self, latency: float, ok: bool) -> None:
+        """Record the outcome of a call.
+
+        Args:
+            latency (float): The latency of the call in seconds.
+            ok (bool): Whether the call succeeded.
+        """
+        with self._lock:
+            congested = not ok
+            if ok:
+                # Follow the fastest latencies, slowly forgetting an outdated baseline
+                if self._baseline is None or latency < self._baseline:
+                    self._baseline = latency
+                else:
+                    self._baseline += 0.01 * (latency - self._baseline)
+                congested = latency > self.tolerance * self._baseline
+
+            if not congested:
+                self._limit = min(
+                    self.maximum, self._limit + self.increase / self._limit
+                )
+                return
+
+            now = time.monotonic()
+            if now - self._decreased_at < (self._baseline or 0):
+                return
+            self._decreased_at = now
+            self._limit = max(self.minimum, self._limit * self.decrease)
+        return
+
+    def __repr__(self) -> str:
+        """Return a string representation of the AIMDController instance."""
+        return f"{self.__class__.__name__}(limit={self.limit}, minimum={self.minimum}, maximum={self.maximum})"
+
+
+class CircuitBreaker:
+    """Stops the submissions to a failing partition.
+
+    The circuit opens after 'threshold' consecutive failures. Once 'cooldown' seconds have passed, a single trial
+    call goes through: its success closes the circuit, its failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, threshold: int = 5, cooldown: float = 60.0) -> None:
+        """Initialize the CircuitBreaker instance.
+
+        Args:
+            threshold (int, optional): The number of consecutive failures opening the circuit. Defaults to 5.
+            cooldown (float, optional): The delay in seconds before a trial call. Defaults to 60.
+        """
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Check if a call may go through, letting the trial call through once the cooldown has passed."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if (
+                self.state == self.OPEN
+                and time.monotonic() - self._opened_at >= self.cooldown
+            ):
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def cancel(self) -> None:
+        """Give back the trial call let through by 'allow' when it did not go, so that the next call is the trial."""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+        return
+
+    def record(self, ok: bool) -> None:
+        """Record the outcome of a call.
+
+        Args:
+            ok (bool): Whether the call succeeded.
+        """
+        with self._lock:
+            if ok:
+                self._failures = 0
+                self.state = self.CLOSED
+                return
+
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+        return
+
+    def __repr__(self) -> str:
+        """Return a string representation of the CircuitBreaker instance."""
+        return (
+            f"{self.__class__.__name__}(state={self.state}, failures={self._failures})"
+        )
+
+
+class TokenBucket:
+    """Caps the rate of submissions.
+
+    The bucket holds up to 'burst' tokens and refills at 'rate' tokens per second. Every submission takes a token.
+    """
+
+    def __init__(self, rate: float, burst: int | None = None) -> None:
+        """Initialize the TokenBucket instance.
+
+        Args:
+            rate (float): The number of submissions per second.
+            burst (int | None, optional): The size of the bucket. Defaults to one second of submissions.
+
+        Raises:
+            ValueError: If the rate is not positive.
+        """
+        if rate <= 0:
+            raise ValueError(f"rate must be positive. Got {rate} instead.")
+
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self) -> float:
+        """Take a token if one is available.
+
+        Returns:
+            float: 0 if a token was taken, otherwise the delay in seconds until the next token.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated_at) * self.rate
+            )
+            self._updated_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def __repr__(self) -> str:
+        """Return a string representation of the TokenBucket instance."""
+        return f"{self.__class__.__name__}(rate={self.rate}, burst={self.burst})"
+
+
+class Throttle:
+    """Combines an AIMD concurrency limit, per-partition circuit breakers and a token bucket.
+
+    Args:
+        controller (AIMDController): The controller of the number of in-flight calls.
+        bucket (TokenBucket | None, optional): The cap on submissions per second. Defaults to no cap.
+        breaker_threshold (int, optional): The consecutive failures opening the circuit of a partition.
+            Defaults to 5.
+        breaker_cooldown (float, optional): The delay in seconds before a trial call to an open partition.
+            Defaults to 60.
+        budget (threading.Semaphore | None, optional): A concurrency budget shared with the throttles of other
+            sweeps, every call also holds one of its slots. Defaults to no shared budget.
+    """
+
+    # Polling interval of the asynchronous acquire
+    _poll_interval = 0.05
+
+    def __init__(
+        self,
+        controller: AIMDController,
+        bucket: TokenBucket | None = None,
+        breaker_threshold: int = 5,
+        breaker_cooldown: float = 60.0,
+        budget: threading.Semaphore | None = None,
+    ) -> None:
+        """Initialize the Throttle instance."""
+        self.controller = controller
+        self.bucket = bucket
+        self.budget = budget
+        self.breakers: dict[str, CircuitBreaker] = {}
+        self._breaker_threshold = breaker_threshold
+        self._breaker_cooldown = breaker_cooldown
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+    def breaker(self, key: str) -> CircuitBreaker:
+        """Return the circuit breaker of a partition."""
+        with self._cond:
+            if key not in self.breakers:
+                self.breakers[key] = CircuitBreaker(
+                    self._breaker_threshold, self._breaker_cooldown
+                )
+            return self.breakers[key]
+
+    def try_acquire(self, key: str) -> float:
+        """Try to acquire a slot for a call.
+
+        Args:
+            key (str): The partition of the call.
+
+        Raises:
+            CircuitOpenError: If the circuit of the partition is open.
+
+        Returns:
+            float: 0 if the slot was acquired, otherwise a delay in seconds before trying again.
+        """
+        with self._cond:
+            if self._in_flight >= self.controller.limit:
+                return self._poll_interval
+            # The circuit is checked before any budget slot or token is taken, its trial call is given back if the
+            # call cannot go
+            breaker = self.breaker(key)
+            if not breaker.allow():
+                raise CircuitOpenError(
+                    f"The circuit of partition {key} is open after repeated failures."
+                )
+            if self.budget is not None and not self.budget.acquire(blocking=False):
+                breaker.cancel()
+                return self._poll_interval
+            delay = self.bucket.take() if self.bucket is not None else 0.0
+            if delay > 0:
+                breaker.cancel()
+                self._release_budget()
+                return delay
+            self._in_flight += 1
+            return 0.0
+
+    def acquire(self, key: str) -> None:
+        """Wait for a slot for a call.
+
+        Args:
+            key (str): The partition of the call.
+
+        Raises:
+            CircuitOpenError: If the circuit of the partition is open.
+        """
+        while True:
+            delay = self.try_acquire(key)
+            if delay == 0:
+                return
+            with self._cond:
+                self._cond.wait(delay)
+
+    async def aacquire(self, key: str) -> None:
+        """Asynchronously wait for a slot for a call.
+
+        Args:
+            key (str): The partition of the call.
+
+        Raises:
+            CircuitOpenError: If the circuit of the partition is open.
+        """
+        while True:
+            delay = self.try_acquire(key)
+            if delay == 0:
+                return
+            await asyncio.sleep(delay)
+
+    def _release_budget(self) -> None:
+        """Give a slot back to the shared budget, if any."""
+        if self.budget is not None:
+            self.budget.release()
+        return
+
+    def release(self, key: str, latency: float, ok: bool) -> None:
+        """Release the slot of a call and record its outcome.
+
+        Args:
+            key (str): The partition of the call.
+            latency (float): The latency of the call in seconds.
+            ok (bool): Whether the call succeeded.
+        """
+        self.controller.record(latency, ok)
+        self.breaker(key).record(ok)
+        self._release_budget()
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+        return
+
+    @contextlib.contextmanager
+    def slot(self, key: str) -> Iterator[None]:
+        """Hold a slot for a call, recording its latency and whether it raised.
+
+        Args:
+            key (str): The partition of the call.
+
+        Raises:
+            CircuitOpenError: If the circuit of the partition is open.
+
+        Yields:
+            None: The slot is held until the block exits.
+        """
+        self.acquire(key)
+        started = time.monotonic()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.release(key, time.monotonic() - started, ok)
+
+    def __repr__(self) -> str:
+        """Return a string representation of the Throttle instance."""
+        return f"{self.__class__.__name__}(controller={self.controller}, bucket={self.bucket}, in_flight={self._in_flight})"
@@ -0,0 +1,166 @@
+"""The tracker module that keeps track of the Slurm jobs submitted by a sweep.
+
+Probes that time out leave their 'srun' job queued or running on the cluster, where it occupies nodes and queue
+slots until it is cancelled. The 'JobTracker' class gives every job of a run the same unique job name and records
+the job ids reported by 'srun' and 'salloc'. Timed-out jobs are cancelled in bulk with a single 'scancel' of their
+ids, and all the jobs left by the run are cancelled with a single 'scancel' of the run name at the end of the run,
+on Ctrl-C, on SIGTERM or SIGHUP and at process exit.
+
+Classes:
+    - 'JobTracker': Tracks the Slurm jobs of a run.
+
+Example:
+    ```python
+    tracker = JobTracker()
+    tracker.guard(ssh_session)
+    try:
+        IlscpuCollecter(tracker=tracker)(ssh_session, node="node-1", partition="debug", qos="debug")
+    finally:
+        tracker.cancel(ssh_session)
+    ```
+
+"""
+
+import atexit
+import re
+import signal
+import threading
+import uuid
+from types import FrameType
+
+from ..session.ssh_session import SSHSessionAuth
+
+__all__ = ["JobTracker"]
+
+
+class JobTracker:
+    """Tracks the Slurm jobs of a run and cancels them in bulk.
+
+    Attributes:
+        name (str): The job name shared by every job of the run.
+        jobids (set[str]): The job ids reported by the jobs of the run.
+        cancelled (set[str]): The job ids cancelled so far.
+    """
+
+    # Job ids reported by 'srun' ("job 1234 queued", "job 1234 has been allocated") and 'salloc'
+    _jobid_pattern = re.compile(r"\bjob(?: allocation)? (\d+)")
+
+    def __init__(self, batch_size: int = 32) -> None:
+        """Initialize the JobTracker instance.
+
+        Args:
+            batch_size (int, optional): The number of abandoned jobs cancelled together. Defaults to 32.
+        """
+        self.name = f"slurmdocs-{uuid.uuid4().hex[:12]}"
+        self.jobids: set[str] = set()
+        self.cancelled: set[str] = set()
+        self._batch_size = batch_size
+        self._abandoned: list[str] = []
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def record(self, output: str) -> list[str]:
+        """Record the job ids reported in the output of 'srun' or 'salloc'.
+
+        Args:
+            output (str): The output, usually the error stream.
+
+        Returns:
+            list[str]: The job ids found in the output.
+        """
+        jobids = self._jobid_pattern.findall(output)
+        self.track(jobids)
+        return jobids
+
+    def track(self, jobids: list[str]) -> None:
+        """Record job ids of the run.
+
+        Args:
+            jobids (list[str]): The job ids.
+        """
+        with self._lock:
+            self.jobids.update(jobids)
+        return
+
+    def abandon(self, session: SSHSessionAuth, jobids: list[str]) -> None:
+        """Schedule the cancellation of jobs whose probe gave up, in bulk.
+
+        The jobs are cancelled once a batch is full, or by the next 'flush' or 'cancel'.
+
+        Args:
+            session (SSHSessionAuth): The SSH session to the Slurm cluster.
+            jobids (list[str]): The job ids to cancel.
+        """
+        with self._lock:
+            self.jobids.update(jobids)
+            self._abandoned.extend(jobids)
+            full = len(self._abandoned) >= self._batch_size
+        if full:
+            self.flush(session)
+        return
+
+    def flush(self, session: SSHSessionAuth) -> None:
+        """Cancel the abandoned jobs with a single 'scancel'.
+
+        Args:
+            session (SSHSessionAuth): The SSH session to the Slurm cluster.
+        """
+        with self._lock:
+            jobids, self._abandoned = self._abandoned, []
+            self.cancelled.update(jobids)
+        if len(jobids) == 0:
+            return
+
+        _, stdout, _ = session.session.exec_command(f"scancel {' '.join(jobids)}")
+        stdout.channel.recv_exit_status()
+        return
+
+    def cancel(self, session: SSHSessionAuth) -> None:
+        """Cancel every job left by the run, abandoned or not, with a single 'scancel' of the run name.
+
+        Args:
+            session (SSHSessionAuth): The SSH session to the Slurm cluster.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self.cancelled.update(self._abandoned)
+            self._abandoned = []
+
+        session.connect()
+        _, stdout, _ = session.session.exec_command(
+            f"scancel -n {self.name} -u {session.remote_username}"
+        )
+        stdout.channel.recv_exit_status()
+        return
+
+    def _on_signal(self, signum: int, frame: FrameType | None) -> None:  # noqa : ARG002
+        """Turn a termination signal into a SystemExit so the cleanups run."""
+        raise SystemExit(128 + signum)
+
+    def guard(self, session: SSHSessionAuth) -> None:
+        """Cancel the jobs of the run at process exit, including on SIGTERM and SIGHUP.
+
+        Ctrl-C raises a KeyboardInterrupt, which already unwinds through the cleanups.
+
+        Args:
+            session (SSHSessionAuth): The SSH session to the Slurm cluster.
+        """
+        atexit.register(self._at_exit, session)
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, self._on_signal)
+            signal.signal(signal.SIGHUP, self._on_signal)
+        return
+
+    def _at_exit(self, session: SSHSessionAuth) -> None:
+        """Cancel the jobs of the run at process exit, unless already done."""
+        try:
+            self.cancel(session)
+        except Exception:
+            # The interpreter is shutting down, there is no one left to report to
+            return
+
+    def __repr__(self) -> str:
+        """Return a string representation of the JobTracker instance."""
+        return f"{self.__class__.__name__}(name={self.name}, jobs={len(self.jobids)}, cancelled={len(self.cancelled)})"
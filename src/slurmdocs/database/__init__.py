@@ -1,2 +1,10 @@
 """Top Level Database Module Import."""
+from .fingerprint import (
+    FINGERPRINT_FIELDS,
+    diff_fingerprints,
+    fingerprint_records,
+    node_fingerprint,
+)
+from .journal import SweepJournal
 from .slurm_cluster_database import SlurmClusterDatabase
+from .snapshot_log import SnapshotLog
@@ -0,0 +1,85 @@
+"""Node Fingerprint Module.
+
+This module computes the fingerprint of a node from its raw 'scontrol show node' record. The fingerprint only covers
+the fields that change when the hardware of a node changes or when the node is reinstalled, so a sweep can skip the
+nodes whose fingerprint matches the one stored in the database.
+
+Functions:
+    - 'node_fingerprint': Computes the fingerprint of a node record.
+    - 'fingerprint_records': Computes the fingerprints of many node records, keyed by node name.
+    - 'diff_fingerprints': Compares current fingerprints with stored ones.
+
+Example:
+    ```python
+    current = fingerprint_records(stream_parser.records)
+    changed, removed = diff_fingerprints(current, db.fingerprints())
+    ```
+"""
+
+import hashlib
+import json
+
+__all__ = [
+    "FINGERPRINT_FIELDS",
+    "diff_fingerprints",
+    "fingerprint_records",
+    "node_fingerprint",
+]
+
+# Fields of the raw 'scontrol show node' record covered by the fingerprint
+FINGERPRINT_FIELDS = (
+    "CPUTot",
+    "CoresPerSocket",
+    "Sockets",
+    "RealMemory",
+    "BootTime",
+    "Gres",
+)
+
+
+def node_fingerprint(record: dict) -> str:
+    """Compute the fingerprint of a node record.
+
+    Args:
+        record (dict): The raw 'scontrol show node' record of the node.
+
+    Returns:
+        str: The hexadecimal fingerprint.
+    """
+    fields = {field: record.get(field) for field in FINGERPRINT_FIELDS}
+    return hashlib.sha1(
+        json.dumps(fields, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def fingerprint_records(records: list[dict]) -> dict[str, str]:
+    """Compute the fingerprints of many node records.
+
+    Args:
+        records (list[dict]): The raw 'scontrol show node' records.
+
+    Returns:
+        dict[str, str]: The fingerprints keyed by node name.
+    """
+    return {
+        record["NodeName"]: node_fingerprint(record)
+        for record in records
+        if "NodeName" in record
+    }
+
+
+def diff_fingerprints(
+    current: dict[str, str], stored: dict[str, str]
+) -> tuple[list[str], list[str]]:
+    """Compare the current fingerprints of the nodes with the stored ones.
+
+    Args:
+        current (dict[str, str]): The current fingerprints keyed by node name.
+        stored (dict[str, str]): The stored fingerprints keyed by node name.
+
+    Returns:
+        tuple[list[str], list[str]]: The new or changed nodes, and the nodes no longer in the cluster.
+    """
+    changed = [node for node, fp in current.items() if stored.get(node) != fp]
+    removed = [node for node in stored if node not in current]
+    return changed, removed
@@ -0,0 +1,138 @@
+"""Sweep Journal Module.
+
+This module provides an append-only journal of the per-node status of a sweep, stored inside the database directory.
+Every status change is appended as one JSON line and flushed right away, so an interrupted sweep (laptop sleep, VPN
+drop, Ctrl-C) can be resumed by only scheduling the nodes that are not done yet.
+
+Classes:
+    - 'SweepJournal': The append-only journal of a sweep.
+
+Example:
+    ```python
+    journal = SweepJournal(db.db_path / "journal.jsonl")
+    journal.reset(["node-1", "node-2"])
+    journal.record(["node-1"], SweepJournal.DONE)
+
+    # After an interruption
+    journal.outstanding()  # ['node-2']
+    ```
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+
+__all__ = ["SweepJournal"]
+
+
+class SweepJournal:
+    """The append-only journal of the per-node status of a sweep.
+
+    A node is 'pending' until its probe starts, 'in-flight' while it runs, then 'done' or 'failed'. A node that is
+    done stays done, so that a later failed probe of the same node on another partition does not undo it.
+
+    Args:
+        path (str | Path): The path of the journal file.
+    """
+
+    PENDING = "pending"
+    IN_FLIGHT = "in-flight"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __init__(self, path: str | Path) -> None:
+        """Initialize the SweepJournal instance."""
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._file = None
+
+    def exists(self) -> bool:
+        """Check if the journal file exists."""
+        return self.path.exists()
+
+    def _append(self, entries: list[dict]) -> None:
+        """Append entries to the journal and flush them to disk."""
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a")
+            self._file.write("".join(json.dumps(entry) + "\n" for entry in entries))
+            self._file.flush()
+
+    def reset(self, nodes: list[str]) -> None:
+        """Start a new journal with every node pending.
+
+        Args:
+            nodes (list[str]): The nodes of the sweep.
+        """
+        self.close()
+        self.path.unlink(missing_ok=True)
+        self.record(nodes, self.PENDING)
+        return
+
+    def record(self, nodes: list[str], status: str, error: str | None = None) -> None:
+        """Record the status of nodes.
+
+        Args:
+            nodes (list[str]): The nodes.
+            status (str): The status, one of 'pending', 'in-flight', 'done' or 'failed'.
+            error (str | None, optional): The error of a failed probe. Defaults to None.
+
+        Raises:
+            ValueError: If the status is unknown.
+        """
+        if status not in (self.PENDING, self.IN_FLIGHT, self.DONE, self.FAILED):
+            raise ValueError(f"Unknown status {status}.")
+
+        now = time.time()
+        entries = []
+        for node in nodes:
+            entry = {"node": node, "status": status, "time": now}
+            if error is not None:
+                entry["error"] = error
+            entries.append(entry)
+        self._append(entries)
+        return
+
+    def state(self) -> dict[str, str]:
+        """Replay the journal into the latest status of every node.
+
+        A truncated last line, left by an interruption mid-write, is ignored.
+
+        Returns:
+            dict[str, str]: The status keyed by node name.
+        """
+        if not self.exists():
+            return {}
+
+        state = {}
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if state.get(entry["node"]) == self.DONE:
+                    continue
+                state[entry["node"]] = entry["status"]
+        return state
+
+    def outstanding(self) -> list[str]:
+        """Return the nodes that are not done yet.
+
+        Returns:
+            list[str]: The pending, in-flight and failed nodes.
+        """
+        return [node for node, status in self.state().items() if status != self.DONE]
+
+    def close(self) -> None:
+        """Close the journal file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        return
+
+    def __repr__(self) -> str:
+        """Return a string representation of the SweepJournal instance."""
+        return f"{self.__class__.__name__}({self.path})"
@@ -9,6 +9,7 @@ Classes:
 
 """
 
+import json
 import os
 import shutil
 import warnings
@@ -74,6 +75,12 @@ class SlurmClusterDatabase(BaseDatabase):
 
         coverage(self) -> float:
             Calculates the coverage of the database based on available node and CPU data.
+
+        fingerprints(self) -> dict[str, str]:
+            Loads the node fingerprints stored alongside the database.
+
+        save_fingerprints(self, fingerprints: dict[str, str]) -> None:
+            Stores the node fingerprints alongside the database.
     """
 
     # Default path
@@ -81,6 +88,9 @@ class SlurmClusterDatabase(BaseDatabase):
 
     _cpu_db_name = "cpu"
     _node_db_name = "node"
+    _fingerprint_name = "fingerprints.json"
+    # Raw outputs of the probe bundle sections other than 'cpu', stored as text without a parser
+    _probe_db_names = ("memory", "numa", "gpu", "meminfo")
 
     def __init__(self, db_name: str, db_path: str | Path | None = None) -> None:
         """Initialize the SlurmClusterDatabase instance.
@@ -181,6 +191,8 @@ class SlurmClusterDatabase(BaseDatabase):
         # Delete subdirectories
         self._delete(self.db_path / self._cpu_db_name)
         self._delete(self.db_path / self._node_db_name)
+        for name in self._probe_db_names:
+            self._delete(self.db_path / name)
 
     def remove(self, query: dict) -> None:
         """Remove a specific data entry from the database.
@@ -252,14 +264,19 @@ class SlurmClusterDatabase(BaseDatabase):
             KeyError: If the data dictionary does not contain a valid key.
 
         Returns:
-            str: The valid key ('cpu' or 'node').
+            str: The valid key ('cpu', 'node' or a probe bundle section such as 'memory').
         """
         # Check if key contains cpu or node
         if "key" not in query:
             raise KeyError(f"Key {query} does not contain key.")
 
+        if query["key"] in self._probe_db_names:
+            return query["key"]
+
         if query["key"] not in ["cpu", "node"]:
-            raise KeyError(f"Key {query} does not contain cpu or node.")
+            raise KeyError(
+                f"Key {query} does not contain cpu, node or one of {list(self._probe_db_names)}."
+            )
 
         if query["key"] == "cpu":
             return "cpu"
@@ -312,13 +329,16 @@ class SlurmClusterDatabase(BaseDatabase):
 
         Args:
             query (dict): A dictionary containing information to be inserted into the database. It should contain the following keys:
-                - key: The key of the data ('cpu' or 'node').
+                - key: The key of the data ('cpu', 'node' or a probe bundle section such as 'memory').
                 - filename: The filename of the data.
                 - data: The data to be inserted.
         """
         # Get filepath and data
         filepath, data = self._filepath_data(query)
 
+        # Probe bundle sections get their subdirectory on first use
+        filepath.parent.mkdir(exist_ok=True)
+
         # Write data to file if exists otherwise overwrite
         with open(filepath, "w") as f:
             f.write(data)
@@ -348,7 +368,7 @@ class SlurmClusterDatabase(BaseDatabase):
             query (dict): A dictionary containing a query to retrieve data.
 
         Raises:
-            KeyError: If the query dictionary does not contain a valid key or filename.
+            KeyError: If the query dictionary does not contain a valid key or filename, or the key has no parser.
 
         Returns:
             pd.Series | pd.DataFrame: The queried data as a Pandas Series or DataFrame.
@@ -359,6 +379,8 @@ class SlurmClusterDatabase(BaseDatabase):
 
         # Get key and filepath
         key, filepath = self._key_filepath(query)
+        if key not in self.iparsers:
+            raise KeyError(f"Key {key} has no parser. Use read_as_text instead.")
 
         # Change parser based on key
         if key == "cpu":
@@ -500,3 +522,31 @@ class SlurmClusterDatabase(BaseDatabase):
         # Iterator over the cpu files
         for cpu_file in os.listdir(self.db_path / self._cpu_db_name):
             yield self.query({"key": "cpu", "filename": cpu_file})
+
+    def fingerprints(self) -> dict[str, str]:
+        """Load the node fingerprints stored alongside the database.
+
+        Returns:
+            dict[str, str]: The fingerprints keyed by node name. Empty if none are stored.
+        """
+        path = self.db_path / self._fingerprint_name
+        if not path.exists():
+            return {}
+
+        with open(path) as f:
+            return json.load(f)
+
+    def save_fingerprints(self, fingerprints: dict[str, str]) -> None:
+        """Store the node fingerprints alongside the database.
+
+        Args:
+            fingerprints (dict[str, str]): The fingerprints keyed by node name.
+        """
+        path = self.db_path / self._fingerprint_name
+
+        # Write atomically so an interrupted sweep never leaves a truncated file
+        tmp_path = path.with_name(f".{path.name}.part")
+        with open(tmp_path, "w") as f:
+            json.dump(fingerprints, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+        return
@@ -0,0 +1,212 @@
+"""Snapshot Log Module.
+
+This module provides an append-only log of periodic 'scontrol show node' snapshots, stored inside the database
+directory. The raw text of a large cluster is megabytes per poll, while only a few fields (state, CPU load, free
+memory, ...) change from one minute to the next. Every snapshot is therefore stored as the fields that changed since
+the previous one, with a full keyframe every so often, as one JSON line compressed as its own gzip member:
+
+    {"time": 1700000000.0, "keyframe": true, "nodes": {"node-1": {"State": "IDLE", "CPULoad": "0.01", ...}}}
+    {"time": 1700000060.0, "nodes": {"node-1": {"CPULoad": "3.20"}}, "removed": ["node-2"]}
+
+A gzip file may hold several members, so appending a snapshot never rewrites the log, and a member truncated by an
+interruption is dropped on the next append.
+
+Classes:
+    - 'SnapshotLog': The append-only delta log of node snapshots.
+
+Example:
+    ```python
+    log = SnapshotLog(db.db_path / "watch.jsonl.gz")
+    log.append({"node-1": {"NodeName": "node-1", "State": "IDLE", "CPULoad": "0.01"}})
+
+    # Replay the history of the cluster
+    for timestamp, nodes in log.replay():
+        print(timestamp, nodes["node-1"]["State"])
+    ```
+"""
+
+import gzip
+import json
+import os
+import threading
+import time
+import zlib
+from collections.abc import Iterator
+from pathlib import Path
+
+__all__ = ["SnapshotLog"]
+
+
+class SnapshotLog:
+    """The append-only delta log of periodic node snapshots.
+
+    Args:
+        path (str | Path): The path of the log file.
+        keyframe (int, optional): The number of snapshots between two full snapshots. Defaults to 60.
+    """
+
+    # Read size of the replay
+    _chunk_size = 1 << 16
+
+    def __init__(self, path: str | Path, keyframe: int = 60) -> None:
+        """Initialize the SnapshotLog instance."""
+        if keyframe < 1:
+            raise ValueError(f"keyframe must be at least 1. Got {keyframe} instead.")
+        self.path = Path(path)
+        self.keyframe = keyframe
+        self._lock = threading.Lock()
+        self._file = None
+        self._state: dict[str, dict] | None = None
+        self._since_keyframe = 0
+
+    def exists(self) -> bool:
+        """Check if the log file exists."""
+        return self.path.exists()
+
+    def _members(self) -> Iterator[tuple[int, bytes]]:
+        """Yield the end offset and the content of every complete gzip member of the log, in order."""
+        if not self.exists():
+            return
+
+        offset = 0
+        with open(self.path, "rb") as f:
+            decompressor = zlib.decompressobj(wbits=31)
+            chunks, data = [], b""
+            while True:
+                if len(data) == 0:
+                    data = f.read(self._chunk_size)
+                    if len(data) == 0:
+                        return
+                try:
+                    chunks.append(decompressor.decompress(data))
+                except zlib.error:
+                    # A corrupted member ends the readable log
+                    return
+                rest = decompressor.unused_data if decompressor.eof else b""
+                offset += len(data) - len(rest)
+                data = rest
+                if decompressor.eof:
+                    yield offset, b"".join(chunks)
+                    decompressor = zlib.decompressobj(wbits=31)
+                    chunks = []
+
+    def _entries(self) -> Iterator[tuple[int, dict]]:
+        """Yield the end offset and the entry of every complete snapshot of the log."""
+        for offset, content in self._members():
+            for line in content.splitlines():
+                yield offset, json.loads(line)
+
+    @staticmethod
+    def _apply(state: dict[str, dict], entry: dict) -> None:
+        """Apply a snapshot entry to the state of the nodes, in place."""
+        if entry.get("keyframe", False):
+            state.clear()
+        for node, fields in entry.get("nodes", {}).items():
+            state.setdefault(node, {}).update(fields)
+        for node, fields in entry.get("dropped", {}).items():
+            for field in fields:
+                state.get(node, {}).pop(field, None)
+        for node in entry.get("removed", []):
+            state.pop(node, None)
+        return
+
+    def replay(self) -> Iterator[tuple[float, dict[str, dict]]]:
+        """Replay the log into the state of the nodes at every snapshot.
+
+        The yielded state is updated in place by the next snapshots, copy it to keep it.
+
+        Yields:
+            tuple[float, dict[str, dict]]: The time of the snapshot and the fields of every node, keyed by node name.
+        """
+        state: dict[str, dict] = {}
+        for _, entry in self._entries():
+            self._apply(state, entry)
+            yield entry["time"], state
+
+    def _restore(self) -> None:
+        """Restore the last state from the log and drop a trailing member left incomplete by an interruption."""
+        self._state, end = {}, 0
+        for offset, entry in self._entries():
+            self._apply(self._state, entry)
+            self._since_keyframe = (
+                0 if entry.get("keyframe", False) else self._since_keyframe + 1
+            )
+            end = offset
+
+        if self.exists() and self.path.stat().st_size > end:
+            os.truncate(self.path, end)
+        # Start the next log with a keyframe
+        if end == 0:
+            self._since_keyframe = self.keyframe
+        return
+
+    def delta(self, records: dict[str, dict]) -> dict:
+        """Compute the entry of a snapshot against the last state of the log.
+
+        Args:
+            records (dict[str, dict]): The raw 'scontrol show node' records keyed by node name.
+
+        Returns:
+            dict: The entry, without its time.
+        """
+        if self._state is None:
+            self._restore()
+
+        if self._since_keyframe + 1 >= self.keyframe:
+            return {"keyframe": True, "nodes": records}
+
+        entry: dict = {"nodes": {}}
+        for node, fields in records.items():
+            previous = self._state.get(node, {})
+            changed = {
+                field: value
+                for field, value in fields.items()
+                if field not in previous or previous[field] != value
+            }
+            if len(changed) > 0:
+                entry["nodes"][node] = changed
+            dropped = [field for field in previous if field not in fields]
+            if len(dropped) > 0:
+                entry.setdefault("dropped", {})[node] = dropped
+        removed = [node for node in self._state if node not in records]
+        if len(removed) > 0:
+            entry["removed"] = removed
+        return entry
+
+    def append(self, records: dict[str, dict], timestamp: float | None = None) -> dict:
+        """Append a snapshot to the log, as the fields that changed since the previous snapshot.
+
+        Args:
+            records (dict[str, dict]): The raw 'scontrol show node' records keyed by node name.
+            timestamp (float | None, optional): The time of the snapshot. Defaults to now.
+
+        Returns:
+            dict: The appended entry.
+        """
+        with self._lock:
+            entry = {
+                "time": timestamp if timestamp is not None else time.time(),
+                **self.delta(records),
+            }
+            if self._file is None:
+                self._file = open(self.path, "ab")
+            self._file.write(gzip.compress(json.dumps(entry).encode("utf-8") + b"\n"))
+            self._file.flush()
+
+            self._apply(self._state, entry)
+            self._since_keyframe = (
+                0 if entry.get("keyframe", False) else self._since_keyframe + 1
+            )
+        return entry
+
+    def close(self) -> None:
+        """Close the log file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        return
+
+    def __repr__(self) -> str:
+        """Return a string representation of the SnapshotLog instance."""
+        return f"{self.__class__.__name__}({self.path})"
@@ -1,3 +1,12 @@
 """Top Level Imports for parse module."""
-from .iparse import IlscpuParser, IscontrolParser
+from .iparse import (
+    NODE_FIELDS,
+    IlscpuJsonParser,
+    IlscpuParser,
+    IscontrolJsonParser,
+    IscontrolJsonStreamParser,
+    IscontrolParser,
+    IscontrolStreamParser,
+    project_records,
+)
 from .parser import Parser
@@ -1,4 +1,11 @@
 """Module imports for iparse."""
 from .base_iparse import IParse
-from .ilscpu import IlscpuParser
-from .iscontrol import IscontrolParser
+from .ilscpu import IlscpuJsonParser, IlscpuParser
+from .iscontrol import (
+    NODE_FIELDS,
+    IscontrolJsonParser,
+    IscontrolJsonStreamParser,
+    IscontrolParser,
+    IscontrolStreamParser,
+    project_records,
+)
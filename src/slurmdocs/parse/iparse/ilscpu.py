@@ -22,15 +22,18 @@ Example:
 
 Returns:
     pd.Series: Parsed data stored as a pandas Series.
+
+The 'IlscpuJsonParser' class parses the structured 'lscpu -J' output into the same Series.
 """
 
+import json
 from pathlib import Path
 
 import pandas as pd
 
 from .base_iparse import IParse
 
-__all__ = ["IlscpuParser"]
+__all__ = ["IlscpuJsonParser", "IlscpuParser"]
 
 
 class IlscpuParser(IParse):
@@ -96,4 +99,65 @@ class IlscpuParser(IParse):
         with open(filename) as f:
             string = f.readlines()
 
+        # 'lscpu -J' output goes to the JSON parser
+        if len(string) > 0 and string[0].lstrip().startswith("{"):
+            return IlscpuJsonParser()._parse_lscpu_json("".join(string))
+
         return self._parse_lscpu(string=string)
+
+
+class IlscpuJsonParser(IlscpuParser):
+    """Parses 'lscpu -J' output.
+
+    The 'field' and 'data' pairs of the JSON output, including the nested 'children' of the sections of recent
+    util-linux versions, are mapped to the keys and values of the text output.
+
+    Methods:
+        - _parse_lscpu_json(self, string: str) -> pd.Series: Parse 'lscpu -J' output.
+        - _parse(self, filename: Path) -> pd.Series: Parse 'lscpu -J' output from the specified file.
+    """
+
+    def _flatten(self, entries: list[dict], data: dict) -> None:
+        """Collect the fields of entries and of their children into data."""
+        for entry in entries:
+            key = str(entry.get("field", "")).strip().rstrip(":")
+            value = entry.get("data")
+            value = value.strip() if value is not None else ""
+
+            # Convert to int if possible
+            try:
+                value = int(value)
+            except ValueError:
+                pass
+
+            if len(key) > 0:
+                data[key] = value
+            self._flatten(entry.get("children", []), data)
+        return
+
+    def _parse_lscpu_json(self, string: str) -> pd.Series:
+        """Parse 'lscpu -J' output.
+
+        Args:
+            string (str): 'lscpu -J' output as a string.
+
+        Returns:
+            pd.Series: Parsed data stored as a pandas Series.
+        """
+        data = {}
+        self._flatten(json.loads(string).get("lscpu", []), data)
+        return pd.Series(data)
+
+    def _parse(self, filename: Path) -> pd.Series:
+        """Parse 'lscpu -J' output from the specified file.
+
+        Args:
+            filename (Path): The path to the file containing 'lscpu -J' output.
+
+        Returns:
+            pd.Series: Parsed data stored as a pandas Series.
+        """
+        with open(filename) as f:
+            string = f.read()
+
+        return self._parse_lscpu_json(string=string)
@@ -27,16 +27,94 @@ Example:
 
 Returns:
     pd.DataFrame: Parsed data stored as a pandas DataFrame.
+
+The 'IscontrolStreamParser' class parses the same output incrementally, record by record, as chunks arrive from the
+SSH channel.
+
+The 'IscontrolJsonParser' and 'IscontrolJsonStreamParser' classes parse the structured 'scontrol show node --json'
+output of Slurm 21.08 and later instead, into the same fields with typed values. The nodes are decoded one at a time
+with the 'ijson' streaming reader when it is installed, and with 'json' otherwise.
 """
 
+import codecs
+import datetime
+import json
 import re
+from collections.abc import Iterator
 from pathlib import Path
+from typing import BinaryIO
 
 import pandas as pd
 
 from .base_iparse import IParse
 
-__all__ = ["IscontrolParser"]
+try:
+    import ijson  # type: ignore
+except ImportError:  # pragma: no cover
+    ijson = None
+
+__all__ = [
+    "NODE_FIELDS",
+    "IscontrolJsonParser",
+    "IscontrolJsonStreamParser",
+    "IscontrolParser",
+    "IscontrolStreamParser",
+    "project_records",
+]
+
+# Fields of 'scontrol show node' kept by the preprocessing, the ones the statistics use
+NODE_FIELDS = (
+    "NodeName",
+    "CoresPerSocket",
+    "CPUTot",
+    "AvailableFeatures",
+    "Gres",
+    "NodeAddr",
+    "NodeHostName",
+    "RealMemory",
+    "Sockets",
+    "Boards",
+    "ThreadsPerCore",
+    "Partitions",
+)
+
+
+# A word starting a 'key=value' field, the values of 'Reason', 'OS' or 'Comment' span several words
+_FIELD_START = re.compile(r"[A-Za-z][A-Za-z0-9_]*=")
+
+
+def _split_fields(record: str) -> list[str]:
+    """Split a record into its 'key=value' fields, every value running up to the next 'Key=' word."""
+    fields = []
+    for word in record.split():
+        if len(fields) == 0 or _FIELD_START.match(word) is not None:
+            fields.append(word)
+        else:
+            fields[-1] += " " + word
+    return fields
+
+
+def project_records(output: str, fields: tuple[str, ...]) -> str:
+    """Project 'scontrol show node' output on fields, like the remote projection of 'IscontrolColllecter'.
+
+    Args:
+        output (str): The output of 'scontrol show node', records separated by a blank line.
+        fields (tuple[str, ...]): The fields to keep.
+
+    Returns:
+        str: One line of 'key=value' tokens per record, records separated by a blank line.
+    """
+    keep = set(fields)
+    records = []
+    for record in re.split(r"\n\s*\n", output):
+        tokens = [
+            token
+            for token in _split_fields(record)
+            if token.find("=") > 0 and token.split("=", 1)[0] in keep
+        ]
+        if len(tokens) > 0:
+            records.append(" ".join(tokens) + "\n\n")
+    return "".join(records)
 
 
 class IscontrolParser(IParse):
@@ -92,22 +170,19 @@ class IscontrolParser(IParse):
         dict: A dictionary containing parsed node information.
         """
         node = (
-            node.replace("\n", "")
-            .replace("  ", " ")
-            .replace("  ", " ")
-            .replace(" ", "@")
+            node.replace("\n", " ")
             .replace("(null)", "")
             .replace("N/A", "")
             .replace("n/a", "")
             .replace("n/s", "")
         )
 
-        node = node.split("@")
         ret_dic = {}
-        for item in node:
+        for item in _split_fields(node):
             if item.count("=") >= 1:
                 key, value = item.split("=", maxsplit=1)
-                if value == "" or value == " ":
+                value = value.strip()
+                if value == "":
                     value = None
 
                 # Convert to int if possible
@@ -172,19 +247,22 @@ class IscontrolParser(IParse):
         Returns:
         pd.DataFrame: The DataFrame with separate columns for partitions.
         """
-        # Seprate partioions inot different columns
-        unique_partitions = dataframe["Partitions"].str.split(",").explode().unique()
+        # Projected records may leave out the partitions
+        if "Partitions" not in dataframe.columns:
+            return dataframe
 
-        partition_dataframe = pd.DataFrame(
-            index=dataframe.index, columns=unique_partitions, dtype=bool
-        )  # noqa: ARG005
-
-        # Use XOR to fill the dataframe with False
-        partition_dataframe = partition_dataframe ^ partition_dataframe
+        # Seprate partioions inot different columns, in order of appearance
+        unique_partitions = (
+            dataframe["Partitions"].str.split(",").explode().dropna().unique()
+        )
 
-        for index, row in dataframe.iterrows():
-            for partition in row["Partitions"].split(","):
-                partition_dataframe.loc[index, partition] = True
+        # One boolean column per partition, built at once rather than cell by cell
+        partition_dataframe = (
+            dataframe["Partitions"]
+            .str.get_dummies(sep=",")
+            .reindex(columns=unique_partitions, fill_value=0)
+            .astype(bool)
+        )
 
         # Add a partition identifier to columns name
         partition_dataframe.columns = [
@@ -236,9 +314,11 @@ class IscontrolParser(IParse):
         ]
 
         # GPU model filter
-        dataframe["Gres"] = dataframe["Gres"].apply(self._gpu_filter)
+        if "Gres" in dataframe.columns:
+            dataframe["Gres"] = dataframe["Gres"].apply(self._gpu_filter)
 
-        return dataframe.drop(columns=redundant_columns)
+        # Projected records only hold some of the columns
+        return dataframe.drop(columns=redundant_columns, errors="ignore")
 
     def _parse(self, filename: Path) -> pd.Series:
         """Parse 'scontrol show node' output from a file and return the parsed data as a DataFrame.
@@ -250,6 +330,10 @@ class IscontrolParser(IParse):
         pd.DataFrame: Parsed data stored as a pandas DataFrame.
         """
         with open(filename) as f:
+            # 'scontrol show node --json' output goes to the JSON parser
+            if f.read(1024).lstrip().startswith("{"):
+                return IscontrolJsonParser(preprocess=self.preprocess)._parse(filename)
+            f.seek(0)
             string = f.read()
 
         # Parse the data
@@ -263,3 +347,328 @@ class IscontrolParser(IParse):
             return self._preprocess_dataframe(df)
 
         return df
+
+
+class IscontrolStreamParser:
+    """Incrementally parses Slurm's 'scontrol show node' output.
+
+    Chunks of raw bytes are fed as they arrive, every complete node record is parsed right away and the DataFrame
+    is assembled once the stream is closed. This overlaps the parsing with the transfer of large outputs.
+
+    Methods:
+    - feed(self, chunk: bytes) -> None: Feeds a chunk of the output.
+    - close(self) -> pd.DataFrame: Parses the remaining output and returns the parsed DataFrame.
+    - records (property): The raw node records parsed so far.
+
+    Example:
+    ```python
+    stream_parser = IscontrolStreamParser(preprocess=True)
+    collecter.stream(session, filename="node_info.txt", on_chunk=stream_parser.feed)
+    parsed_data = stream_parser.close()
+    ```
+    """
+
+    def __init__(self, preprocess: bool = True) -> None:
+        """Initialize the IscontrolStreamParser object.
+
+        Args:
+        preprocess (bool, optional): Whether to preprocess the DataFrame by dropping redundant columns and filtering GPU information. Defaults to True.
+        """
+        self._iparser = IscontrolParser(preprocess=preprocess)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._nodes: list[dict] = []
+
+    def _consume(self, records: list[str]) -> None:
+        """Parse complete node records."""
+        self._nodes.extend(
+            self._iparser._per_node_filter(record)
+            for record in records
+            if len(record.strip()) > 0
+        )
+
+    @property
+    def records(self) -> list[dict]:
+        """The raw node records parsed so far, before partitioning and preprocessing."""
+        return self._nodes
+
+    def feed(self, chunk: bytes) -> None:
+        """Feed a chunk of the 'scontrol show node' output.
+
+        Args:
+        chunk (bytes): A chunk of the raw output.
+        """
+        self._buffer += self._decoder.decode(chunk)
+
+        # Keep the last, possibly incomplete, record in the buffer
+        *records, self._buffer = self._buffer.split("\n\n")
+        self._consume(records)
+
+    def close(self) -> pd.DataFrame:
+        """Parse the remaining output and return the parsed data.
+
+        Returns:
+        pd.DataFrame: Parsed data stored as a pandas DataFrame.
+        """
+        self._buffer += self._decoder.decode(b"", final=True)
+        self._consume([self._buffer])
+        self._buffer = ""
+
+        df = self._iparser._partitionize(dataframe=pd.DataFrame(self._nodes))
+
+        if self._iparser.preprocess:
+            return self._iparser._preprocess_dataframe(df)
+
+        return df
+
+
+# Values of the JSON output that mean no value, like in the text output
+_JSON_NULLS = ("", "(null)", "N/A", "n/a", "n/s")
+
+
+def _json_number(value: object) -> int | float | None:
+    """Unwrap a number of the JSON output, Slurm 23.02 and later wrap them in a 'set', 'infinite', 'number' object."""
+    if isinstance(value, dict):
+        if not value.get("set", True) or value.get("infinite", False):
+            return None
+        value = value.get("number")
+    if value is None or isinstance(value, int):
+        return value
+    number = float(value)
+    return int(number) if number.is_integer() else number
+
+
+def _json_text(value: object) -> str | None:
+    """Convert a string or a list of strings of the JSON output to the comma separated text of the text output."""
+    if isinstance(value, list):
+        value = ",".join(map(str, value))
+    if value is None or value in _JSON_NULLS:
+        return None
+    return str(value)
+
+
+def _json_time(value: object) -> str | None:
+    """Convert a timestamp of the JSON output to the local time of the text output."""
+    timestamp = _json_number(value)
+    if not timestamp:
+        return None
+    return datetime.datetime.fromtimestamp(timestamp).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def _json_load(value: object) -> float | None:
+    """Convert the CPU load of the JSON output, in hundredths, to the load of the text output."""
+    load = _json_number(value)
+    return round(load / 100, 2) if load is not None else None
+
+
+def _json_state(value: object) -> str | None:
+    """Convert the state of the JSON output, a list of states since Slurm 23.02, to the '+' separated text state."""
+    states = value if isinstance(value, list) else [value]
+    return "+".join(str(state).upper() for state in states if state) or None
+
+
+# Keys of the nodes of the JSON output mapped to the fields of the text output and their conversion, in the order of
+# the text output
+_JSON_FIELDS = {
+    "name": ("NodeName", _json_text),
+    "architecture": ("Arch", _json_text),
+    "cores": ("CoresPerSocket", _json_number),
+    "alloc_cpus": ("CPUAlloc", _json_number),
+    "cpus": ("CPUTot", _json_number),
+    "cpu_load": ("CPULoad", _json_load),
+    "features": ("AvailableFeatures", _json_text),
+    "active_features": ("ActiveFeatures", _json_text),
+    "gres": ("Gres", _json_text),
+    "address": ("NodeAddr", _json_text),
+    "hostname": ("NodeHostName", _json_text),
+    "version": ("Version", _json_text),
+    "operating_system": ("OS", _json_text),
+    "real_memory": ("RealMemory", _json_number),
+    "alloc_memory": ("AllocMem", _json_number),
+    "free_memory": ("FreeMem", _json_number),
+    "free_mem": ("FreeMem", _json_number),
+    "sockets": ("Sockets", _json_number),
+    "boards": ("Boards", _json_number),
+    "specialized_memory": ("MemSpecLimit", _json_number),
+    "state": ("State", _json_state),
+    "threads": ("ThreadsPerCore", _json_number),
+    "tmp_disk": ("TmpDisk", _json_number),
+    "weight": ("Weight", _json_number),
+    "owner": ("Owner", _json_text),
+    "mcs_label": ("MCS_label", _json_text),
+    "partitions": ("Partitions", _json_text),
+    "boot_time": ("BootTime", _json_time),
+    "slurmd_start_time": ("SlurmdStartTime", _json_time),
+    "tres": ("CfgTRES", _json_text),
+    "tres_used": ("AllocTRES", _json_text),
+    "comment": ("Comment", _json_text),
+    "reason": ("Reason", _json_text),
+}
+
+
+class IscontrolJsonParser(IscontrolParser):
+    """Parses Slurm's 'scontrol show node --json' output.
+
+    Every node is mapped to the fields of the text output, so that the records, the partitioning and the
+    preprocessing are the ones of 'IscontrolParser'. The values are typed by field instead of guessed: numbers,
+    comma separated lists, '+' separated states and times in the local time zone. The keys of both the Slurm 21.08
+    and the Slurm 23.02 and later schemas are understood.
+
+    Methods:
+    - _per_node_record(node: dict) -> dict: Maps a single node of the JSON output to a record.
+    - _nodes(f: BinaryIO) -> Iterator[dict]: Decodes the nodes of the JSON output one at a time.
+    - _frame(self, records: list[dict]) -> pd.DataFrame: Partitions and preprocesses records.
+    - _parse(self, filename: Path) -> pd.DataFrame: Parses 'scontrol show node --json' output from a file.
+
+    Example:
+    ```python
+    scontrol_parser = IscontrolJsonParser(preprocess=True)
+    parsed_data = scontrol_parser._parse(Path('node_info.json'))
+    ```
+    """
+
+    @staticmethod
+    def _per_node_record(node: dict) -> dict:
+        """Map a single node of the JSON output to a record of the text output.
+
+        Args:
+        node (dict): A node of the 'nodes' array.
+
+        Returns:
+        dict: A dictionary containing parsed node information.
+        """
+        record = {}
+        for key, (field, convert) in _JSON_FIELDS.items():
+            if key in node:
+                record[field] = convert(node[key])
+
+        # The text output only has a reason when one is set
+        if record.get("Reason", "") is None:
+            del record["Reason"]
+
+        # Before Slurm 23.02, the flags of the state are apart from the base state
+        if len(node.get("state_flags", [])) > 0:
+            record["State"] = _json_state([record.get("State"), *node["state_flags"]])
+
+        return record
+
+    @staticmethod
+    def _nodes(f: BinaryIO) -> Iterator[dict]:
+        """Decode the nodes of the JSON output one at a time.
+
+        Args:
+        f (BinaryIO): The JSON output.
+
+        Yields:
+        dict: The nodes of the 'nodes' array.
+        """
+        if ijson is not None:
+            yield from ijson.items(f, "nodes.item")
+            return
+        yield from json.load(f).get("nodes", [])
+
+    def _frame(self, records: list[dict]) -> pd.DataFrame:
+        """Partition and preprocess node records.
+
+        Args:
+        records (list[dict]): The node records.
+
+        Returns:
+        pd.DataFrame: Parsed data stored as a pandas DataFrame.
+        """
+        df = self._partitionize(dataframe=pd.DataFrame(records))
+
+        if self.preprocess:
+            return self._preprocess_dataframe(df)
+
+        return df
+
+    def _parse(self, filename: Path) -> pd.DataFrame:
+        """Parse 'scontrol show node --json' output from a file and return the parsed data as a DataFrame.
+
+        Args:
+        filename (Path): The path to the file containing 'scontrol show node --json' output.
+
+        Returns:
+        pd.DataFrame: Parsed data stored as a pandas DataFrame.
+        """
+        with open(filename, "rb") as f:
+            records = [self._per_node_record(node) for node in self._nodes(f)]
+
+        return self._frame(records)
+
+
+class IscontrolJsonStreamParser:
+    """Incrementally parses Slurm's 'scontrol show node --json' output.
+
+    With 'ijson' installed, every node is decoded as soon as its last byte arrives. Otherwise the output is buffered
+    and decoded once the stream is closed. The interface is the one of 'IscontrolStreamParser'.
+
+    Methods:
+    - feed(self, chunk: bytes) -> None: Feeds a chunk of the output.
+    - close(self) -> pd.DataFrame: Parses the remaining output and returns the parsed DataFrame.
+    - records (property): The raw node records parsed so far.
+
+    Example:
+    ```python
+    stream_parser = IscontrolJsonStreamParser(preprocess=True)
+    collecter.stream(session, filename="node_info.txt", on_chunk=stream_parser.feed)
+    parsed_data = stream_parser.close()
+    ```
+    """
+
+    def __init__(self, preprocess: bool = True) -> None:
+        """Initialize the IscontrolJsonStreamParser object.
+
+        Args:
+        preprocess (bool, optional): Whether to preprocess the DataFrame by dropping redundant columns and filtering GPU information. Defaults to True.
+        """
+        self._iparser = IscontrolJsonParser(preprocess=preprocess)
+        self._nodes: list[dict] = []
+        self._chunks: list[bytes] = []
+        self._items = None
+        self._coroutine = None
+        if ijson is not None:
+            self._items = ijson.sendable_list()
+            self._coroutine = ijson.items_coro(self._items, "nodes.item")
+
+    def _consume(self, nodes: list[dict]) -> None:
+        """Map complete nodes to records."""
+        self._nodes.extend(self._iparser._per_node_record(node) for node in nodes)
+
+    @property
+    def records(self) -> list[dict]:
+        """The raw node records parsed so far, before partitioning and preprocessing."""
+        return self._nodes
+
+    def feed(self, chunk: bytes) -> None:
+        """Feed a chunk of the 'scontrol show node --json' output.
+
+        Args:
+        chunk (bytes): A chunk of the raw output.
+        """
+        if len(chunk) == 0:
+            return
+        if self._coroutine is None:
+            self._chunks.append(chunk)
+            return
+
+        self._coroutine.send(chunk)
+        self._consume(self._items)
+        del self._items[:]
+
+    def close(self) -> pd.DataFrame:
+        """Parse the remaining output and return the parsed data.
+
+        Returns:
+        pd.DataFrame: Parsed data stored as a pandas DataFrame.
+        """
+        if self._coroutine is not None:
+            self._coroutine.close()
+            self._consume(self._items)
+            del self._items[:]
+        elif len(self._chunks) > 0:
+            self._consume(json.loads(b"".join(self._chunks)).get("nodes", []))
+            self._chunks = []
+
+        return self._iparser._frame(self._nodes)
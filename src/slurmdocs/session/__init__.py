@@ -1,2 +1,8 @@
 """Top level import for slurmdocs.session package."""
+from .broker import BrokeredSession, SessionBroker, broker_socket_path
+from .fake_server import FakeSlurmServer
+from .health import is_reachable
+from .jump_session import JumpSession
+from .replay import ReplaySession
+from .ssh_pool import SSHSessionPool
 from .ssh_session import SSHSessionAuth
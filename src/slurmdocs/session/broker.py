@@ -0,0 +1,387 @@
+"""Session Broker Module.
+
+This module provides a persistent session broker, similar to an OpenSSH ControlMaster. The broker keeps authenticated
+SSH transports to a server alive and serves exec requests over a Unix socket, so that later CLI invocations attach in
+milliseconds instead of pinging the server, loading the key and doing a full SSH handshake.
+
+Protocol:
+    A client opens one connection per request and sends a single JSON line, one of:
+        {"op": "exec", "cmd": "...", "timeout": 10.0}
+        {"op": "ping"}
+        {"op": "stop"}
+    The broker answers with frames made of a one byte type, a four byte big-endian length and a payload:
+        b"o": A chunk of stdout.
+        b"e": A chunk of stderr.
+        b"x": The exit status as ASCII digits, which ends the response.
+        b"t": A timeout message, which ends the response.
+        b"!": An error message, which ends the response.
+
+Classes:
+    SessionBroker: The broker server holding a pool of SSH transports.
+    BrokeredSession: A client session with the `SSHSessionAuth` surface, executing commands through the broker.
+
+Functions:
+    broker_socket_path: The Unix socket path of the broker of a server.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import struct
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from .channel import BufferedChannel, exec_result
+from .ssh_pool import SSHSessionPool
+from .ssh_session import SSHSessionAuth
+
+__all__ = ["BrokeredSession", "SessionBroker", "broker_socket_path"]
+
+_HEADER = struct.Struct(">cI")
+
+
+def broker_socket_path(server: str, remote_username: str, port: int = 22) -> Path:
+    """Return the Unix socket path of the broker of a server.
+
+    Sockets live in a private per-user directory under `$XDG_RUNTIME_DIR`, or the temporary directory.
+
+    Args:
+        server (str): The hostname or IP address of the remote server.
+        remote_username (str): The username for the remote server authentication.
+        port (int, optional): The port number for the SSH connection. Default is 22.
+
+    Returns:
+        Path: The path of the Unix socket.
+    """
+    root = Path(os.environ.get("XDG_RUNTIME_DIR", tempfile.gettempdir()))
+    run_dir = root / f"slurmdocs-{os.getuid()}"
+    run_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+    return run_dir / f"{remote_username}@{server}:{port}.sock"
+
+
+def _send_frame(sock: socket.socket, kind: bytes, payload: bytes) -> None:
+    """Send one frame of the broker protocol."""
+    sock.sendall(_HEADER.pack(kind, len(payload)) + payload)
+
+
+def _recv_exact(sock: socket.socket, nbytes: int) -> bytes:
+    """Receive exactly nbytes, or raise EOFError if the connection is closed."""
+    data = bytearray()
+    while len(data) < nbytes:
+        chunk = sock.recv(nbytes - len(data))
+        if len(chunk) == 0:
+            raise EOFError("The session broker closed the connection.")
+        data += chunk
+    return bytes(data)
+
+
+class _BrokerRequestHandler(socketserver.StreamRequestHandler):
+    """Serve one request of the broker protocol."""
+
+    def handle(self) -> None:
+        """Handle a single JSON request."""
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            _send_frame(self.request, b"!", b"Malformed request.")
+            return
+
+        if request.get("op") == "ping":
+            _send_frame(self.request, b"x", b"0")
+        elif request.get("op") == "stop":
+            _send_frame(self.request, b"x", b"0")
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+        elif request.get("op") == "exec":
+            self._exec(request["cmd"], request.get("timeout"))
+        else:
+            _send_frame(self.request, b"!", b"Unknown operation.")
+
+    def _exec(self, cmd: str, timeout: float | None) -> None:
+        """Run a command on a pooled transport and pump its output back as frames.
+
+        Like the read timeout of a channel, the command times out once it produced no output for 'timeout' seconds.
+        The channel is closed in any case, so that a client that went away does not hold a pooled channel.
+        """
+        pool: SSHSessionPool = self.server.pool
+        try:
+            with pool.lease() as member:
+                _, stdout, _ = member.session.exec_command(cmd, timeout=timeout)
+                channel = stdout.channel
+                try:
+                    status = self._pump(channel, timeout)
+                finally:
+                    # Close before giving the transport back to the pool
+                    channel.close()
+            _send_frame(self.request, b"x", str(status).encode())
+        except (BrokenPipeError, ConnectionResetError):
+            # The client went away, the channel is already closed
+            return
+        except TimeoutError as e:
+            _send_frame(self.request, b"t", str(e).encode())
+        except Exception as e:
+            _send_frame(self.request, b"!", f"{type(e).__name__}: {e}".encode())
+
+    def _pump(self, channel: object, timeout: float | None) -> int:
+        """Send the output of a channel as frames until the command exits, and return its exit status.
+
+        Raises:
+            ConnectionError: If the channel closed before the command exited.
+            TimeoutError: If the command produced no output for 'timeout' seconds.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            idle = True
+            if channel.recv_ready():
+                _send_frame(self.request, b"o", channel.recv(32768))
+                idle = False
+            if channel.recv_stderr_ready():
+                _send_frame(self.request, b"e", channel.recv_stderr(32768))
+                idle = False
+            if not idle:
+                if timeout is not None:
+                    deadline = time.monotonic() + timeout
+                continue
+            if channel.exit_status_ready():
+                if not channel.recv_ready() and not channel.recv_stderr_ready():
+                    return channel.recv_exit_status()
+                continue
+            # A dead transport closes the channel without an exit status
+            if channel.closed:
+                raise ConnectionError("The channel closed before the command exited.")
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"No output for {timeout} seconds from the command.")
+            time.sleep(0.005)
+
+
+class _BrokerServer(socketserver.ThreadingUnixStreamServer):
+    """Threaded Unix socket server holding the SSH session pool."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, pool: SSHSessionPool) -> None:
+        """Bind the server to the socket path."""
+        self.pool = pool
+        super().__init__(str(socket_path), _BrokerRequestHandler)
+
+
+class SessionBroker:
+    """A persistent session broker serving exec requests over a Unix socket.
+
+    Args:
+        session (SSHSessionAuth): The template session of the pooled transports.
+        pool_size (int, optional): The number of SSH transports kept alive. Default is 2.
+        max_channels (int, optional): The maximum number of concurrent channels per transport. Default is 8.
+        socket_path (Path | None, optional): The Unix socket path. Defaults to `broker_socket_path` of the session.
+    """
+
+    def __init__(
+        self,
+        session: SSHSessionAuth,
+        pool_size: int = 2,
+        max_channels: int = 8,
+        socket_path: Path | None = None,
+    ) -> None:
+        """Initialize the SessionBroker instance."""
+        self.socket_path = socket_path or broker_socket_path(
+            session.server, session.remote_username, session.port
+        )
+        self.pool = SSHSessionPool(session, size=pool_size, max_channels=max_channels)
+
+    def serve_forever(self) -> None:
+        """Serve requests until a stop request is received."""
+        # Authenticate eagerly so clients never pay for the handshake
+        with self.pool.lease():
+            pass
+
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+
+        server = _BrokerServer(self.socket_path, self.pool)
+        os.chmod(self.socket_path, 0o600)
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            self.pool.close()
+            if self.socket_path.exists():
+                self.socket_path.unlink()
+
+    def __repr__(self) -> str:
+        """Return a string representation of the SessionBroker instance."""
+        return f"{self.__class__.__name__}(socket_path={self.socket_path}, pool={self.pool})"
+
+
+class _BrokerClient:
+    """The `session` attribute of a BrokeredSession, mimicking `paramiko.SSHClient.exec_command`."""
+
+    def __init__(self, socket_path: Path) -> None:
+        """Initialize the client of the broker listening on the socket path."""
+        self.socket_path = socket_path
+
+    def _request(self, request: dict) -> socket.socket:
+        """Open a connection to the broker and send a request."""
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(str(self.socket_path))
+        sock.sendall(json.dumps(request).encode() + b"\n")
+        return sock
+
+    def _pump(self, sock: socket.socket, channel: BufferedChannel) -> None:
+        """Feed the frames of a response into the channel."""
+        try:
+            while not channel.closed:
+                kind, length = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+                payload = _recv_exact(sock, length)
+                if kind == b"o":
+                    channel.feed_stdout(payload)
+                elif kind == b"e":
+                    channel.feed_stderr(payload)
+                elif kind == b"x":
+                    channel.set_exit_status(int(payload))
+                    return
+                elif kind == b"t":
+                    channel.set_error(TimeoutError(payload.decode()))
+                    return
+                else:
+                    channel.set_error(ConnectionError(payload.decode()))
+                    return
+        except (OSError, EOFError) as e:
+            channel.set_error(ConnectionError(str(e)))
+        finally:
+            sock.close()
+
+    def exec_command(self, command: str, timeout: float | None = None) -> tuple:
+        """Execute a command through the broker.
+
+        Args:
+            command (str): The command to execute.
+            timeout (float | None, optional): The read timeout of the channel. Defaults to None.
+
+        Returns:
+            tuple: The stdin, stdout and stderr file-like objects.
+        """
+        sock = self._request({"op": "exec", "cmd": command, "timeout": timeout})
+        channel = BufferedChannel()
+        channel.settimeout(timeout)
+        threading.Thread(target=self._pump, args=(sock, channel), daemon=True).start()
+        return exec_result(channel)
+
+    def ping(self) -> bool:
+        """Check if the broker answers."""
+        try:
+            sock = self._request({"op": "ping"})
+        except OSError:
+            return False
+        try:
+            kind, length = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+            return kind == b"x"
+        except (OSError, EOFError):
+            return False
+        finally:
+            sock.close()
+
+    def stop(self) -> None:
+        """Ask the broker to shut down."""
+        sock = self._request({"op": "stop"})
+        try:
+            _recv_exact(sock, _HEADER.size)
+        finally:
+            sock.close()
+
+    def close(self) -> None:
+        """Nothing to close, connections are per request."""
+        return
+
+
+class BrokeredSession(SSHSessionAuth):
+    """A session executing commands through a running session broker.
+
+    It exposes the `SSHSessionAuth` surface (`connect`, `session.exec_command`, `is_connected`, ...) without
+    pinging the server, loading a key or doing an SSH handshake.
+
+    Args:
+        server (str): The hostname or IP address of the remote server.
+        remote_username (str): The username for the remote server authentication.
+        port (int, optional): The port number for the SSH connection. Default is 22.
+        socket_path (Path | None, optional): The Unix socket path of the broker. Defaults to `broker_socket_path`.
+    """
+
+    def __init__(
+        self,
+        server: str,
+        remote_username: str,
+        port: int = 22,
+        socket_path: Path | None = None,
+    ) -> None:
+        """Initialize the BrokeredSession instance."""
+        self.server = server
+        self.remote_username = remote_username
+        self.port = port
+        self.socket_path = socket_path or broker_socket_path(
+            server, remote_username, port
+        )
+        self.session = _BrokerClient(self.socket_path)
+
+    @classmethod
+    def available(
+        cls: type["BrokeredSession"], server: str, remote_username: str, port: int = 22
+    ) -> bool:
+        """Check if a broker is serving the given server.
+
+        Args:
+            server (str): The hostname or IP address of the remote server.
+            remote_username (str): The username for the remote server authentication.
+            port (int, optional): The port number for the SSH connection. Default is 22.
+
+        Returns:
+            bool: True if a broker answers on the socket, False otherwise.
+        """
+        socket_path = broker_socket_path(server, remote_username, port)
+        if not socket_path.exists():
+            return False
+        return _BrokerClient(socket_path).ping()
+
+    def is_connected(self) -> bool:
+        """Check if the broker answers."""
+        if not hasattr(self, "session"):
+            return False
+        return self.session.ping()
+
+    def connect(self) -> None:
+        """Attach to the broker.
+
+        Raises:
+            ConnectionError: If the broker is not running.
+        """
+        if not hasattr(self, "session"):
+            self.session = _BrokerClient(self.socket_path)
+
+        if not self.is_connected():
+            raise ConnectionError(
+                f"No session broker is listening on {self.socket_path}."
+            )
+        return
+
+    def close(self) -> None:
+        """Detach from the broker. The broker itself keeps running."""
+        return
+
+    def is_alive(self) -> bool:
+        """Check if the broker answers."""
+        return self.is_connected()
+
+    def jump(self, node: str, port: int = 22) -> SSHSessionAuth:  # noqa : ARG002
+        """The broker only forwards commands, it cannot tunnel to the nodes.
+
+        Raises:
+            ValueError: Always.
+        """
+        raise ValueError(
+            "The session broker cannot tunnel to the nodes. Use --no-broker for direct SSH."
+        )
+
+    def __repr__(self) -> str:
+        """Return a string representation of the BrokeredSession instance."""
+        return f"{self.__class__.__name__}({self.remote_username}@{self.server}:{self.port})"
@@ -0,0 +1,195 @@
+"""Buffered Channel Module.
+
+This module provides an in-memory stand-in for a paramiko channel. Sessions that do not own a paramiko transport,
+such as the session broker client, feed the output of a remote command into a `BufferedChannel` and hand it to the
+collectors, which only rely on the channel surface below.
+
+Classes:
+    BufferedChannel: A thread-safe channel fed by a producer.
+    BufferedChannelFile: A file-like view over the stdout or stderr stream of a BufferedChannel.
+
+Functions:
+    exec_result: Build the (stdin, stdout, stderr) tuple returned by `exec_command`.
+"""
+
+import io
+import socket
+import threading
+import time
+from collections.abc import Callable
+
+__all__ = ["BufferedChannel", "BufferedChannelFile", "exec_result"]
+
+
+class BufferedChannel:
+    """A thread-safe in-memory channel mimicking the surface of `paramiko.Channel`.
+
+    A producer feeds the stdout and stderr streams and finally the exit status, while consumers read them with
+    `recv`, `recv_stderr` and the `*_ready` methods. A producer error is raised to the consumer on the next read.
+
+    Attributes:
+        closed (bool): Whether the channel has been closed by the consumer.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the BufferedChannel instance."""
+        self._stdout = bytearray()
+        self._stderr = bytearray()
+        self._exit_status: int | None = None
+        self._error: BaseException | None = None
+        self._timeout: float | None = None
+        self._cond = threading.Condition()
+        self.closed = False
+
+    # Producer side
+    def feed_stdout(self, data: bytes) -> None:
+        """Append data to the stdout stream."""
+        with self._cond:
+            self._stdout += data
+            self._cond.notify_all()
+
+    def feed_stderr(self, data: bytes) -> None:
+        """Append data to the stderr stream."""
+        with self._cond:
+            self._stderr += data
+            self._cond.notify_all()
+
+    def set_exit_status(self, status: int) -> None:
+        """Set the exit status, which ends both streams."""
+        with self._cond:
+            self._exit_status = status
+            self._cond.notify_all()
+
+    def set_error(self, error: BaseException) -> None:
+        """End the streams with an error raised to the consumer."""
+        with self._cond:
+            self._error = error
+            self._cond.notify_all()
+
+    # Consumer side
+    def settimeout(self, timeout: float | None) -> None:
+        """Set the timeout of the blocking reads."""
+        self._timeout = timeout
+
+    def gettimeout(self) -> float | None:
+        """Get the timeout of the blocking reads."""
+        return self._timeout
+
+    def _is_done(self) -> bool:
+        """Check if the producer has ended the streams."""
+        return self._exit_status is not None or self._error is not None
+
+    def _wait(self, predicate: Callable[[], bool]) -> None:
+        """Wait for the predicate or the end of the streams, honoring the timeout."""
+        deadline = None if self._timeout is None else time.monotonic() + self._timeout
+        while not predicate() and not self._is_done() and not self.closed:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise socket.timeout("Timeout when reading from the channel.")
+            self._cond.wait(remaining)
+
+    def _read(self, buffer: bytearray, nbytes: int) -> bytes:
+        """Read up to nbytes from a stream buffer."""
+        self._wait(lambda: len(buffer) > 0)
+        if len(buffer) == 0 and self._error is not None:
+            raise self._error
+        data = bytes(buffer[:nbytes])
+        del buffer[:nbytes]
+        return data
+
+    def recv(self, nbytes: int) -> bytes:
+        """Receive up to nbytes from stdout. Returns b"" at the end of the stream."""
+        with self._cond:
+            return self._read(self._stdout, nbytes)
+
+    def recv_stderr(self, nbytes: int) -> bytes:
+        """Receive up to nbytes from stderr. Returns b"" at the end of the stream."""
+        with self._cond:
+            return self._read(self._stderr, nbytes)
+
+    def recv_ready(self) -> bool:
+        """Check if stdout data is ready to be received."""
+        with self._cond:
+            return len(self._stdout) > 0
+
+    def recv_stderr_ready(self) -> bool:
+        """Check if stderr data is ready to be received."""
+        with self._cond:
+            return len(self._stderr) > 0
+
+    def exit_status_ready(self) -> bool:
+        """Check if the remote command has ended."""
+        with self._cond:
+            return self._is_done()
+
+    def recv_exit_status(self) -> int:
+        """Wait for and return the exit status of the remote command. Returns -1 on error."""
+        with self._cond:
+            while not self._is_done() and not self.closed:
+                self._cond.wait()
+            return self._exit_status if self._exit_status is not None else -1
+
+    def close(self) -> None:
+        """Close the channel, waking up any blocked reader."""
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+class BufferedChannelFile(io.RawIOBase):
+    """A file-like view over the stdout or stderr stream of a BufferedChannel.
+
+    Attributes:
+        channel (BufferedChannel): The underlying channel.
+    """
+
+    def __init__(self, channel: BufferedChannel, stderr: bool = False) -> None:
+        """Initialize the BufferedChannelFile instance.
+
+        Args:
+            channel (BufferedChannel): The underlying channel.
+            stderr (bool, optional): Read the stderr stream instead of stdout. Defaults to False.
+        """
+        super().__init__()
+        self.channel = channel
+        self._recv = channel.recv_stderr if stderr else channel.recv
+
+    def readable(self) -> bool:
+        """Return True, the stream is readable."""
+        return True
+
+    def readinto(self, buffer: bytearray) -> int:
+        """Read bytes into a pre-allocated buffer."""
+        data = self._recv(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to size bytes, or until the end of the stream if size is negative."""
+        if size is not None and size >= 0:
+            return self._recv(size)
+
+        chunks = []
+        while True:
+            chunk = self._recv(32768)
+            if len(chunk) == 0:
+                return b"".join(chunks)
+            chunks.append(chunk)
+
+
+def exec_result(
+    channel: BufferedChannel,
+) -> tuple[io.BytesIO, BufferedChannelFile, BufferedChannelFile]:
+    """Build the (stdin, stdout, stderr) tuple returned by `exec_command`.
+
+    Args:
+        channel (BufferedChannel): The channel of the command.
+
+    Returns:
+        tuple[io.BytesIO, BufferedChannelFile, BufferedChannelFile]: The stdin sink, stdout and stderr files.
+    """
+    return (
+        io.BytesIO(),
+        BufferedChannelFile(channel),
+        BufferedChannelFile(channel, stderr=True),
+    )
@@ -0,0 +1,440 @@
+"""Fake Slurm SSH Server Module.
+
+This module provides a local SSH server, built on paramiko's `ServerInterface`, that emulates the Slurm commands run
+by the collectors on a synthetic cluster. It makes it possible to measure the `collect sweep` throughput, the pool
+behavior and the timeout handling over a real SSH stack, end to end, without a live Slurm controller.
+
+Emulated commands:
+    scontrol show node: The node records of the synthetic cluster, or their fields projected by 'scontrol -o ... | awk'.
+    srun ... lscpu: A single node, batched (--label) or job step (--jobid) probe. Probes wait for a free slot of the
+        scheduler queue and then for the scheduling latency.
+    salloc --no-shell: Always granted after the scheduling latency.
+    scancel: Cancels the queued probes by job name.
+
+Classes:
+    FakeSlurmServer: The fake Slurm SSH server.
+
+Example:
+    ```python
+    with FakeSlurmServer(nodes=512, latency=0.5, queue_slots=64, max_sessions=10) as server:
+        session = SSHSessionAuth("127.0.0.1", "user", port=server.port, path_to_priv_key="id_rsa")
+        node_info = IscontrolColllecter()(session)
+    ```
+
+    Or from the command line: `python -m slurmdocs.session.fake_server --nodes 512 --port 2222`.
+"""
+
+import contextlib
+import itertools
+import re
+import socket
+import threading
+import time
+
+import click
+import paramiko  # type: ignore
+
+from ..parse.iparse.iscontrol import project_records
+from .replay import _decompose
+
+__all__ = ["FakeSlurmServer"]
+
+_NODE_RECORD = """NodeName={name} Arch=x86_64 CoresPerSocket={cores}
+   CPUAlloc=0 CPUTot={cpus} CPULoad=0.01
+   AvailableFeatures=rack-{rack},{cpus}CPUs,intel,avx,avx2
+   ActiveFeatures=rack-{rack},{cpus}CPUs,intel,avx,avx2
+   Gres=(null)
+   NodeAddr=10.0.{rack}.{slot} NodeHostName={name} Version=23.02.6
+   OS=Linux 5.14.0-362.el9.x86_64 #1 SMP PREEMPT_DYNAMIC
+   RealMemory={memory} AllocMem=0 FreeMem={memory} Sockets=2 Boards=1
+   State=IDLE ThreadsPerCore=1 TmpDisk=0 Weight=1 Owner=N/A MCS_label=N/A
+   Partitions={partition}
+   BootTime=2024-01-01T00:00:00 SlurmdStartTime=2024-01-01T00:01:00
+   CfgTRES=cpu={cpus},mem={memory}M,billing={cpus}
+   AllocTRES=
+   CapWatts=n/a
+   CurrentWatts=0 AveWatts=0
+   ExtSensorsJoules=n/s ExtSensorsWatts=0 ExtSensorsTemp=n/s
+   Comment=(null)
+"""
+
+_LSCPU = """Architecture:                    x86_64
+CPU op-mode(s):                  32-bit, 64-bit
+Byte Order:                      Little Endian
+CPU(s):                          {cpus}
+On-line CPU(s) list:             0-{last}
+Vendor ID:                       GenuineIntel
+Model name:                      Intel(R) Xeon(R) Gold 6248 CPU @ 2.50GHz
+CPU family:                      6
+Model:                           85
+Thread(s) per core:              1
+Core(s) per socket:              {cores}
+Socket(s):                       2
+CPU max MHz:                     3900.0000
+CPU min MHz:                     1000.0000
+Flags:                           fpu vme de pse tsc msr pae mce cx8 apic sep sse sse2 ht avx avx2 avx512f fma
+L1d cache:                       {l1d} KiB
+L2 cache:                        {l2} MiB
+L3 cache:                        55 MiB
+NUMA node(s):                    2
+"""
+
+
+class _SlurmServerInterface(paramiko.ServerInterface):
+    """Accept any credentials and dispatch the exec requests of one transport to the fake server."""
+
+    def __init__(self, server: "FakeSlurmServer") -> None:
+        """Initialize the interface of one transport."""
+        self._server = server
+        self._channels = 0
+        self._lock = threading.Lock()
+
+    def get_allowed_auths(self, username: str) -> str:  # noqa : ARG002
+        """Allow key and password authentication."""
+        return "publickey,password"
+
+    def check_auth_publickey(
+        self, username: str, key: paramiko.PKey  # noqa : ARG002
+    ) -> int:
+        """Accept any key."""
+        return paramiko.AUTH_SUCCESSFUL
+
+    def check_auth_password(self, username: str, password: str) -> int:  # noqa : ARG002
+        """Accept any password."""
+        return paramiko.AUTH_SUCCESSFUL
+
+    def check_channel_request(self, kind: str, chanid: int) -> int:  # noqa : ARG002
+        """Open session channels up to the MaxSessions limit of the transport."""
+        if kind != "session":
+            return paramiko.OPEN_FAILED_UNKNOWN_CHANNEL_TYPE
+
+        with self._lock:
+            if self._channels >= self._server.max_sessions:
+                return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+            self._channels += 1
+        return paramiko.OPEN_SUCCEEDED
+
+    def release(self) -> None:
+        """Release a channel slot of the transport."""
+        with self._lock:
+            self._channels -= 1
+
+    def check_channel_exec_request(
+        self, channel: paramiko.Channel, command: bytes
+    ) -> bool:
+        """Run the command in the background."""
+        threading.Thread(
+            target=self._server._run,
+            args=(channel, command.decode("utf-8"), self),
+            daemon=True,
+        ).start()
+        return True
+
+
+class FakeSlurmServer:
+    """A local SSH server emulating the Slurm commands of a synthetic cluster.
+
+    Args:
+        nodes (int, optional): The number of nodes of the synthetic cluster. Default is 64.
+        partitions (tuple[str, ...], optional): The partitions, assigned to the nodes round-robin. Default is ("debug",).
+        latency (float, optional): The scheduling latency in seconds of every 'srun' and 'salloc'. Default is 0.
+        step_latency (float, optional): The latency in seconds of a job step inside an allocation. Default is 0.
+        queue_slots (int | None, optional): The number of probes running at once, the others wait in the queue.
+            Defaults to no limit.
+        max_sessions (int, optional): The maximum number of concurrent channels per transport, like the sshd
+            MaxSessions setting. Default is 10.
+        host (str, optional): The address to listen on. Default is "127.0.0.1".
+        port (int, optional): The port to listen on, 0 for a free port. Default is 0.
+        host_key (paramiko.PKey | None, optional): The host key. Defaults to a generated RSA key.
+
+    Attributes:
+        port (int): The port the server listens on, once started.
+        commands (list[str]): Every command received, in order.
+    """
+
+    # Seconds to wait for the client to close a channel after the exit status
+    _close_grace = 1.0
+
+    def __init__(
+        self,
+        nodes: int = 64,
+        partitions: tuple[str, ...] = ("debug",),
+        latency: float = 0.0,
+        step_latency: float = 0.0,
+        queue_slots: int | None = None,
+        max_sessions: int = 10,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        host_key: paramiko.PKey | None = None,
+    ) -> None:
+        """Initialize the FakeSlurmServer instance."""
+        self.partitions = tuple(partitions)
+        self.latency = latency
+        self.step_latency = step_latency
+        self.max_sessions = max_sessions
+        self.host = host
+        self.port = port
+        self._host_key = host_key or paramiko.RSAKey.generate(2048)
+
+        # Synthetic cluster
+        self.nodes = {}
+        records = []
+        for i in range(nodes):
+            name = f"node-{i:04d}"
+            cores = (16, 20, 24, 32)[i % 4]
+            spec = dict(
+                name=name,
+                cores=cores,
+                cpus=2 * cores,
+                last=2 * cores - 1,
+                rack=i // 64,
+                slot=i % 64 + 1,
+                memory=cores * 8192,
+                partition=self.partitions[i % len(self.partitions)],
+                l1d=cores * 64,
+                l2=cores,
+            )
+            self.nodes[name] = _LSCPU.format(**spec)
+            records.append(_NODE_RECORD.format(**spec))
+        self._scontrol = "\n".join(records)
+
+        self._slots = (
+            threading.BoundedSemaphore(queue_slots) if queue_slots is not None else None
+        )
+        self._jobs: dict[str, set[threading.Event]] = {}
+        self._jobids = itertools.count(1000)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._transports: list[paramiko.Transport] = []
+        self._listener: socket.socket | None = None
+        self.commands: list[str] = []
+
+    def start(self) -> "FakeSlurmServer":
+        """Start listening in the background.
+
+        Returns:
+            FakeSlurmServer: The started server.
+        """
+        self._listener = socket.create_server((self.host, self.port))
+        self._listener.settimeout(0.2)
+        self.port = self._listener.getsockname()[1]
+        self._stop.clear()
+        threading.Thread(target=self._accept, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server and close every transport."""
+        self._stop.set()
+        if self._listener is not None:
+            self._listener.close()
+        for transport in self._transports:
+            transport.close()
+        return
+
+    def _accept(self) -> None:
+        """Accept the connections until stopped."""
+        while not self._stop.is_set():
+            try:
+                sock, _ = self._listener.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(sock,), daemon=True).start()
+
+    def _serve(self, sock: socket.socket) -> None:
+        """Run the SSH protocol over an accepted connection."""
+        transport = paramiko.Transport(sock)
+        transport.add_server_key(self._host_key)
+        try:
+            transport.start_server(server=_SlurmServerInterface(self))
+        except (paramiko.SSHException, EOFError, OSError):
+            # Reachability probes close the connection before the handshake
+            transport.close()
+            return
+        with self._lock:
+            self._transports.append(transport)
+
+    def _run(
+        self, channel: paramiko.Channel, command: str, interface: _SlurmServerInterface
+    ) -> None:
+        """Run a command and send its output over the channel."""
+        with self._lock:
+            self.commands.append(command)
+        try:
+            inner, compress = _decompose(command)
+            stdout, stderr, status = self._respond(inner)
+            stdout, stderr = compress(stdout.encode("utf-8")), stderr.encode("utf-8")
+            channel.sendall(stdout)
+            channel.sendall_stderr(stderr)
+            channel.send_exit_status(status)
+            channel.shutdown_write()
+        except (OSError, EOFError, paramiko.SSHException):
+            # The client closed the channel, e.g. after a timeout
+            pass
+        finally:
+            interface.release()
+
+        # Leave the close to the client: a fast command closing first could overtake the acknowledgement of the
+        # exec request, which the client reports as a closed channel
+        deadline = time.monotonic() + self._close_grace
+        while not channel.closed and time.monotonic() < deadline:
+            time.sleep(0.005)
+        channel.close()
+
+    def _queue(
+        self, cancelled: threading.Event
+    ) -> contextlib.AbstractContextManager | None:
+        """Wait for a free slot of the scheduler queue, or return None if the job is cancelled meanwhile."""
+        if self._slots is None:
+            return contextlib.nullcontext()
+
+        while not self._slots.acquire(timeout=0.05):
+            if cancelled.is_set() or self._stop.is_set():
+                return None
+
+        @contextlib.contextmanager
+        def slot():  # noqa : ANN202
+            try:
+                yield
+            finally:
+                self._slots.release()
+
+        return slot()
+
+    def _respond(self, command: str) -> tuple[str, str, int]:
+        """Compute the stdout, stderr and exit status of a command."""
+        if command.startswith("scontrol show node"):
+            return self._scontrol, "", 0
+        if command.startswith("scontrol -o show node"):
+            keep = re.search(r"-v keep=(\S+)", command)
+            fields = tuple(keep.group(1).split(",")) if keep is not None else ()
+            return project_records(self._scontrol, fields), "", 0
+
+        name = re.search(r"-J (\S+)", command)
+        name = name.group(1) if name is not None else ""
+
+        if command.startswith("scancel"):
+            cancelled = re.search(r"-n (\S+)", command)
+            if cancelled is not None:
+                with self._lock:
+                    for job in self._jobs.get(cancelled.group(1), ()):
+                        job.set()
+            return "", "", 0
+
+        if command.startswith("salloc"):
+            time.sleep(self.latency)
+            return "", f"salloc: Granted job allocation {next(self._jobids)}\n", 0
+
+        nodelist = re.search(r"--nodelist=(\S+)", command)
+        if not command.startswith("srun") or nodelist is None:
+            return "", f"bash: {command.split()[0]}: command not found\n", 127
+
+        nodes = nodelist.group(1).split(",")
+        missing = [node for node in nodes if node not in self.nodes]
+        if len(missing) > 0:
+            return (
+                "",
+                "srun: error: Unable to allocate resources: Requested node configuration is not available\n",
+                1,
+            )
+
+        # Job steps run inside an allocation that is already granted
+        if "--jobid=" in command:
+            time.sleep(self.step_latency)
+            return self.nodes[nodes[0]], "", 0
+
+        # Register the job, 'scancel -n' only cancels the jobs queued or running at the time
+        cancelled = threading.Event()
+        with self._lock:
+            self._jobs.setdefault(name, set()).add(cancelled)
+        try:
+            slot = self._queue(cancelled)
+            if slot is None:
+                return "", f"srun: error: Job {name} cancelled\n", 1
+            with slot:
+                if cancelled.wait(self.latency):
+                    return "", f"srun: error: Job {name} cancelled\n", 1
+        finally:
+            with self._lock:
+                self._jobs[name].discard(cancelled)
+
+        if "--label" not in command:
+            return self.nodes[nodes[0]], "", 0
+
+        lines = []
+        for label, node in enumerate(nodes):
+            lines.append(f"{label}: @@node={node}")
+            lines.extend(f"{label}: {line}" for line in self.nodes[node].splitlines())
+        return "\n".join(lines) + "\n", "", 0
+
+    def __enter__(self) -> "FakeSlurmServer":
+        """Start the server."""
+        return self.start()
+
+    def __exit__(self, *args) -> None:  # noqa : ANN002
+        """Stop the server."""
+        self.stop()
+
+    def __repr__(self) -> str:
+        """Return a string representation of the FakeSlurmServer instance."""
+        return f"{self.__class__.__name__}({self.host}:{self.port}, nodes={len(self.nodes)})"
+
+
+@click.command()
+@click.option(
+    "--nodes", help="The number of nodes.", type=click.IntRange(min=1), default=64
+)
+@click.option(
+    "--partitions",
+    help="Comma separated partitions.",
+    type=click.STRING,
+    default="debug",
+)
+@click.option(
+    "--latency",
+    help="The scheduling latency in seconds.",
+    type=click.FLOAT,
+    default=0.0,
+)
+@click.option(
+    "--queue-slots",
+    help="The number of probes running at once.",
+    type=click.INT,
+    default=None,
+)
+@click.option(
+    "--max-sessions",
+    help="The maximum number of channels per transport.",
+    type=click.INT,
+    default=10,
+)
+@click.option("--port", help="The port to listen on.", type=click.INT, default=2222)
+def main(
+    nodes: int,
+    partitions: str,
+    latency: float,
+    queue_slots: int | None,
+    max_sessions: int,
+    port: int,
+) -> None:
+    """Run a fake Slurm SSH server in the foreground."""
+    server = FakeSlurmServer(
+        nodes=nodes,
+        partitions=tuple(partitions.split(",")),
+        latency=latency,
+        queue_slots=queue_slots,
+        max_sessions=max_sessions,
+        port=port,
+    )
+    with server:
+        print(f"{server} listening. Press Ctrl+C to stop.")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
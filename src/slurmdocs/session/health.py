@@ -0,0 +1,131 @@
+"""Connection Health Module.
+
+This module provides the building blocks used to keep long sweeps alive over unreliable links: a fast TCP reachability
+probe with a cached result, exponential backoff delays for reconnects and the classification of transient errors that
+are worth retrying.
+
+Functions:
+    probe: Check if a TCP port of a server accepts connections.
+    is_reachable: Cached variant of `probe`.
+    backoff_delays: Exponential backoff delays with jitter.
+    is_transient: Check if an error is a transient connection error.
+
+Example:
+    ```python
+    if not is_reachable("cluster.example.com", 22):
+        raise ConnectionError("Server not reachable")
+
+    for attempt, delay in zip(range(3), backoff_delays()):
+        ...
+    ```
+"""
+
+import random
+import socket
+import threading
+import time
+from collections.abc import Iterator
+
+import paramiko  # type: ignore
+
+__all__ = ["backoff_delays", "is_reachable", "is_transient", "probe"]
+
+# Cached reachability results keyed by (server, port) : (expiry, reachable)
+_reachability: dict[tuple[str, int], tuple[float, bool]] = {}
+_reachability_lock = threading.Lock()
+
+
+def probe(server: str, port: int = 22, timeout: float = 3.0) -> bool:
+    """Check if a TCP port of a server accepts connections.
+
+    Unlike an ICMP ping, this works on login nodes that filter ICMP and checks the SSH port itself.
+
+    Args:
+        server (str): The hostname or IP address of the remote server.
+        port (int, optional): The TCP port to probe. Default is 22.
+        timeout (float, optional): The connection timeout in seconds. Default is 3.
+
+    Returns:
+        bool: True if the port accepts connections, False otherwise.
+    """
+    try:
+        with socket.create_connection((server, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+def is_reachable(
+    server: str, port: int = 22, timeout: float = 3.0, ttl: float = 30.0
+) -> bool:
+    """Check if a TCP port of a server accepts connections, reusing recent results.
+
+    Args:
+        server (str): The hostname or IP address of the remote server.
+        port (int, optional): The TCP port to probe. Default is 22.
+        timeout (float, optional): The connection timeout in seconds. Default is 3.
+        ttl (float, optional): How long a result is reused, in seconds. Default is 30.
+
+    Returns:
+        bool: True if the port accepts connections, False otherwise.
+    """
+    key = (server, port)
+    with _reachability_lock:
+        cached = _reachability.get(key)
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+
+    reachable = probe(server, port, timeout)
+    with _reachability_lock:
+        _reachability[key] = (time.monotonic() + ttl, reachable)
+    return reachable
+
+
+def backoff_delays(
+    base: float = 0.5, factor: float = 2.0, cap: float = 30.0, jitter: bool = True
+) -> Iterator[float]:
+    """Generate exponential backoff delays.
+
+    Args:
+        base (float, optional): The first delay in seconds. Default is 0.5.
+        factor (float, optional): The growth factor between delays. Default is 2.
+        cap (float, optional): The maximum delay in seconds. Default is 30.
+        jitter (bool, optional): Randomize each delay in [0, delay] so that parallel workers do not reconnect in
+            lockstep. Default is True.
+
+    Yields:
+        float: The next delay in seconds.
+    """
+    delay = base
+    while True:
+        yield random.uniform(0, delay) if jitter else delay
+        delay = min(delay * factor, cap)
+
+
+def is_transient(error: BaseException) -> bool:
+    """Check if an error is a transient connection error, worth a reconnect and retry.
+
+    Dropped or refused connections, failed name lookups, closed streams and SSH protocol errors are transient.
+    Timeouts are not: they mean that the remote command is stuck, not that the link is down. Neither are the other
+    OS errors, such as a missing or unreadable key file, nor rejected credentials or host keys.
+
+    Args:
+        error (BaseException): The error to classify.
+
+    Returns:
+        bool: True if the error is transient, False otherwise.
+    """
+    if isinstance(
+        error, (paramiko.AuthenticationException, paramiko.BadHostKeyException)
+    ):
+        return False
+    return isinstance(
+        error,
+        (
+            ConnectionError,
+            socket.gaierror,
+            paramiko.ssh_exception.NoValidConnectionsError,
+            EOFError,
+            paramiko.SSHException,
+        ),
+    )
@@ -0,0 +1,115 @@
+"""Jump Session Module.
+
+This module provides an SSH session to a compute node tunnelled through the transport of an existing session to the
+login node, which acts as a jump host like `ssh -J`. The node session authenticates with the credentials of the login
+session, and exposes the `SSHSessionAuth` surface so that the collectors can run commands on the node directly,
+without going through the scheduler.
+
+Classes:
+    JumpSession: An SSH session to a node, through a jump host.
+
+Example:
+    ```python
+    login = SSHSessionAuth("login.cluster.edu", "jhondoe", path_to_priv_key="~/.ssh/id_rsa")
+    node = login.jump("compute-0-1")
+    node.connect()
+    _, stdout, _ = node.session.exec_command("lscpu")
+    node.close()
+    ```
+"""
+
+import paramiko  # type: ignore
+
+from .ssh_session import SSHSessionAuth
+
+__all__ = ["JumpSession"]
+
+
+class JumpSession(SSHSessionAuth):
+    """An SSH session to a node, tunnelled through the transport of a session to the login node.
+
+    Args:
+        via (SSHSessionAuth): The session to the login node, used as the jump host.
+        node (str): The hostname of the node, as resolved by the login node.
+        port (int, optional): The SSH port of the node. Defaults to 22.
+        timeout (float, optional): The timeout in seconds of the tunnel and the handshake. Defaults to 10.
+    """
+
+    def __init__(
+        self, via: SSHSessionAuth, node: str, port: int = 22, timeout: float = 10.0
+    ) -> None:
+        """Initialize the JumpSession instance."""
+        self.via = via
+        self.server = node
+        self.port = port
+        self.timeout = timeout
+        self.remote_username = via.remote_username
+        self.use_key_base_aut = via.use_key_base_aut
+        if self.use_key_base_aut:
+            self.path_to_key = via.path_to_key
+        else:
+            self.password = via.password
+
+        # The link is the one of the jump host, a single attempt is enough
+        self.compress = False
+        self.keepalive = 0
+        self.retries = 0
+
+    def _create_session(self) -> paramiko.SSHClient:
+        """Open a tunnel to the node through the jump host and authenticate over it.
+
+        Raises:
+            paramiko.SSHException: If the login node refuses the tunnel or the node the authentication.
+
+        Returns:
+            paramiko.SSHClient: The client connected to the node.
+        """
+        self.via.connect()
+        tunnel = self.via.session.get_transport().open_channel(
+            "direct-tcpip",
+            (self.server, self.port),
+            ("127.0.0.1", 0),
+            timeout=self.timeout,
+        )
+
+        ssh_client = paramiko.SSHClient()
+        ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        credentials = (
+            {"pkey": paramiko.RSAKey.from_private_key_file(self.path_to_key)}
+            if self.use_key_base_aut
+            else {"password": self.password}
+        )
+        ssh_client.connect(
+            hostname=self.server,
+            port=self.port,
+            username=self.remote_username,
+            sock=tunnel,
+            timeout=self.timeout,
+            banner_timeout=self.timeout,
+            auth_timeout=self.timeout,
+            allow_agent=False,
+            look_for_keys=False,
+            **credentials,
+        )
+        return ssh_client
+
+    def connect(self) -> None:
+        """Connect to the node through the jump host.
+
+        Raises:
+            ConnectionError: If the node could not be reached.
+        """
+        if self.is_connected():
+            return
+
+        try:
+            self.session = self._create_session()
+        except (OSError, paramiko.SSHException) as e:
+            raise ConnectionError(
+                f"Unable to connect to {self.server} through {self.via.server}: {e}"
+            )
+        return
+
+    def __repr__(self) -> str:
+        """Return a string representation of the JumpSession instance."""
+        return f"{self.__class__.__name__}({self.remote_username}@{self.server}:{self.port} via {self.via.server})"
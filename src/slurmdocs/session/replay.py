@@ -0,0 +1,373 @@
+"""Replay Session Module.
+
+This module provides a session that exposes the `SSHSessionAuth` surface without any cluster. Commands are answered
+from a recorded corpus of outputs, such as an existing SlurmDocs database, or by a local subprocess runner. A
+configurable latency and failure rate can be injected per command, which makes it possible to benchmark the
+collectors, the `collect sweep` concurrency and the timeout handling offline.
+
+Classes:
+    ReplaySession: A session answering commands from recorded outputs or a local runner.
+
+Example:
+    ```python
+    session = ReplaySession.from_database("~/.slurmdocs/doehpc", latency=0.5, failure_rate=0.01)
+    output = IlscpuCollecter()(session, node="gpu-0-1", partition="debug", qos="debug")
+    ```
+"""
+
+import copy
+import gzip
+import random
+import re
+import subprocess
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import paramiko  # type: ignore
+
+try:
+    import zstandard  # type: ignore
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+from ..parse.iparse.iscontrol import project_records
+from .channel import BufferedChannel, exec_result
+from .ssh_session import SSHSessionAuth
+
+__all__ = ["ReplaySession"]
+
+# A response is the stdout, or a (stdout, stderr, exit status) tuple, or a callable of the match returning either
+Response = str | bytes | tuple | Callable[[re.Match], str | bytes | tuple]
+
+# Remote compression suffix appended by 'wrap_command'
+_COMPRESS_SUFFIX = re.compile(
+    r"\s*\|\s*(gzip -1 -c|zstd -1 -c -q|if command -v zstd .*fi)$"
+)
+
+
+def _as_bytes(data: str | bytes) -> bytes:
+    """Encode the data if needed."""
+    return data.encode("utf-8") if isinstance(data, str) else data
+
+
+def _decompose(command: str) -> tuple[str, Callable[[bytes], bytes]]:
+    """Split a command into the command before its remote compression suffix and the compressor of its output.
+
+    'auto' compresses with zstd when the 'zstandard' package is installed, like a remote host having zstd, and with
+    gzip otherwise.
+
+    Raises:
+        ImportError: If the command compresses with zstd but the 'zstandard' package is not installed.
+    """
+    match = _COMPRESS_SUFFIX.search(command)
+    if match is None:
+        return command, lambda data: data
+
+    inner = command[: match.start()]
+    if match.group(1).startswith("gzip") or (
+        match.group(1).startswith("if") and zstandard is None
+    ):
+        return inner, lambda data: gzip.compress(data, compresslevel=1)
+    if zstandard is None:
+        raise ImportError("The zstandard package is required for zstd compression.")
+    return inner, zstandard.ZstdCompressor(level=1).compress
+
+
+class _ReplayClient:
+    """The `session` attribute of a ReplaySession, mimicking `paramiko.SSHClient.exec_command`."""
+
+    def __init__(self, replay: "ReplaySession") -> None:
+        """Initialize the client of the replay session."""
+        self._replay = replay
+
+    def exec_command(self, command: str, timeout: float | None = None) -> tuple:
+        """Execute a command against the replay session.
+
+        Args:
+            command (str): The command to execute.
+            timeout (float | None, optional): The read timeout of the channel. Defaults to None.
+
+        Raises:
+            paramiko.SSHException: If a failure is injected.
+
+        Returns:
+            tuple: The stdin, stdout and stderr file-like objects.
+        """
+        return self._replay._exec(command, timeout)
+
+    def close(self) -> None:
+        """Nothing to close."""
+        return
+
+
+class ReplaySession(SSHSessionAuth):
+    """A session answering commands from recorded outputs or a local subprocess runner.
+
+    Commands are matched against the rules in insertion order with `re.search`. Unmatched commands run locally when
+    `runner` is True and otherwise exit with status 127. Outputs of commands wrapped with gzip remote compression are
+    compressed like the remote side would.
+
+    Args:
+        rules (list[tuple[str, Response]] | None, optional): The (pattern, response) rules. Defaults to None.
+        runner (bool, optional): Run unmatched commands with a local shell. Defaults to False.
+        latency (float | Callable[[str], float], optional): The delay in seconds before a command starts to answer,
+            or a callable of the command returning it. Defaults to 0.
+        failure_rate (float, optional): The probability that opening a channel fails with an SSHException.
+            Defaults to 0.
+        hang_rate (float, optional): The probability that a command never answers, so that reads time out.
+            Defaults to 0.
+        seed (int | None, optional): The seed of the failure injection. Defaults to None.
+        server (str, optional): The server name reported by the session. Defaults to "replay".
+        remote_username (str, optional): The username reported by the session. Defaults to "replay".
+
+    Attributes:
+        commands (list[str]): Every command received, in order.
+    """
+
+    def __init__(
+        self,
+        rules: list[tuple[str, Response]] | None = None,
+        runner: bool = False,
+        latency: float | Callable[[str], float] = 0.0,
+        failure_rate: float = 0.0,
+        hang_rate: float = 0.0,
+        seed: int | None = None,
+        server: str = "replay",
+        remote_username: str = "replay",
+    ) -> None:
+        """Initialize the ReplaySession instance."""
+        self.server = server
+        self.remote_username = remote_username
+        self.port = 22
+        self.compress = False
+        self.keepalive = 0
+        self.retries = 0
+
+        self._rules: list[tuple[re.Pattern, Response]] = []
+        for pattern, response in rules or []:
+            self.add(pattern, response)
+        self._runner = runner
+        self._latency = latency
+        self._failure_rate = failure_rate
+        self._hang_rate = hang_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._prefix = ""
+        self.commands: list[str] = []
+
+    @classmethod
+    def from_database(
+        cls: type["ReplaySession"],
+        db_path: str | Path,
+        workdir: str | Path | None = None,
+        **kwargs,
+    ) -> "ReplaySession":
+        """Create a replay session of the cluster recorded in a SlurmDocs database.
+
+        'scontrol show node' is answered from the node data, projected on the requested fields if any, 'lscpu' probes
+        (single node, batched, job step, through pdsh, clush or a jump session) from the cpu data of the node, probe bundles from the data of every section of
+        the node, 'salloc' is always granted and 'scancel' succeeds. Probes of nodes without cpu data fail like an unavailable node, and bundle
+        sections without data like a missing command. The commands of the remote cache run on the local shell from the
+        working directory, which stands in for the home directory on the shared filesystem of the cluster.
+
+        Args:
+            db_path (str | Path): The path of the database directory.
+            workdir (str | Path | None, optional): The working directory of the remote cache commands. Defaults to a
+                new temporary directory.
+            kwargs (dict): Keyword arguments passed to the ReplaySession.
+
+        Returns:
+            ReplaySession: The replay session.
+        """
+        db_path = Path(db_path).expanduser()
+        workdir = Path(
+            workdir if workdir is not None else tempfile.mkdtemp(prefix="slurmdocs-")
+        ).expanduser()
+        # Databases created by 'collect sweep' use 'node' and 'cpu', older exports '*_data'
+        suffix = "" if (db_path / "node").is_dir() else "_data"
+        node_file = db_path / f"node{suffix}" / "node_info.txt"
+        cpu_dir = db_path / f"cpu{suffix}"
+
+        def lscpu(node: str) -> str | None:
+            path = cpu_dir / f"{node}.txt"
+            return path.read_text() if path.exists() else None
+
+        def single(match: re.Match) -> tuple:
+            output = lscpu(match.group(1))
+            if output is None:
+                return "", "srun: error: Unable to allocate resources\n", 1
+            return output
+
+        def bundle(match: re.Match) -> tuple:
+            if lscpu(match.group(1)) is None:
+                return "", "srun: error: Unable to allocate resources\n", 1
+            frames = b""
+            for section in re.findall(r"(\w+) \"\$s\"", match.string):
+                path = (
+                    cpu_dir if section == "cpu" else db_path / section
+                ) / f"{match.group(1)}.txt"
+                data = path.read_bytes() if path.exists() else b""
+                status = 0 if path.exists() else 127
+                frames += f"@@section {section} {status} {len(data)}\n".encode() + data
+            return frames
+
+        def fanout(match: re.Match) -> tuple:
+            lines, missing = [], []
+            for node in match.group(1).split(","):
+                output = lscpu(node)
+                if output is None:
+                    missing.append(node)
+                    continue
+                lines.extend(f"{node}: {line}" for line in output.splitlines())
+            stderr = "".join(
+                f"pdsh@login: {node}: ssh exited with exit code 255\n"
+                for node in missing
+            )
+            return "\n".join(lines) + "\n", stderr, 1 if len(missing) > 0 else 0
+
+        def batch(match: re.Match) -> tuple:
+            lines, missing = [], []
+            for label, node in enumerate(match.group(1).split(",")):
+                output = lscpu(node)
+                if output is None:
+                    missing.append(node)
+                    continue
+                lines.append(f"{label}: @@node={node}")
+                lines.extend(f"{label}: {line}" for line in output.splitlines())
+            if len(missing) > 0:
+                return "", f"srun: error: Unable to allocate {','.join(missing)}\n", 1
+            return "\n".join(lines) + "\n"
+
+        def local(match: re.Match) -> tuple:
+            process = subprocess.run(
+                match.string, shell=True, capture_output=True, cwd=workdir
+            )
+            return process.stdout, process.stderr, process.returncode
+
+        session = cls(**kwargs)
+        session.add(r"^(?:\{ cd |mkdir -p ).*(?:@@entry|@@EOF)", local)
+        session.add(
+            r"^scontrol -o show node \| awk -v keep=(\S+) ",
+            lambda match: project_records(
+                node_file.read_text(), tuple(match.group(1).split(","))
+            ),
+        )
+        session.add(r"^scontrol show node", lambda _: node_file.read_text())
+        session.add(
+            r"^salloc ", lambda _: ("", "salloc: Granted job allocation 1000\n", 0)
+        )
+        session.add(r"^scancel ", "")
+        session.add(r"^srun .*--label --nodelist=(\S+)", batch)
+        session.add(r"^(?:pdsh|clush) -w (\S+) lscpu$", fanout)
+        session.add(
+            r"^command -v (pdsh|clush)", lambda match: f"/usr/bin/{match.group(1)}\n"
+        )
+        session.add(
+            r"^(?:srun .*--nodelist=|ssh |(?:pdsh|clush) -N -w )(\S+) lscpu$", single
+        )
+        session.add(
+            r"(?s)^(?:srun .*--nodelist=|ssh |(?:pdsh|clush) -N -w )(\S+) '?sh -c .*@@section",
+            bundle,
+        )
+        return session
+
+    def add(self, pattern: str, response: Response) -> None:
+        """Add a rule answering the commands matching a pattern.
+
+        Args:
+            pattern (str): The regular expression searched in the commands.
+            response (Response): The stdout, or a (stdout, stderr, exit status) tuple, or a callable of the match
+                returning either.
+        """
+        self._rules.append((re.compile(pattern), response))
+        return
+
+    def _answer(self, command: str) -> tuple[bytes, bytes, int]:
+        """Compute the stdout, stderr and exit status of a command."""
+        for pattern, response in self._rules:
+            match = pattern.search(command)
+            if match is None:
+                continue
+            if callable(response):
+                response = response(match)
+            if not isinstance(response, tuple):
+                response = (response, b"", 0)
+            stdout, stderr, status = response
+            return _as_bytes(stdout), _as_bytes(stderr), status
+
+        if self._runner:
+            process = subprocess.run(command, shell=True, capture_output=True)
+            return process.stdout, process.stderr, process.returncode
+
+        return b"", f"sh: {command.split()[0]}: command not found\n".encode(), 127
+
+    def _exec(self, command: str, timeout: float | None) -> tuple:
+        """Answer a command on a buffered channel after the injected latency."""
+        command = self._prefix + command
+        with self._lock:
+            self.commands.append(command)
+            failed = self._random.random() < self._failure_rate
+            hangs = self._random.random() < self._hang_rate
+
+        if failed:
+            raise paramiko.SSHException("Injected failure when opening a channel.")
+
+        channel = BufferedChannel()
+        channel.settimeout(timeout)
+        if hangs:
+            return exec_result(channel)
+
+        latency = self._latency(command) if callable(self._latency) else self._latency
+
+        def answer() -> None:
+            time.sleep(latency)
+            inner, compress = _decompose(command)
+            stdout, stderr, status = self._answer(inner)
+            stdout = compress(stdout)
+            channel.feed_stdout(stdout)
+            channel.feed_stderr(stderr)
+            channel.set_exit_status(status)
+
+        threading.Thread(target=answer, daemon=True).start()
+        return exec_result(channel)
+
+    def is_connected(self) -> bool:
+        """Check if the session is connected."""
+        return hasattr(self, "session")
+
+    def jump(self, node: str, port: int = 22) -> "ReplaySession":  # noqa : ARG002
+        """Create a replay session to a node, answering its commands as 'ssh <node> <command>' on this session.
+
+        Args:
+            node (str): The hostname of the node.
+            port (int, optional): The SSH port of the node. Defaults to 22.
+
+        Returns:
+            ReplaySession: The replay session to the node, sharing the rules and the commands of this one.
+        """
+        jumped = copy.copy(self)
+        jumped.__dict__.pop("session", None)
+        jumped.server = node
+        jumped._prefix = f"{self._prefix}ssh {node} "
+        return jumped
+
+    def connect(self) -> None:
+        """Connect to the replay session."""
+        if not self.is_connected():
+            self.session = _ReplayClient(self)
+        return
+
+    def close(self) -> None:
+        """Nothing to close."""
+        return
+
+    def is_alive(self) -> bool:
+        """Check if the session is alive."""
+        return self.is_connected()
+
+    def __repr__(self) -> str:
+        """Return a string representation of the ReplaySession instance."""
+        return f"{self.__class__.__name__}(rules={len(self._rules)}, runner={self._runner})"
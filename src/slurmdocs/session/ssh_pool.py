@@ -0,0 +1,282 @@
+"""SSH Session Pool Module.
+
+This module provides a pool of SSH transports to the same remote server. A single paramiko transport is limited
+by the `MaxSessions` setting of the remote sshd (default 10), so sharing one `SSHSessionAuth` between many worker
+threads throttles or rejects channel opens. The `SSHSessionPool` class keeps several authenticated transports
+alive and leases them to worker threads, balancing the number of open channels across transports and evicting
+transports that are no longer healthy.
+
+Classes:
+    SSHSessionPool: A thread-safe pool of `SSHSessionAuth` transports.
+
+Example:
+    ```python
+    session = SSHSessionAuth("example.com", "username")
+    pool = SSHSessionPool(session, size=8, max_channels=8)
+
+    with pool.lease() as member:
+        stdin, stdout, stderr = member.session.exec_command("hostname")
+    ```
+
+Dependencies:
+    - copy
+    - threading
+    - contextlib
+"""
+
+import copy
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from .ssh_session import SSHSessionAuth
+
+__all__ = ["SSHSessionPool"]
+
+
+class SSHSessionPool:
+    """A thread-safe pool of SSH transports to the same remote server.
+
+    Each member of the pool is an independent `SSHSessionAuth` with its own paramiko transport, created from a
+    template session so that the credentials are only gathered once. A lease hands out the healthy member with
+    the fewest open channels, and blocks while every member already carries `max_channels` channels.
+
+    Args:
+        session (SSHSessionAuth): The template session. Its credentials are copied to every member.
+        size (int, optional): The number of transports in the pool. Default is 4.
+        max_channels (int, optional): The maximum number of concurrent channels per transport. Should stay
+            below the `MaxSessions` setting of the remote sshd. Default is 8.
+
+    Attributes:
+        size (int): The number of transports in the pool.
+        max_channels (int): The maximum number of concurrent channels per transport.
+        capacity (int): The maximum number of concurrent leases over the whole pool.
+
+    Methods:
+        acquire(): Lease a member of the pool.
+        release(member): Return a leased member to the pool.
+        lease(): Context manager around acquire and release.
+        close(): Close every transport in the pool.
+    """
+
+    def __init__(
+        self, session: SSHSessionAuth, size: int = 4, max_channels: int = 8
+    ) -> None:
+        """Initialize the SSH session pool.
+
+        Args:
+            session (SSHSessionAuth): The template session. Its credentials are copied to every member.
+            size (int, optional): The number of transports in the pool. Default is 4.
+            max_channels (int, optional): The maximum number of concurrent channels per transport. Default is 8.
+
+        Raises:
+            TypeError: If session is not an instance of SSHSessionAuth.
+            ValueError: If size or max_channels is not positive.
+        """
+        if not isinstance(session, SSHSessionAuth):
+            raise TypeError(
+                f"session must be an instance of SSHSessionAuth. Got {type(session)} instead."
+            )
+        if size <= 0:
+            raise ValueError(f"size must be positive. Got {size} instead.")
+        if max_channels <= 0:
+            raise ValueError(
+                f"max_channels must be positive. Got {max_channels} instead."
+            )
+
+        self._template = session
+        self.size = size
+        self.max_channels = max_channels
+
+        # Members are created lazily on first lease
+        self._members: list[SSHSessionAuth | None] = [None] * size
+        self._channels = [0] * size
+        # The members leased from each slot, once per channel, also the ones replaced by a respawn
+        self._leases: list[list[SSHSessionAuth]] = [[] for _ in range(size)]
+
+        self._lock = threading.Condition()
+        self._closed = False
+
+    @property
+    def capacity(self) -> int:
+        """The maximum number of concurrent leases over the whole pool."""
+        return self.size * self.max_channels
+
+    def _spawn(self) -> SSHSessionAuth:
+        """Create and connect a new member from the template session."""
+        member = copy.copy(self._template)
+        # Do not share the paramiko client of the template
+        member.__dict__.pop("session", None)
+        member.connect()
+
+        if not self._is_healthy(member):
+            raise ConnectionError(
+                f"Unable to open a pooled SSH transport to {self._template.server}."
+            )
+        return member
+
+    def _is_healthy(self, member: SSHSessionAuth | None) -> bool:
+        """Check if a member has a live transport."""
+        if member is None:
+            return False
+        try:
+            return member.is_alive()
+        except Exception:
+            return False
+
+    def _select(self) -> int | None:
+        """Select the slot with the fewest open channels below the channel limit."""
+        candidates = [
+            idx for idx in range(self.size) if self._channels[idx] < self.max_channels
+        ]
+        if len(candidates) == 0:
+            return None
+
+        # Least loaded first, ties prefer slots that already hold a transport
+        return min(
+            candidates,
+            key=lambda idx: (self._channels[idx], self._members[idx] is None),
+        )
+
+    def acquire(self, timeout: float | None = None) -> SSHSessionAuth:
+        """Lease a member of the pool.
+
+        Args:
+            timeout (float | None, optional): Seconds to wait for a free channel. Waits forever if None.
+
+        Raises:
+            RuntimeError: If the pool is closed.
+            TimeoutError: If no channel became free within the timeout.
+
+        Returns:
+            SSHSessionAuth: A connected session. Must be returned with `release`.
+        """
+        with self._lock:
+            if not self._lock.wait_for(
+                lambda: self._closed or self._select() is not None, timeout
+            ):
+                raise TimeoutError(
+                    f"No free SSH channel in the pool after {timeout} seconds."
+                )
+            # The pool may have been closed while waiting
+            if self._closed:
+                raise RuntimeError("Cannot lease from a closed pool.")
+
+            idx = self._select()
+            self._channels[idx] += 1
+            member = self._members[idx]
+
+        # Evict and respawn outside of the lock since the handshake is slow
+        if not self._is_healthy(member):
+            if member is not None:
+                member.close()
+            try:
+                member = self._spawn()
+            except Exception:
+                with self._lock:
+                    self._channels[idx] -= 1
+                    self._lock.notify()
+                raise
+
+            with self._lock:
+                # Do not leak a transport into a pool closed during the handshake
+                if self._closed:
+                    member.close()
+                    self._channels[idx] -= 1
+                    self._lock.notify()
+                    raise RuntimeError("Cannot lease from a closed pool.")
+                # Another thread may have respawned the slot in the meantime
+                if self._is_healthy(self._members[idx]):
+                    member.close()
+                    member = self._members[idx]
+                else:
+                    self._members[idx] = member
+
+        with self._lock:
+            self._leases[idx].append(member)
+
+        return member
+
+    def release(self, member: SSHSessionAuth) -> None:
+        """Return a leased member to the pool.
+
+        Args:
+            member (SSHSessionAuth): The session returned by `acquire`.
+
+        Raises:
+            KeyError: If the member was not leased from this pool.
+        """
+        with self._lock:
+            idx = next(
+                (
+                    idx
+                    for idx, leased in enumerate(self._leases)
+                    if any(other is member for other in leased)
+                ),
+                None,
+            )
+            if idx is None:
+                raise KeyError(f"{member} was not leased from this pool.")
+
+            leased = self._leases[idx]
+            del leased[next(i for i, other in enumerate(leased) if other is member)]
+            self._channels[idx] -= 1
+
+            # Evict dead transports so the next lease reconnects
+            if not self._is_healthy(member) and self._members[idx] is member:
+                self._members[idx] = None
+
+            # The transports leased when the pool was closed are closed on their last release
+            if self._closed and self._channels[idx] == 0:
+                if self._members[idx] is not None:
+                    self._members[idx].close()
+                self._members[idx] = None
+
+            self._lock.notify()
+        return
+
+    @contextmanager
+    def lease(self, timeout: float | None = None) -> Iterator[SSHSessionAuth]:
+        """Lease a member of the pool for the duration of a with block.
+
+        Args:
+            timeout (float | None, optional): Seconds to wait for a free channel. Waits forever if None.
+
+        Yields:
+            SSHSessionAuth: A connected session.
+        """
+        member = self.acquire(timeout=timeout)
+        try:
+            yield member
+        finally:
+            self.release(member)
+
+    def channels(self) -> list[int]:
+        """Return the number of leased channels per transport."""
+        with self._lock:
+            return list(self._channels)
+
+    def close(self) -> None:
+        """Close every transport in the pool, the leased ones once they are released."""
+        with self._lock:
+            self._closed = True
+            for idx, member in enumerate(self._members):
+                if self._channels[idx] > 0:
+                    continue
+                if member is not None:
+                    member.close()
+                self._members[idx] = None
+            self._lock.notify_all()
+        return
+
+    def __enter__(self) -> "SSHSessionPool":
+        """Enter the runtime context of the pool."""
+        return self
+
+    def __exit__(self, *args) -> None:  # noqa : ANN002
+        """Close the pool on exit of the runtime context."""
+        self.close()
+
+    def __repr__(self) -> str:
+        """Return a string representation of the SSHSessionPool instance."""
+        return f"{self.__class__.__name__}(server={self._template.server}, size={self.size}, max_channels={self.max_channels})"
@@ -16,11 +16,14 @@ Dependencies:
 
 
 import os
+import time
 import warnings
 from getpass import getpass
 
 import paramiko  # type: ignore
 
+from .health import backoff_delays, is_reachable
+
 __all__ = ["SSHSessionAuth"]
 
 
@@ -38,6 +41,9 @@ class SSHSessionAuth:
         use_key_base_aut (bool, optional): If True, uses key-based authentication. Default is True.
         path_to_priv_key (str | None, optional): Path to the private key file for key-based authentication.
             If None, a default path will be used. Default is None.
+        compress (bool, optional): If True, enables SSH transport-level compression. Default is False.
+        keepalive (int, optional): Interval in seconds between transport keepalives, 0 to disable. Default is 30.
+        retries (int, optional): Number of reconnect attempts, with exponential backoff. Default is 3.
 
     Raises:
         ConnectionError: If the server is not reachable.
@@ -49,10 +55,14 @@ class SSHSessionAuth:
         use_key_base_aut (bool): Whether key-based authentication is used.
         path_to_key (str): Path to the private key file for key-based authentication.
         port (int): The port number for the SSH connection.
+        compress (bool): Whether SSH transport-level compression is enabled.
+        keepalive (int): Interval in seconds between transport keepalives.
+        retries (int): Number of reconnect attempts.
         session (paramiko.SSHClient): The SSH session object.
 
     Methods:
         _create_session(): Creates an SSH session with the remote server.
+        connect(): Connects to the remote server, reconnecting with backoff if needed.
 
     """
 
@@ -64,6 +74,9 @@ class SSHSessionAuth:
         use_key_base_aut: bool = True,
         path_to_priv_key: str | None = None,
         no_ping: bool = False,
+        compress: bool = False,
+        keepalive: int = 30,
+        retries: int = 3,
     ) -> None:
         """Initialize an SSH session authentication object.
 
@@ -76,6 +89,11 @@ class SSHSessionAuth:
         path_to_priv_key (str | None, optional): Path to the private key file for key-based authentication.
             If None, the default path will be used. Default is None.
         no_ping (bool, optional): If True, the server reachability check will be skipped. Default is False.
+        compress (bool, optional): If True, enables SSH transport-level compression. Useful over
+            high-latency links since Slurm text outputs are highly redundant. Default is False.
+        keepalive (int, optional): Interval in seconds between transport keepalives, so that idle transports are
+            not dropped by firewalls and dead links are detected. 0 to disable. Default is 30.
+        retries (int, optional): Number of reconnect attempts, with exponential backoff. Default is 3.
 
         Raises:
         ConnectionError: If the server is not reachable.
@@ -100,11 +118,9 @@ class SSHSessionAuth:
         # Set the server name
         self.server = server
 
-        # Ping the server to check if it is reachable
-        if not no_ping:
-            response = os.system("ping -c 1 " + self.server)
-            if response != 0:
-                raise ConnectionError("Server not reachable")
+        # Probe the SSH port to check if the server is reachable
+        if not no_ping and not is_reachable(self.server, port):
+            raise ConnectionError("Server not reachable")
 
         # Get the Remote Username
         self.remote_username = remote_username
@@ -136,6 +152,13 @@ class SSHSessionAuth:
         assert port > 0 and port < 65535, "Invalid port number"
         self.port = port
 
+        # Transport-level compression
+        self.compress = compress
+
+        # Connection health
+        self.keepalive = keepalive
+        self.retries = retries
+
     def _create_session(self) -> paramiko.SSHClient:
         """Create a session with the server."""
         try:
@@ -150,6 +173,7 @@ class SSHSessionAuth:
                     port=self.port,
                     username=self.remote_username,
                     pkey=private_key,
+                    compress=self.compress,
                 )
             else:
                 ssh_client.connect(
@@ -157,6 +181,7 @@ class SSHSessionAuth:
                     port=self.port,
                     username=self.remote_username,
                     password=self.password,
+                    compress=self.compress,
                 )
         except paramiko.AuthenticationException:
             print("Authentication failed, please verify your credentials")
@@ -174,15 +199,35 @@ class SSHSessionAuth:
         if not hasattr(self, "session"):
             return False
 
-        return self.session.get_transport().is_active()
+        # The transport is None if the connection failed
+        transport = self.session.get_transport()
+        return transport is not None and transport.is_active()
 
     def connect(self) -> None:
-        """Connect to the remote server."""
+        """Connect to the remote server.
+
+        A dropped transport is re-established, retrying with exponential backoff.
+
+        Raises:
+            ConnectionError: If the server could not be reached after all the retries.
+        """
         # connection Guard
-        if not self.is_connected():
+        if self.is_connected():
+            return
+
+        for attempt, delay in zip(range(self.retries + 1), backoff_delays()):
+            if attempt > 0:
+                time.sleep(delay)
+
             self.session = self._create_session()
+            if self.is_connected():
+                if self.keepalive > 0:
+                    self.session.get_transport().set_keepalive(self.keepalive)
+                return
 
-        return
+        raise ConnectionError(
+            f"Unable to connect to {self.server} after {self.retries + 1} attempts."
+        )
 
     def close(self) -> None:
         """Close the session."""
@@ -196,3 +241,18 @@ class SSHSessionAuth:
             return self.session.get_transport().is_alive()
 
         return False
+
+    def jump(self, node: str, port: int = 22) -> "SSHSessionAuth":
+        """Create a session to a node tunnelled through this session, used as a jump host.
+
+        Args:
+            node (str): The hostname of the node, as resolved by the server.
+            port (int, optional): The SSH port of the node. Defaults to 22.
+
+        Returns:
+            SSHSessionAuth: The lazy session to the node.
+        """
+        # The jump session module builds on this one
+        from .jump_session import JumpSession
+
+        return JumpSession(self, node, port=port)
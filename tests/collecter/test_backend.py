@@ -0,0 +1,44 @@
+import pytest
+
+from slurmdocs.collecter import (
+    DirectSSHBackend,
+    IlscpuCollecter,
+    ParallelShellBackend,
+    get_backend,
+)
+from slurmdocs.session import ReplaySession
+
+
+def test_parallel_shell_backend():
+    icollecter = IlscpuCollecter(backend=get_backend("pdsh"))
+
+    # The partition is not needed without the scheduler
+    assert icollecter._command(node="c-0") == "pdsh -N -w c-0 lscpu"
+    assert icollecter._command(nodes=["c-0", "c-1"]) == "pdsh -w c-0,c-1 lscpu"
+    with pytest.raises(ValueError):
+        icollecter._command(node="c-0", jobid="1234")
+
+    # Lines are labelled with their node
+    output = (
+        "c-0: Architecture:  x86_64\nc-1: Architecture:  aarch64\nc-0: CPU(s):  40\n"
+    )
+    assert icollecter.demultiplex(output) == {
+        "c-0": "Architecture:  x86_64\nCPU(s):  40\n",
+        "c-1": "Architecture:  aarch64\n",
+    }
+
+    with pytest.raises(ValueError):
+        ParallelShellBackend(tool="dsh")
+
+
+def test_direct_ssh_backend():
+    session = ReplaySession(rules=[(r"^ssh c-0 lscpu$", "Architecture:  x86_64\n")])
+    session.connect()
+    icollecter = IlscpuCollecter(backend=DirectSSHBackend())
+
+    # The probe runs on a session to the node, through the login session
+    assert icollecter(session, node="c-0") == "Architecture:  x86_64\n"
+    assert session.commands == ["ssh c-0 lscpu"]
+
+    with pytest.raises(NotImplementedError):
+        icollecter._command(nodes=["c-0", "c-1"])
@@ -0,0 +1,48 @@
+import hashlib
+
+from slurmdocs.collecter import RemoteCache
+from slurmdocs.session import ReplaySession
+
+
+def test_remote_cache(tmp_path):
+    session = ReplaySession(runner=True)
+    session.connect()
+    cache = RemoteCache(directory=str(tmp_path / "cache"), max_command=4096)
+
+    # Nodes without boot times have no key, a reboot changes the key
+    records = {
+        f"node-{i}": {
+            "NodeName": f"node-{i}",
+            "BootTime": "2024-01-01T00:00:00",
+            "SlurmdStartTime": "2024-01-01T00:01:00",
+        }
+        for i in range(40)
+    }
+    records["node-x"] = {"NodeName": "node-x", "BootTime": None}
+    keys = cache.keys(records)
+    assert len(keys) == 40
+    rebooted = dict(records["node-0"], BootTime="2024-02-01T00:00:00")
+    assert cache.key(rebooted) != keys["node-0"]
+
+    # Nothing is cached yet
+    assert cache.lookup(session, keys, ("cpu",)) == {}
+
+    # Large stores are split over several commands, the nodes without cpu output are left out
+    def lscpu(i: int) -> str:
+        return "".join(
+            f"{hashlib.sha1(f'{i}-{j}'.encode()).hexdigest()}\n" for j in range(20)
+        )
+
+    outputs = {f"node-{i}": {"cpu": lscpu(i), "memory": "Mem: 1\n"} for i in range(30)}
+    outputs["node-30"] = {"memory": "Mem: 1\n"}
+    assert cache.store(session, keys, outputs, ("cpu", "memory", "gpu")) == 30
+    assert len(session.commands) > 2
+
+    # Hits cover the requested probes, the failed ones are absent
+    hits = cache.lookup(session, keys, ("cpu", "gpu"))
+    assert len(hits) == 30
+    assert hits["node-7"] == {"cpu": lscpu(7)}
+
+    # Entries lacking a requested probe are misses
+    assert cache.lookup(session, keys, ("cpu", "numa")) == {}
+    assert cache.lookup(session, {"node-0": cache.key(rebooted)}, ("cpu",)) == {}
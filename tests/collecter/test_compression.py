@@ -0,0 +1,38 @@
+import gzip
+import os
+
+import pytest
+
+from slurmdocs.collecter.icollecter.compression import StreamDecompressor, wrap_command
+
+
+def test_wrap_command():
+    # Checks
+    assert wrap_command("scontrol show node", None) == "scontrol show node"
+    assert (
+        wrap_command("scontrol show node", "gzip") == "scontrol show node | gzip -1 -c"
+    )
+
+    with pytest.raises(ValueError):
+        wrap_command("scontrol show node", "bzip2")
+
+
+def test_stream_decompressor():
+    # Get the output of scontrol show node
+    filepath = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "../parse/test_data/scontrol.out"
+    )
+    with open(filepath, "rb") as f:
+        data = f.read()
+
+    compressed = gzip.compress(data, compresslevel=1)
+
+    # Decompress in small chunks, including chunks shorter than the magic bytes
+    decompressor = StreamDecompressor()
+    out = b""
+    for i in range(0, len(compressed), 3):
+        out += decompressor.decompress(compressed[i : i + 3])
+    out += decompressor.flush()
+
+    # Checks
+    assert out == data
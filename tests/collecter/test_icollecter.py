@@ -0,0 +1,272 @@
+import asyncio
+import io
+import shlex
+import subprocess
+import tarfile
+
+import pytest
+
+from slurmdocs.collecter import (
+    PROBES,
+    IbundleCollecter,
+    IlscpuArrayCollecter,
+    IlscpuCollecter,
+    IlscpuJsonCollecter,
+    IscontrolColllecter,
+    IscontrolJsonCollecter,
+)
+from slurmdocs.parse import project_records
+from slurmdocs.session import ReplaySession
+
+
+def test_lscpu_batch_command():
+    # Instantiate the collecter
+    icollecter = IlscpuCollecter()
+
+    cmd = icollecter._command(partition="debug", qos="debug", nodes=["c-0", "c-1"])
+
+    # Checks
+    assert cmd.startswith("srun -N 2 --ntasks-per-node=1")
+    assert "--label" in cmd
+    assert "--nodelist=c-0,c-1" in cmd
+
+    with pytest.raises(ValueError):
+        icollecter._command(partition="debug", qos="debug", nodes=[])
+
+
+def test_lscpu_demultiplex():
+    # Instantiate the collecter
+    icollecter = IlscpuCollecter()
+
+    # Labelled output with interleaved tasks
+    output = "\n".join(
+        [
+            "0: @@node=c-0",
+            "1: @@node=c-1",
+            "0: Architecture:  x86_64",
+            "1: Architecture:  aarch64",
+            "0: CPU(s):        40",
+            "1: CPU(s):        64",
+        ]
+    )
+
+    outputs = icollecter.demultiplex(output)
+
+    # Checks
+    assert set(outputs.keys()) == {"c-0", "c-1"}
+    assert outputs["c-0"] == "Architecture:  x86_64\nCPU(s):        40\n"
+    assert outputs["c-1"] == "Architecture:  aarch64\nCPU(s):        64\n"
+
+
+def test_lscpu_job_step_command():
+    # Instantiate the collecter
+    icollecter = IlscpuCollecter()
+
+    cmd = icollecter._command(node="c-0", jobid="1234")
+
+    # Checks
+    assert cmd.startswith("srun --jobid=1234 -N 1 -n 1")
+    assert "--nodelist=c-0" in cmd
+    assert "-p " not in cmd
+
+
+def test_bundle_sections():
+    # Instantiate the collecter
+    icollecter = IbundleCollecter(sections=("cpu", "memory", "gpu"))
+
+    cmd = icollecter._command(partition="debug", qos="debug", node="c-0")
+    assert cmd.startswith("srun -n 1 -c 1 -p debug --qos debug")
+    assert "--nodelist=c-0 sh -c " in cmd
+
+    # Frames are length prefixed, so outputs may contain anything, headers included
+    output = (
+        "@@section cpu 0 27\nArchitecture: x86_64\n@@sect"
+        "@@section memory 0 0\n"
+        "@@section gpu 127 0\n"
+    )
+    sections = icollecter.sections(output)
+
+    # Checks
+    assert sections == {"cpu": "Architecture: x86_64\n@@sect", "memory": ""}
+
+    with pytest.raises(ValueError):
+        icollecter.sections("@@section cpu 0 100\nshort")
+    with pytest.raises(ValueError):
+        icollecter._command(partition="debug", qos="debug", nodes=["c-0", "c-1"])
+    with pytest.raises(ValueError):
+        IbundleCollecter(sections=("cpu", "disk"))
+
+
+def test_bundle_script(monkeypatch):
+    # The framing survives a real shell, with a missing command left out
+    monkeypatch.setitem(PROBES, "cpu", "printf 'a\\nb'")
+    monkeypatch.setitem(PROBES, "gpu", "no-such-command")
+    icollecter = IbundleCollecter(sections=("cpu", "gpu"))
+    output = subprocess.run(
+        icollecter._program, shell=True, capture_output=True, text=True
+    ).stdout
+
+    # Checks
+    assert icollecter.sections(output) == {"cpu": "a\nb"}
+
+
+def test_scontrol_projection_command():
+    # The node name is always kept
+    cmd = IscontrolColllecter(fields=("State", "CPULoad"))._command()
+    assert cmd.startswith("scontrol -o show node | awk")
+    assert "keep=NodeName,State,CPULoad" in cmd
+
+    # Values with spaces are kept whole, like the local projection
+    record = (
+        "NodeName=c-0 Arch=x86_64 OS=Linux 3.10.0 #1 SMP State=DOWN "
+        "Reason=Not responding [slurm@2024-01-01T00:00:00] Comment=(null)"
+    )
+    cmd = IscontrolColllecter(fields=("OS", "State", "Reason"))._command()
+    output = subprocess.run(
+        cmd.replace("scontrol -o show node", f"echo {shlex.quote(record)}"),
+        shell=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    assert output == project_records(record, ("NodeName", "OS", "State", "Reason"))
+    assert output == (
+        "NodeName=c-0 OS=Linux 3.10.0 #1 SMP State=DOWN "
+        "Reason=Not responding [slurm@2024-01-01T00:00:00]\n\n"
+    )
+
+    # Unprojected and invalid fields
+    assert "awk" not in IscontrolColllecter()._command()
+    with pytest.raises(ValueError):
+        IscontrolColllecter(fields=("State; rm",))
+
+
+def test_json_collecters():
+    # The structured variants of the probes
+    assert (
+        IlscpuJsonCollecter()
+        ._command(node="c-0", partition="debug", qos="debug")
+        .endswith("lscpu -J")
+    )
+    assert (
+        "lscpu -J"
+        in IbundleCollecter(sections=("cpu", "memory"), json_output=True).script()
+    )
+    assert "lscpu -J" not in IbundleCollecter(sections=("cpu", "memory")).script()
+
+    # Text output of a Slurm without --json is rejected
+    icollecter = IscontrolJsonCollecter()
+    assert icollecter._command() == "scontrol show node --json"
+    assert icollecter._check('{"nodes": []}', "") == '{"nodes": []}'
+    with pytest.raises(RuntimeError):
+        icollecter._check("", "scontrol: unrecognized option '--json'")
+
+
+def test_async_closed_channel():
+    # A channel closed by a dead transport, without an exit status
+    class Channel:
+        closed = True
+
+        def recv_ready(self):
+            return False
+
+        def recv_stderr_ready(self):
+            return False
+
+        def exit_status_ready(self):
+            return False
+
+        def close(self):
+            pass
+
+    class Stdout:
+        channel = Channel()
+
+    class Session:
+        class session:
+            @staticmethod
+            def exec_command(cmd, timeout=None):
+                assert timeout == 10
+                return None, Stdout(), None
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(
+            IlscpuCollecter()._acollect(
+                Session(), node="c-0", partition="debug", qos="debug"
+            )
+        )
+
+
+def test_array_command(tmp_path):
+    icollecter = IlscpuArrayCollecter()
+    script = icollecter._command(
+        partition="debug", qos="normal", nodes=["c-0", "c-1"], run="run"
+    )
+    assert "--hold --array=0-1 " in script
+    assert 'ReqNodeList="$node"' in script
+    assert script.index("ReqNodeList") < script.index('scontrol release "$jid"')
+
+    # A failed update cancels the held array instead of leaving it queued
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    for name, body in (
+        ("sbatch", 'echo "42;cluster"'),
+        ("scontrol", '[ "$1" = update ] && exit 1; echo "$@" >> "$HOME/log"'),
+        ("scancel", 'echo "scancel $@" >> "$HOME/log"'),
+    ):
+        (bin_dir / name).write_text(f"#!/bin/sh\n{body}\n")
+        (bin_dir / name).chmod(0o755)
+    process = subprocess.run(
+        ["bash", "-c", script],
+        capture_output=True,
+        text=True,
+        env={"HOME": str(tmp_path), "PATH": f"{bin_dir}:/usr/bin:/bin"},
+    )
+    assert process.returncode != 0
+    assert process.stdout == ""
+    assert (tmp_path / "log").read_text() == "scancel 42\n"
+
+
+def test_array_wait_and_fetch():
+    # A transient squeue failure is not the end of the array
+    answers = iter(
+        [
+            ("", "slurm_load_jobs error: Socket timed out on send/recv", 1),
+            ("123\n", "", 0),
+            ("", "", 0),
+        ]
+    )
+    session = ReplaySession([(r"^squeue ", lambda _: next(answers))])
+    session.connect()
+    icollecter = IlscpuArrayCollecter(timeout=10)
+    icollecter._squeue_interval = 0
+    assert icollecter._wait(session, "123")
+    assert len(session.commands) == 3
+
+    # The scratch directory is only removed after a complete transfer
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w") as archive:
+        info = tarfile.TarInfo("./c-0.txt")
+        info.size = 4
+        archive.addfile(info, io.BytesIO(b"cpu\n"))
+    for status, removed in ((0, True), (2, False)):
+        session = ReplaySession([(r"tar -cf", (buffer.getvalue(), b"", status))])
+        session.connect()
+        assert icollecter._fetch(session, "run") == {"c-0": "cpu\n"}
+        assert any(cmd.startswith("rm -rf") for cmd in session.commands) == removed
+
+    # Unknown job ids have left the queue, unfinished tasks and missing directories are skipped
+    session = ReplaySession(
+        [(r"^squeue ", ("", "slurm_load_jobs error: Invalid job id specified", 1))]
+    )
+    session.connect()
+    assert icollecter._wait(session, "123")
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w") as archive:
+        info = tarfile.TarInfo("./.c-1.tmp")
+        archive.addfile(info, io.BytesIO(b""))
+    session = ReplaySession([(r"tar -cf", (buffer.getvalue(), b"", 0))])
+    session.connect()
+    assert icollecter._fetch(session, "run") == {}
+    session = ReplaySession([(r"tar -cf", (b"", b"cd: no such directory", 1))])
+    session.connect()
+    assert icollecter._fetch(session, "run") == {}
@@ -0,0 +1,64 @@
+from slurmdocs.collecter import SweepPlanner
+from slurmdocs.session import ReplaySession
+
+
+def _jobs(node, *partitions):
+    return [
+        dict(filename=f"{node}.txt", partition=part, qos=part, node=node)
+        for part in partitions
+    ]
+
+
+def test_planner():
+    session = ReplaySession(
+        rules=[
+            (r"^squeue", "busy,owners\n"),
+            (
+                r"^scontrol show partition",
+                "PartitionName=main AllowQos=ALL State=UP\n"
+                "PartitionName=busy AllowQos=ALL State=UP\n"
+                "PartitionName=owners AllowQos=owners AllowGroups=lab State=UP\n"
+                "PartitionName=down AllowQos=ALL State=DOWN\n",
+            ),
+        ]
+    )
+    planner = SweepPlanner()
+    planner.survey(session)
+    assert planner.queue == {"busy": 1, "owners": 1}
+    assert planner.is_restricted("owners", "owners")
+    assert not planner.is_up("down")
+
+    jobs = (
+        _jobs("c-0", "main", "busy", "owners", "down")
+        + _jobs("c-1", "main", "busy")
+        + _jobs("c-2", "main", "busy")
+        + _jobs("c-3", "down")
+    )
+    plan = planner.plan(jobs)
+
+    # One probe per node in the input order, the most constrained nodes planned first
+    assert [job["node"] for job in plan] == ["c-0", "c-1", "c-2", "c-3"]
+    assert [job["partition"] for job in plan] == ["busy", "main", "main", "down"]
+    assert "4 probes instead of 9" in planner.describe(plan, jobs)
+
+
+def test_schedule():
+    records = {
+        "c-0": dict(State="MIXED"),
+        "c-1": dict(State="IDLE"),
+        "c-2": dict(State="ALLOCATED"),
+        "c-3": dict(State="IDLE+DRAIN"),
+        "c-4": dict(State="DOWN*"),
+        "c-5": dict(State="IDLE#"),
+    }
+    assert SweepPlanner.node_state(records["c-1"]) == SweepPlanner.READY
+    assert SweepPlanner.node_state(records["c-5"]) == SweepPlanner.BUSY
+    assert SweepPlanner.node_state(records["c-4"]) == SweepPlanner.UNAVAILABLE
+
+    plan = [job for node in records for job in _jobs(node, "main")]
+    ready, deferred, skipped = SweepPlanner().schedule(plan, records)
+
+    # Idle nodes first, busy nodes deferred and unavailable nodes skipped
+    assert [job["node"] for job in ready] == ["c-1", "c-0"]
+    assert [job["node"] for job in deferred] == ["c-2", "c-5"]
+    assert [job["node"] for job in skipped] == ["c-3", "c-4"]
@@ -0,0 +1,36 @@
+import json
+
+from slurmdocs.collecter import IlscpuCollecter, SweepTelemetry
+from slurmdocs.session import ReplaySession
+
+
+def test_sweep_telemetry(tmp_path):
+    session = ReplaySession(rules=[(r"lscpu$", "Architecture: x86_64\n")], latency=0.05)
+    session.connect()
+    telemetry = SweepTelemetry(total=4)
+    telemetry.start()
+
+    # The probes report their latency split into phases
+    IlscpuCollecter(telemetry=telemetry)(
+        session, node="node-1", partition="debug", qos="debug"
+    )
+    assert set(telemetry.latencies["node-1"]) == set(SweepTelemetry.PHASES)
+    assert telemetry.latencies["node-1"]["queue"] >= 0.04
+
+    telemetry.finish(["node-1"])
+    telemetry.finish(["node-2", "node-3"], 1.0, error="TimeoutError: Timeout.")
+    telemetry.skip(["node-4"], "Node is DOWN.")
+    assert telemetry.remaining == 0
+    assert "3/4 nodes, 2 failed, 1 skipped" in telemetry.progress()
+
+    telemetry.stop()
+    summary = telemetry.summary()
+    assert "2 failed  TimeoutError: Timeout. (node-2, node-3)" in summary
+    assert "1 skipped Node is DOWN." in summary
+
+    telemetry.write(tmp_path / "report.json")
+    with open(tmp_path / "report.json") as f:
+        report = json.load(f)
+    assert report["done"] == 1
+    assert report["errors"] == {"TimeoutError": ["node-2", "node-3"]}
+    assert report["latency"]["total"]["max"] == 1.0
@@ -0,0 +1,105 @@
+import threading
+
+import pytest
+
+from slurmdocs.collecter import (
+    AIMDController,
+    CircuitBreaker,
+    CircuitOpenError,
+    Throttle,
+    TokenBucket,
+)
+
+
+def test_aimd_controller():
+    controller = AIMDController(initial=4, maximum=8)
+
+    # Flat latencies widen the limit by about one per round of calls
+    for _ in range(10):
+        controller.record(1.0, ok=True)
+    assert controller.limit == 6
+
+    # A timeout halves it, once per round
+    controller.record(10.0, ok=False)
+    controller.record(10.0, ok=False)
+    assert controller.limit == 3
+
+    with pytest.raises(ValueError):
+        AIMDController(initial=8, maximum=4)
+
+
+def test_circuit_breaker():
+    breaker = CircuitBreaker(threshold=2, cooldown=0)
+    breaker.record(ok=False)
+    assert breaker.allow()
+    breaker.record(ok=False)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    # A single trial goes through after the cooldown
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record(ok=True)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_throttle():
+    throttle = Throttle(
+        AIMDController(initial=1, maximum=1),
+        bucket=TokenBucket(rate=1000, burst=2),
+        breaker_threshold=1,
+        breaker_cooldown=60,
+    )
+    with throttle.slot("debug"):
+        # The concurrency limit is reached
+        assert throttle.try_acquire("debug") > 0
+
+    # A failure opens the circuit of the partition only
+    with pytest.raises(TimeoutError), throttle.slot("debug"):
+        raise TimeoutError
+    with pytest.raises(CircuitOpenError), throttle.slot("debug"):
+        pass
+    with throttle.slot("main"):
+        pass
+
+
+def test_throttle_circuit_first():
+    throttle = Throttle(
+        AIMDController(initial=4, maximum=4),
+        bucket=TokenBucket(rate=1, burst=1),
+        breaker_threshold=1,
+        breaker_cooldown=60,
+    )
+    throttle.breaker("debug").record(ok=False)
+
+    # An open circuit takes no token
+    with pytest.raises(CircuitOpenError):
+        throttle.try_acquire("debug")
+    assert throttle.try_acquire("main") == 0
+
+    # A trial call without a token is given back to the next call
+    breaker = throttle.breaker("main")
+    breaker.record(ok=False)
+    breaker.cooldown = 0
+    assert throttle.try_acquire("main") > 0
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.allow()
+
+
+def test_throttle_budget():
+    # Two throttles sharing a budget of one slot
+    budget = threading.BoundedSemaphore(1)
+    first = Throttle(AIMDController(initial=4, maximum=4), budget=budget)
+    second = Throttle(AIMDController(initial=4, maximum=4), budget=budget)
+
+    assert first.try_acquire("debug") == 0
+    assert second.try_acquire("debug") > 0
+    first.release("debug", 1.0, ok=True)
+    assert second.try_acquire("debug") == 0
+    second.release("debug", 1.0, ok=True)
+
+    # A call refused by an open circuit gives its slot back
+    second.breakers["debug"] = CircuitBreaker(threshold=1, cooldown=60)
+    second.breakers["debug"].record(ok=False)
+    with pytest.raises(CircuitOpenError):
+        second.try_acquire("debug")
+    assert first.try_acquire("debug") == 0
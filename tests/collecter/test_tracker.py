@@ -0,0 +1,32 @@
+from slurmdocs.collecter import JobTracker
+from slurmdocs.session import ReplaySession
+
+
+def test_job_tracker():
+    session = ReplaySession(rules=[(r"^scancel", "")])
+    session.connect()
+    tracker = JobTracker(batch_size=2)
+    assert tracker.name.startswith("slurmdocs-")
+
+    # Job ids reported by srun and salloc
+    assert tracker.record("srun: job 12 queued and waiting for resources") == ["12"]
+    tracker.record("salloc: Granted job allocation 13")
+    assert tracker.jobids == {"12", "13"}
+
+    # Abandoned jobs are cancelled together once the batch is full
+    tracker.abandon(session, ["12"])
+    assert session.commands == []
+    tracker.abandon(session, ["13"])
+    assert session.commands == ["scancel 12 13"]
+
+    tracker.abandon(session, ["14"])
+    tracker.flush(session)
+    assert session.commands[-1] == "scancel 14"
+    tracker.flush(session)
+    assert len(session.commands) == 2
+
+    # The leftovers are cancelled by name, once
+    tracker.cancel(session)
+    tracker.cancel(session)
+    assert session.commands[2:] == [f"scancel -n {tracker.name} -u replay"]
+    assert tracker.cancelled == {"12", "13", "14"}
@@ -0,0 +1,35 @@
+from slurmdocs.database import (
+    SlurmClusterDatabase,
+    diff_fingerprints,
+    fingerprint_records,
+)
+
+
+def test_fingerprints(tmp_path):
+    records = [
+        dict(
+            NodeName="c-0", CPUTot=40, RealMemory=1024, BootTime="2023-01-01", CPULoad=1
+        ),
+        dict(
+            NodeName="c-1", CPUTot=64, RealMemory=2048, BootTime="2023-01-01", CPULoad=2
+        ),
+    ]
+    stored = fingerprint_records(records)
+
+    # Volatile fields do not change the fingerprint, a reboot does
+    records[0]["CPULoad"] = 30
+    records[1]["BootTime"] = "2023-02-01"
+    records.append(dict(NodeName="c-2", CPUTot=64))
+
+    changed, removed = diff_fingerprints(fingerprint_records(records), stored)
+    assert sorted(changed) == ["c-1", "c-2"]
+    assert removed == []
+
+    changed, removed = diff_fingerprints({}, stored)
+    assert sorted(removed) == ["c-0", "c-1"]
+
+    # Stored alongside the database
+    db = SlurmClusterDatabase(db_name="test", db_path=tmp_path)
+    assert db.fingerprints() == {}
+    db.save_fingerprints(stored)
+    assert db.fingerprints() == stored
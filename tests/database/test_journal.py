@@ -0,0 +1,26 @@
+from slurmdocs.database import SweepJournal
+
+
+def test_journal(tmp_path):
+    journal = SweepJournal(tmp_path / "journal.jsonl")
+    assert not journal.exists()
+
+    journal.reset(["c-0", "c-1", "c-2"])
+    journal.record(["c-0", "c-1"], SweepJournal.IN_FLIGHT)
+    journal.record(["c-0"], SweepJournal.DONE)
+    journal.record(["c-1"], SweepJournal.FAILED, error="TimeoutError")
+    # A failure of another probe of a done node does not undo it
+    journal.record(["c-0"], SweepJournal.FAILED)
+    journal.close()
+
+    # A truncated last line is ignored
+    with open(journal.path, "a") as f:
+        f.write('{"node": "c-2", "sta')
+
+    assert journal.state() == {"c-0": "done", "c-1": "failed", "c-2": "pending"}
+    assert sorted(journal.outstanding()) == ["c-1", "c-2"]
+
+    # A new sweep starts over
+    journal.reset(["c-3"])
+    assert journal.outstanding() == ["c-3"]
+    journal.close()
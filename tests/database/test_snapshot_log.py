@@ -0,0 +1,38 @@
+from slurmdocs.database import SnapshotLog
+
+
+def test_snapshot_log(tmp_path):
+    log = SnapshotLog(tmp_path / "watch.jsonl.gz", keyframe=3)
+    first = {
+        "c-0": {"NodeName": "c-0", "State": "IDLE", "CPULoad": "0.01"},
+        "c-1": {"NodeName": "c-1", "State": "MIXED", "CPULoad": "3.10"},
+    }
+
+    # The first snapshot is a keyframe, the next ones only store the changes
+    assert log.append(first, timestamp=0)["keyframe"]
+    second = {
+        "c-0": {"NodeName": "c-0", "State": "ALLOCATED", "CPULoad": "0.01"},
+        "c-2": {"NodeName": "c-2", "State": "IDLE"},
+    }
+    entry = log.append(second, timestamp=60)
+    assert entry["nodes"] == {"c-0": {"State": "ALLOCATED"}, "c-2": second["c-2"]}
+    assert entry["removed"] == ["c-1"]
+    log.close()
+
+    # A snapshot truncated by an interruption is dropped on the next append
+    with open(log.path, "ab") as f:
+        f.write(b"\x1f\x8b\x08\x00")
+    third = {"c-0": {"NodeName": "c-0", "State": "IDLE"}}
+    log = SnapshotLog(log.path, keyframe=3)
+    assert log.append(third, timestamp=120)["dropped"] == {"c-0": ["CPULoad"]}
+    assert log.append(third, timestamp=180)["keyframe"]
+    log.close()
+
+    history = [
+        (timestamp, {n: dict(f) for n, f in nodes.items()})
+        for timestamp, nodes in log.replay()
+    ]
+    assert [timestamp for timestamp, _ in history] == [0, 60, 120, 180]
+    assert history[0][1] == first
+    assert history[1][1] == second
+    assert history[2][1] == history[3][1] == third
@@ -4,7 +4,15 @@ import pandas as pd
 
 
 from slurmdocs.parse.parser import Parser
-from slurmdocs.parse import IlscpuParser, IscontrolParser
+from slurmdocs.parse import (
+    NODE_FIELDS,
+    IlscpuJsonParser,
+    IlscpuParser,
+    IscontrolJsonStreamParser,
+    IscontrolParser,
+    IscontrolStreamParser,
+    project_records,
+)
 
 
 def test_lscpu():
@@ -57,3 +65,109 @@ def test_scontrol_show_node():
     assert "Sockets" in parsed.columns.to_list()
 
     return
+
+
+def test_scontrol_stream_parser():
+    # Instantiate the parsers
+    parser = Parser(
+        iparser=IscontrolParser(preprocess=True),
+    )
+    stream_parser = IscontrolStreamParser(preprocess=True)
+
+    # Get the output of scontrol show node
+    filepath = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "test_data/scontrol.out"
+    )
+
+    # Feed the output in chunks that split records and lines
+    with open(filepath, "rb") as f:
+        data = f.read()
+    for i in range(0, len(data), 1000):
+        stream_parser.feed(data[i : i + 1000])
+
+    # Checks
+    assert stream_parser.close().equals(parser(filepath))
+
+    return
+
+
+def test_scontrol_projection(tmp_path):
+    # Instantiate the parser
+    parser = Parser(
+        iparser=IscontrolParser(preprocess=True),
+    )
+
+    # Get the output of scontrol show node
+    filepath = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "test_data/scontrol.out"
+    )
+
+    # Keep only the fields of the parser
+    with open(filepath) as f:
+        projected = project_records(f.read(), NODE_FIELDS)
+    assert "FreeMem" not in projected
+    (tmp_path / "projected.out").write_text(projected)
+
+    # Checks
+    full = parser(filepath)
+    assert parser(str(tmp_path / "projected.out")).equals(full)
+
+    # Values with spaces are kept whole
+    record = "NodeName=c-0 OS=Linux 3.10.0 #1 SMP Reason=Not responding [root]\n"
+    (tmp_path / "reason.out").write_text(project_records(record, ("Reason",)))
+    assert project_records(record, ("Reason",)) == "Reason=Not responding [root]\n\n"
+    assert IscontrolParser(preprocess=False)._parse(tmp_path / "reason.out")[
+        "Reason"
+    ].tolist() == ["Not responding [root]"]
+
+    return
+
+
+@pytest.mark.parametrize("streaming", [True, False])
+def test_scontrol_json(monkeypatch, streaming):
+    # Decode with the optional streaming reader and without it
+    if not streaming:
+        monkeypatch.setattr("slurmdocs.parse.iparse.iscontrol.ijson", None)
+
+    # Get the text and JSON outputs of scontrol show node
+    test_data = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_data")
+    text_path = os.path.join(test_data, "scontrol.out")
+    json_path = os.path.join(test_data, "scontrol.json")
+
+    # The JSON output is detected and parsed into the same DataFrame
+    parser = Parser(iparser=IscontrolParser(preprocess=True))
+    parsed = parser(json_path)
+    assert parsed.equals(parser(text_path))
+
+    # Typed values of the raw records
+    stream_parser = IscontrolJsonStreamParser(preprocess=True)
+    with open(json_path, "rb") as f:
+        data = f.read()
+    for i in range(0, len(data), 1000):
+        stream_parser.feed(data[i : i + 1000])
+    assert stream_parser.close().equals(parsed)
+    record = stream_parser.records[0]
+    assert record["CPULoad"] == 0.01
+    assert record["Partitions"] == "CLUSTER,WHEEL,threaded"
+    assert record["State"] == "IDLE"
+    assert record["Gres"] is None
+
+    return
+
+
+def test_lscpu_json():
+    # Instantiate the parser
+    parser = Parser(
+        iparser=IlscpuParser(),
+    )
+
+    # The 'lscpu -J' output of the machine of the text output
+    test_data = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_data")
+    text_path = os.path.join(test_data, "lscpu.out")
+    json_path = os.path.join(test_data, "lscpu.json")
+
+    # Checks
+    assert parser(json_path).equals(parser(text_path))
+    assert IlscpuJsonParser()._parse(json_path)["CPU(s)"] == 16
+
+    return
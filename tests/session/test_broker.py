@@ -0,0 +1,85 @@
+import subprocess
+import threading
+import time
+
+import pytest
+
+from slurmdocs.session import BrokeredSession, SessionBroker, SSHSessionAuth
+from slurmdocs.session.channel import BufferedChannel, exec_result
+
+
+class LocalClient:
+    # Runs the commands locally instead of over SSH
+    def get_transport(self):
+        return self
+
+    def is_active(self):
+        return True
+
+    def is_alive(self):
+        return True
+
+    def set_keepalive(self, interval):
+        pass
+
+    def close(self):
+        pass
+
+    def exec_command(self, cmd, timeout=None):
+        channel = BufferedChannel()
+
+        def run():
+            process = subprocess.run(cmd, shell=True, capture_output=True)
+            channel.feed_stdout(process.stdout)
+            channel.feed_stderr(process.stderr)
+            channel.set_exit_status(process.returncode)
+
+        threading.Thread(target=run, daemon=True).start()
+        return exec_result(channel)
+
+
+class LocalSession(SSHSessionAuth):
+    def __init__(self):
+        super().__init__("localhost", "user", path_to_priv_key="id_rsa", no_ping=True)
+
+    def _create_session(self):
+        return LocalClient()
+
+
+def test_session_broker(tmp_path):
+    socket_path = tmp_path / "broker.sock"
+
+    # Serve the broker in the background
+    broker = SessionBroker(LocalSession(), socket_path=socket_path)
+    thread = threading.Thread(target=broker.serve_forever, daemon=True)
+    thread.start()
+    while not socket_path.exists():
+        time.sleep(0.01)
+
+    session = BrokeredSession("localhost", "user", socket_path=socket_path)
+    session.connect()
+
+    _, stdout, stderr = session.session.exec_command("echo out; echo err >&2; exit 3")
+
+    # Checks
+    assert stdout.read() == b"out\n"
+    assert stderr.read() == b"err\n"
+    assert stdout.channel.recv_exit_status() == 3
+
+    # The broker refuses to tunnel to the nodes
+    with pytest.raises(ValueError):
+        session.jump("node-0")
+
+    # Silent commands time out on the broker side
+    _, stdout, _ = session.session.exec_command("sleep 5", timeout=0.3)
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        stdout.read()
+    assert time.monotonic() - started < 3
+
+    # Stop the broker
+    session.session.stop()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert not socket_path.exists()
+    assert not session.is_connected()
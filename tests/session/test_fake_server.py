@@ -0,0 +1,68 @@
+import paramiko
+import pytest
+
+from slurmdocs.collecter import IlscpuCollecter, IscontrolColllecter
+from slurmdocs.session import FakeSlurmServer, SSHSessionAuth, SSHSessionPool
+
+
+@pytest.fixture(scope="module")
+def key_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp("ssh") / "id_rsa"
+    paramiko.RSAKey.generate(2048).write_private_key_file(str(path))
+    return str(path)
+
+
+def test_fake_server(key_path):
+    with FakeSlurmServer(
+        nodes=8, partitions=("debug", "gpu"), max_sessions=2
+    ) as server:
+        session = SSHSessionAuth(
+            "127.0.0.1", "user", port=server.port, path_to_priv_key=key_path
+        )
+        session.connect()
+
+        # Node information of the synthetic cluster
+        node_info = IscontrolColllecter(compress="gzip")(session)
+        assert node_info.count("NodeName=") == 8
+
+        # Single node and batched probes over real SSH channels
+        lscpu = IlscpuCollecter()(session, node="node-0001", partition="gpu", qos="gpu")
+        assert "CPU(s):                          40" in lscpu
+
+        icollecter = IlscpuCollecter()
+        output = icollecter(
+            session, nodes=["node-0000", "node-0002"], partition="debug", qos="debug"
+        )
+        assert set(icollecter.demultiplex(output)) == {"node-0000", "node-0002"}
+
+        # MaxSessions is enforced per transport
+        transport = session.session.get_transport()
+        channels = [transport.open_session() for _ in range(2)]
+        with pytest.raises(paramiko.ChannelException):
+            transport.open_session()
+        for channel in channels:
+            channel.close()
+
+        session.close()
+
+
+def test_fake_server_queue(key_path):
+    with FakeSlurmServer(nodes=4, latency=0.5, queue_slots=1) as server:
+        session = SSHSessionAuth(
+            "127.0.0.1", "user", port=server.port, path_to_priv_key=key_path
+        )
+
+        # The second probe waits in the queue past its timeout and is cancelled
+        with SSHSessionPool(session, size=1) as pool, pool.lease() as member:
+            _, stdout, _ = member.session.exec_command(
+                IlscpuCollecter()._command(
+                    node="node-0000", partition="debug", qos="debug"
+                )
+            )
+            with pytest.raises(TimeoutError):
+                IlscpuCollecter(timeout=0.2)(
+                    member, node="node-0001", partition="debug", qos="debug"
+                )
+            assert "Architecture" in stdout.read().decode("utf-8")
+
+        assert "scancel -n lscpu-node-0001 -u user" in server.commands
@@ -0,0 +1,69 @@
+import socket
+from itertools import islice
+
+import paramiko
+
+from slurmdocs.collecter import IscontrolColllecter
+from slurmdocs.session.health import backoff_delays, is_transient, probe
+
+
+def test_probe():
+    # Listen on a free local port
+    with socket.socket() as server:
+        server.bind(("127.0.0.1", 0))
+        server.listen()
+        port = server.getsockname()[1]
+
+        assert probe("127.0.0.1", port, timeout=1)
+
+    # The port is closed now
+    assert not probe("127.0.0.1", port, timeout=1)
+
+
+def test_backoff_delays():
+    delays = list(islice(backoff_delays(base=1, cap=4, jitter=False), 5))
+
+    assert delays == [1, 2, 4, 4, 4]
+
+
+def test_is_transient():
+    assert is_transient(EOFError())
+    assert is_transient(ConnectionResetError())
+    assert is_transient(paramiko.SSHException("SSH session not active"))
+    assert not is_transient(TimeoutError())
+    assert not is_transient(ValueError())
+    assert is_transient(socket.gaierror())
+    assert is_transient(
+        paramiko.ssh_exception.NoValidConnectionsError(
+            {("127.0.0.1", 22): ConnectionRefusedError()}
+        )
+    )
+    assert not is_transient(FileNotFoundError())
+    assert not is_transient(PermissionError())
+    assert not is_transient(paramiko.AuthenticationException())
+
+
+class FlakySession:
+    # Drops the transport on the first command
+    def __init__(self):
+        self.calls, self.reconnects = 0, 0
+
+    def connect(self):
+        self.reconnects += 1
+
+
+class FlakyCollecter(IscontrolColllecter):
+    def _collect(self, session, **kwargs):
+        session.calls += 1
+        if session.calls == 1:
+            raise EOFError("Transport dropped.")
+        return "NodeName=c-0"
+
+
+def test_retry_idempotent_collection(monkeypatch):
+    monkeypatch.setattr("time.sleep", lambda delay: None)
+    session = FlakySession()
+
+    assert FlakyCollecter()(session) == "NodeName=c-0"
+    assert session.calls == 2
+    assert session.reconnects == 1
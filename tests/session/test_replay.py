@@ -0,0 +1,87 @@
+from pathlib import Path
+
+import paramiko
+import pytest
+
+from slurmdocs.collecter import IlscpuCollecter, IscontrolColllecter
+from slurmdocs.collecter.icollecter.compression import (
+    StreamDecompressor,
+    wrap_command,
+    zstandard,
+)
+from slurmdocs.session import ReplaySession
+
+DB_PATH = Path(__file__).parent.parent / "database" / "sample_test_data"
+
+
+def test_replay_database():
+    session = ReplaySession.from_database(DB_PATH)
+    session.connect()
+
+    # Node information
+    node_info = IscontrolColllecter()(session)
+    assert "NodeName=gpu-0-1" in node_info
+
+    # Single node and batched lscpu probes
+    lscpu = IlscpuCollecter()(session, node="gpu-0-1", partition="debug", qos="debug")
+    assert lscpu == (DB_PATH / "cpu_data" / "gpu-0-1.txt").read_text()
+
+    icollecter = IlscpuCollecter(compress="gzip")
+    output = icollecter(
+        session, nodes=["gpu-0-1", "gpu-0-2"], partition="debug", qos="debug"
+    )
+    assert icollecter.demultiplex(output)["gpu-0-2"].strip() == (
+        (DB_PATH / "cpu_data" / "gpu-0-2.txt").read_text().strip()
+    )
+
+    # Unknown nodes fail like unavailable nodes
+    with pytest.raises(ValueError):
+        IlscpuCollecter()(session, node="gpu-9-9", partition="debug", qos="debug")
+
+
+def test_replay_injection():
+    # Every channel fails to open
+    session = ReplaySession([("hostname", "login-0\n")], failure_rate=1.0)
+    session.connect()
+    with pytest.raises(paramiko.SSHException):
+        session.session.exec_command("hostname")
+
+    # Every command hangs until the timeout
+    session = ReplaySession([("hostname", "login-0\n")], hang_rate=1.0)
+    session.connect()
+    _, stdout, _ = session.session.exec_command("hostname", timeout=0.1)
+    with pytest.raises(TimeoutError):
+        stdout.read()
+
+    # Unmatched commands run locally
+    session = ReplaySession(runner=True)
+    session.connect()
+    _, stdout, _ = session.session.exec_command("echo local")
+    assert stdout.read() == b"local\n"
+    assert session.commands == ["echo local"]
+
+
+def test_replay_workdir(tmp_path):
+    # The remote cache commands run in the working directory
+    session = ReplaySession.from_database(DB_PATH, workdir=tmp_path)
+    session.connect()
+    _, stdout, _ = session.session.exec_command("mkdir -p cache && echo @@EOF")
+    assert stdout.read() == b"@@EOF\n"
+    assert (tmp_path / "cache").is_dir()
+
+
+@pytest.mark.parametrize("compress", ["gzip", "zstd", "auto"])
+def test_replay_compression(compress):
+    if compress == "zstd":
+        pytest.importorskip("zstandard")
+
+    # The output is compressed like the suffix of the command
+    session = ReplaySession([("^hostname$", "login-0\n")])
+    session.connect()
+    _, stdout, _ = session.session.exec_command(wrap_command("hostname", compress))
+    output = stdout.read()
+    gzipped = compress == "gzip" or (compress == "auto" and zstandard is None)
+    assert output.startswith(b"\x1f\x8b" if gzipped else b"\x28\xb5\x2f\xfd")
+
+    decompressor = StreamDecompressor()
+    assert decompressor.decompress(output) + decompressor.flush() == b"login-0\n"
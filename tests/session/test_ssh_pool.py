@@ -0,0 +1,117 @@
+import threading
+import time
+
+import pytest
+
+from slurmdocs.session import SSHSessionAuth, SSHSessionPool
+
+
+class Client:
+    # A transport that stays active until closed
+    def __init__(self):
+        self.active = True
+
+    def get_transport(self):
+        return self
+
+    def is_active(self):
+        return self.active
+
+    def is_alive(self):
+        return self.active
+
+    def set_keepalive(self, interval):
+        pass
+
+    def close(self):
+        self.active = False
+
+
+class LocalSession(SSHSessionAuth):
+    def __init__(self):
+        super().__init__("localhost", "user", path_to_priv_key="id_rsa", no_ping=True)
+
+    spawned = 0
+
+    def _create_session(self):
+        LocalSession.spawned += 1
+        return Client()
+
+
+def test_pool_close():
+    pool = SSHSessionPool(LocalSession(), size=1, max_channels=1)
+    member = pool.acquire()
+
+    # A waiter woken by the close does not get a slot
+    errors = []
+
+    def wait():
+        try:
+            pool.acquire()
+        except RuntimeError as e:
+            errors.append(e)
+
+    waiter = threading.Thread(target=wait)
+    waiter.start()
+    time.sleep(0.1)
+    pool.close()
+    waiter.join(5)
+    assert len(errors) == 1
+
+    # The leased transport is closed on release only
+    assert member.is_alive()
+    pool.release(member)
+    assert not member.is_alive()
+
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+
+
+def test_pool_select():
+    LocalSession.spawned = 0
+    pool = SSHSessionPool(LocalSession(), size=2, max_channels=2)
+
+    # Transports are only opened when the loaded ones are busier
+    assert pool.channels() == [0, 0] and LocalSession.spawned == 0
+    first = pool.acquire()
+    assert LocalSession.spawned == 1
+    second = pool.acquire()
+    assert second is not first and LocalSession.spawned == 2
+    assert pool.channels() == [1, 1]
+
+    # The least loaded transport is leased first
+    pool.release(first)
+    assert pool.acquire() is first
+    assert pool.channels() == [1, 1]
+
+    # Every transport carries max_channels channels
+    pool.acquire()
+    pool.acquire()
+    assert pool.channels() == [2, 2]
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.05)
+    assert LocalSession.spawned == 2
+
+
+def test_pool_respawn():
+    LocalSession.spawned = 0
+    pool = SSHSessionPool(LocalSession(), size=1, max_channels=2)
+
+    # A dead transport is replaced on the next lease, also while it is still leased
+    dead = pool.acquire()
+    dead.session.close()
+    member = pool.acquire()
+    assert member is not dead and member.is_alive()
+    assert LocalSession.spawned == 2
+
+    pool.release(dead)
+    pool.release(member)
+    assert pool.channels() == [0]
+    with pytest.raises(KeyError):
+        pool.release(dead)
+
+    # A dead transport released last is evicted
+    member.session.close()
+    with pool.lease() as leased:
+        assert leased is not member and leased.is_alive()
+    assert LocalSession.spawned == 3